@@ -0,0 +1 @@
+"""Benchmarks for the post generator and bot helpers."""
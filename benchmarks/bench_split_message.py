@@ -0,0 +1,89 @@
+"""
+ASDF X Post Generator - split_message Benchmark
+===============================================
+Times bot.split_message on large multi-week exports.
+
+Usage:
+    python -m benchmarks.bench_split_message [--size-mb 1.5] [--repeat 5]
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from bot import split_message
+from generator import PostGenerator
+
+
+def legacy_split_message(content: str, max_length: int = 1900) -> List[str]:
+    """The original string-concatenating splitter, kept for comparison."""
+    if len(content) <= max_length:
+        return [content]
+
+    chunks = []
+    lines = content.split('\n')
+    current_chunk = ""
+
+    for line in lines:
+        if len(current_chunk) + len(line) + 1 > max_length:
+            if current_chunk:
+                chunks.append(current_chunk)
+            current_chunk = line
+        else:
+            current_chunk += ('\n' if current_chunk else '') + line
+
+    if current_chunk:
+        chunks.append(current_chunk)
+
+    return chunks
+
+
+def build_export(size_mb: float) -> str:
+    """Concatenate weekly exports until the text is at least size_mb."""
+    generator = PostGenerator()
+    target = int(size_mb * 1024 * 1024)
+    weeks = []
+    total = 0
+    week = 1
+    while total < target:
+        text = generator.export_weekly_posts(week)
+        weeks.append(text)
+        total += len(text) + 1
+        week += 1
+    return "\n".join(weeks)
+
+
+def best_of(func: Callable[[str, int], List[str]], text: str, repeat: int) -> float:
+    """Best wall time in seconds over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text, 1900)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark split_message")
+    parser.add_argument("--size-mb", type=float, default=1.5, help="Export size in MB (default: 1.5)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (default: 5)")
+    args = parser.parse_args()
+
+    export = build_export(args.size_mb)
+    cases = {
+        "multi-week export": export,
+        "fenced export": "```\n" + export + "\n```",
+        "single long line": export.replace("\n", " "),
+    }
+
+    print(f"{'case':<20} {'chars':>10} {'chunks':>8} {'split_message':>15} {'legacy':>10}")
+    for name, text in cases.items():
+        chunks = split_message(text, 1900)
+        assert all(len(chunk) <= 1900 for chunk in chunks)
+        new = best_of(split_message, text, args.repeat)
+        old = best_of(legacy_split_message, text, args.repeat)
+        print(f"{name:<20} {len(text):>10} {len(chunks):>8} {new * 1000:>13.2f}ms {old * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
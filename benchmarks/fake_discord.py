@@ -0,0 +1,233 @@
+"""
+ASDF X Post Generator - Fake Discord
+====================================
+In-process stand-ins for discord.Interaction, its response and followup
+webhook, and text channels, so the real slash-command coroutines can run
+without a gateway connection.
+
+Every API call waits for a simulated latency and can be rate limited like
+Discord: channel sends past 5 messages per 5 seconds per channel get a 429,
+and a configurable fraction of any request gets a random one. As in
+discord.py's HTTP client, a 429 is waited out and retried, and only raised
+once MAX_ATTEMPTS requests in a row were rate limited.
+"""
+
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter, defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+import discord
+
+# Discord's per-channel message limit
+CHANNEL_BURST = 5
+CHANNEL_WINDOW = 5.0
+
+# Attempts discord.py makes at a rate-limited request before giving up
+MAX_ATTEMPTS = 5
+
+_ids = itertools.count(1_000_000)
+
+# The interaction the current task is handling, so channel sends are attributed to it
+current_interaction: ContextVar[Optional["FakeInteraction"]] = ContextVar("current_interaction", default=None)
+
+
+@dataclass
+class FakeHTTPResponse:
+    """The parts of an aiohttp response that discord.HTTPException reads."""
+    status: int
+    reason: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class FakeMessage:
+    """One message or interaction response the bot sent."""
+    route: str  # "callback", "webhook" or "channel"
+    content: Optional[str]
+    embeds: List[discord.Embed]
+    filename: Optional[str]
+    sent_at: float
+
+
+class FakeDiscord:
+    """Simulated Discord API: latency, per-channel limits and random 429s."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.5,
+        rate_limit: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.requests: Counter = Counter()  # (route, status) -> count
+        self._channel_sends: Dict[int, Deque[float]] = defaultdict(deque)
+
+    def _delay(self) -> float:
+        spread = self.latency * self.jitter
+        return max(0.0, self.latency + self.rng.uniform(-spread, spread))
+
+    def _limited(self, route: str, channel_id: Optional[int]) -> float:
+        """Seconds to retry after if this request is rate limited, else 0."""
+        if self.rate_limit and self.rng.random() < self.rate_limit:
+            return self.retry_after
+        if route != "channel" or channel_id is None:
+            return 0.0
+
+        now = time.monotonic()
+        sends = self._channel_sends[channel_id]
+        while sends and now - sends[0] >= CHANNEL_WINDOW:
+            sends.popleft()
+        if len(sends) >= CHANNEL_BURST:
+            return sends[0] + CHANNEL_WINDOW - now
+        sends.append(now)
+        return 0.0
+
+    async def request(self, route: str, channel_id: Optional[int] = None) -> None:
+        """One API call. Raises discord.HTTPException on a 429."""
+        await asyncio.sleep(self._delay())
+        retry_after = self._limited(route, channel_id)
+        if retry_after:
+            self.requests[(route, 429)] += 1
+            headers = {"Retry-After": f"{retry_after:.3f}", "X-RateLimit-Remaining": "0"}
+            raise discord.HTTPException(
+                FakeHTTPResponse(429, "Too Many Requests", headers),
+                {"message": "You are being rate limited.", "code": 0}
+            )
+        self.requests[(route, 200)] += 1
+
+    async def request_with_retries(self, route: str, channel_id: Optional[int] = None) -> None:
+        """One API call that waits out 429s the way discord.py's HTTP client does."""
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                return await self.request(route, channel_id)
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == MAX_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(float(e.response.headers["Retry-After"]))
+
+    def count(self, route: Optional[str] = None, status: Optional[int] = None) -> int:
+        """Requests made, optionally filtered by route and status."""
+        return sum(
+            n for (r, s), n in self.requests.items()
+            if (route is None or r == route) and (status is None or s == status)
+        )
+
+
+def _message(route: str, content: Any, kwargs: Dict[str, Any]) -> FakeMessage:
+    embeds = list(kwargs.get("embeds") or ([kwargs["embed"]] if kwargs.get("embed") else []))
+    file = kwargs.get("file")
+    if file is not None:
+        file.close()
+    return FakeMessage(
+        route, None if content is None else str(content), embeds,
+        file.filename if file is not None else None, time.monotonic()
+    )
+
+
+class FakeChannel:
+    """A text channel whose sends go through FakeDiscord."""
+
+    def __init__(self, discord_api: FakeDiscord, channel_id: int):
+        self.id = channel_id
+        self.api = discord_api
+        self.messages: List[FakeMessage] = []
+
+    async def send(self, content: Any = None, **kwargs) -> FakeMessage:
+        await self.api.request_with_retries("channel", self.id)
+        message = _message("channel", content, kwargs)
+        self.messages.append(message)
+        interaction = current_interaction.get()
+        if interaction is not None:
+            interaction.messages.append(message)
+        return message
+
+
+@dataclass
+class FakeGuild:
+    """The guild attributes commands read."""
+    id: int
+    shard_id: int = 0
+
+
+class FakeInteractionResponse:
+    """interaction.response: answers an interaction exactly once."""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self.type: Optional[discord.InteractionResponseType] = None
+
+    def is_done(self) -> bool:
+        return self.type is not None
+
+    async def _respond(self, kind: discord.InteractionResponseType) -> None:
+        if self.type is not None:
+            raise discord.InteractionResponded(self._interaction)  # type: ignore[arg-type]
+        self.type = kind
+        await self._interaction.api.request_with_retries("callback", self._interaction.channel_id)
+        self._interaction.answered_at = time.monotonic()
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        await self._respond(discord.InteractionResponseType.deferred_channel_message)
+
+    async def send_message(self, content: Any = None, **kwargs) -> None:
+        await self._respond(discord.InteractionResponseType.channel_message)
+        self._interaction.messages.append(_message("callback", content, kwargs))
+
+
+class FakeWebhook:
+    """interaction.followup: messages after the first response."""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content: Any = None, **kwargs) -> FakeMessage:
+        if not self._interaction.response.is_done():
+            raise discord.HTTPException(FakeHTTPResponse(404, "Not Found"), "Unknown Webhook")
+        await self._interaction.api.request_with_retries("webhook", self._interaction.channel_id)
+        message = _message("webhook", content, kwargs)
+        self._interaction.messages.append(message)
+        return message
+
+
+class FakeInteraction:
+    """Stand-in for discord.Interaction, covering what bot.py's commands use."""
+
+    def __init__(
+        self,
+        discord_api: FakeDiscord,
+        command: Any,
+        channel: FakeChannel,
+        guild_id: Optional[int] = None
+    ):
+        self.id = next(_ids)
+        self.api = discord_api
+        self.command = command
+        self.channel = channel
+        self.channel_id = channel.id
+        self.guild_id = guild_id
+        self.guild = FakeGuild(guild_id) if guild_id is not None else None
+        self.extras: Dict[str, Any] = {}
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeWebhook(self)
+        # Responses, followups and channel messages sent while handling it
+        self.messages: List[FakeMessage] = []
+        self.answered_at: Optional[float] = None
+
+    async def run(self, callback: Any, **options) -> None:
+        """Run a command callback as the handler of this interaction."""
+        token = current_interaction.set(self)
+        try:
+            await callback(self, **options)
+        finally:
+            current_interaction.reset(token)
@@ -0,0 +1,256 @@
+"""
+ASDF X Post Generator - Load Test
+=================================
+Runs the real slash-command callbacks from bot.py against the in-process
+fake Discord (fake_discord.py) and reports latency percentiles and message
+counts, to see how much concurrent traffic one worker can take.
+
+Usage:
+    python -m benchmarks.loadtest --invocations 5000 --mix raid=1
+    python -m benchmarks.loadtest --mix raid=6,cult=2,week=1 --arrival-rate 200 --rate-limit 0.01
+
+Options with choices (product, style, fud_type...) are drawn at random per
+invocation; other options keep their defaults. Each invocation is timed
+from its arrival to the first response (the reply or defer) and to the
+command returning, which includes waiting on the bot's outbound queue.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import bot
+from benchmarks.fake_discord import FakeChannel, FakeDiscord, FakeInteraction
+
+DEFAULT_MIX = "raid=6,cult=2,fud=2,reply=1,milestone=1,week=1,thread=1,export=1"
+
+# Seconds between event loop lag samples
+LAG_INTERVAL = 0.01
+
+
+@dataclass
+class Invocation:
+    """Timing and outcome of one command invocation."""
+    command: str
+    started: float
+    answered: Optional[float]
+    finished: float
+    messages: int
+    error: Optional[str] = None
+
+    @property
+    def first_response(self) -> Optional[float]:
+        return self.answered - self.started if self.answered is not None else None
+
+    @property
+    def total(self) -> float:
+        return self.finished - self.started
+
+
+@dataclass
+class LoadReport:
+    """Everything one load test run measured."""
+    invocations: List[Invocation]
+    requests: Dict[Any, int]
+    wall: float
+    loop_lag: List[float] = field(default_factory=list)
+
+    def by_command(self) -> Dict[str, List[Invocation]]:
+        grouped: Dict[str, List[Invocation]] = defaultdict(list)
+        for invocation in self.invocations:
+            grouped[invocation.command].append(invocation)
+        return dict(sorted(grouped.items()))
+
+    def format(self) -> str:
+        """Per-command latency percentiles and message counts as a table."""
+        lines = [
+            f"{'command':<10} {'runs':>6} {'errors':>6} "
+            f"{'first p50':>10} {'p95':>9} {'p99':>9} {'done p50':>10} {'p95':>9} {'p99':>9} {'msgs':>7}"
+        ]
+        groups = self.by_command()
+        for name, runs in [*groups.items(), ("all", self.invocations)]:
+            first = [r.first_response for r in runs if r.first_response is not None]
+            total = [r.total for r in runs]
+            lines.append(
+                f"{name:<10} {len(runs):>6} {sum(r.error is not None for r in runs):>6} "
+                f"{format_ms(percentile(first, 50)):>10} {format_ms(percentile(first, 95)):>9} {format_ms(percentile(first, 99)):>9} "
+                f"{format_ms(percentile(total, 50)):>10} {format_ms(percentile(total, 95)):>9} {format_ms(percentile(total, 99)):>9} "
+                f"{sum(r.messages for r in runs):>7}"
+            )
+
+        routes = sorted({route for route, _ in self.requests})
+        lines.append("")
+        lines.append(f"Wall time: {self.wall:.2f}s ({len(self.invocations) / self.wall:.0f} commands/s)")
+        for route in routes:
+            ok = self.requests.get((route, 200), 0)
+            limited = self.requests.get((route, 429), 0)
+            lines.append(f"{route:<9} requests: {ok:>7} sent, {limited:>5} rate limited")
+        if self.loop_lag:
+            lines.append(
+                f"Event loop lag: p99 {format_ms(percentile(self.loop_lag, 99))}, max {format_ms(max(self.loop_lag))}"
+            )
+
+        errors = [r.error for r in self.invocations if r.error]
+        if errors:
+            lines.append(f"First error: {errors[0]}")
+        return "\n".join(lines)
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0-100); None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+def format_ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f}ms"
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """Parse "raid=6,week=1" into command weights."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight) if weight else 1
+    if not mix or any(weight < 0 for weight in mix.values()) or not sum(mix.values()):
+        raise ValueError(f"Invalid command mix: {text!r}")
+    return mix
+
+
+def resolve_commands(names: Sequence[str]) -> Dict[str, Any]:
+    """Look up slash commands in the bot's tree by name."""
+    commands = {}
+    for name in names:
+        command = bot.bot.tree.get_command(name)
+        if command is None:
+            raise ValueError(f"Unknown command: {name!r}")
+        commands[name] = command
+    return commands
+
+
+def random_options(command: Any, rng: random.Random) -> Dict[str, Any]:
+    """A random value for every option of a command that has choices."""
+    return {
+        parameter.name: rng.choice(parameter.choices).value
+        for parameter in command.parameters
+        if parameter.choices
+    }
+
+
+# =============================================================================
+# RUNNING
+# =============================================================================
+
+async def invoke(
+    api: FakeDiscord,
+    command: Any,
+    channel: FakeChannel,
+    guild_id: Optional[int] = None,
+    options: Optional[Dict[str, Any]] = None
+) -> Invocation:
+    """Run one command against the fake API and time it.
+
+    A command counts as failed if it raises or answers with an ❌ message.
+    """
+    interaction = FakeInteraction(api, command, channel, guild_id)
+    started = time.monotonic()
+    error = None
+    try:
+        await interaction.run(command.callback, **(options or {}))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finished = time.monotonic()
+
+    if error is None:
+        error = next((m.content for m in interaction.messages if m.content and m.content.startswith("❌")), None)
+    return Invocation(command.name, started, interaction.answered_at, finished, len(interaction.messages), error)
+
+
+async def sample_lag(stop: asyncio.Event, samples: List[float]) -> None:
+    """Record how late the event loop wakes a sleeping task."""
+    while not stop.is_set():
+        started = time.monotonic()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, time.monotonic() - started - LAG_INTERVAL))
+
+
+async def run_load(
+    mix: Dict[str, int],
+    invocations: int,
+    api: Optional[FakeDiscord] = None,
+    arrival_rate: float = 0.0,
+    channels: int = 100,
+    guilds: int = 10,
+    seed: Optional[int] = None
+) -> LoadReport:
+    """Fire invocations commands drawn from mix and wait for all of them.
+
+    With arrival_rate 0 every invocation starts at once; otherwise they
+    arrive evenly at that many per second. Invocations are spread round-robin
+    over channels, and channels over guilds.
+    """
+    api = api or FakeDiscord(seed=seed)
+    rng = random.Random(seed)
+    commands = resolve_commands(list(mix))
+    names, weights = list(mix), list(mix.values())
+    pool = [FakeChannel(api, 900_000 + i) for i in range(channels)]
+
+    lag: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(sample_lag(stop, lag))
+
+    started = time.monotonic()
+    tasks = []
+    for i in range(invocations):
+        if arrival_rate:
+            delay = started + i / arrival_rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        command = commands[rng.choices(names, weights)[0]]
+        channel = pool[i % channels]
+        guild_id = 800_000 + (i % channels) % max(1, guilds)
+        tasks.append(asyncio.create_task(
+            invoke(api, command, channel, guild_id, random_options(command, rng))
+        ))
+
+    results = await asyncio.gather(*tasks)
+    wall = time.monotonic() - started
+    stop.set()
+    await monitor
+    return LoadReport(list(results), dict(api.requests), wall, lag)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the slash commands against a fake Discord")
+    parser.add_argument("--invocations", type=int, default=1000, help="Commands to run (default: 1000)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Command weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--arrival-rate", type=float, default=0.0,
+                        help="Commands started per second (default: 0 = all at once)")
+    parser.add_argument("--channels", type=int, default=100, help="Channels to spread commands over")
+    parser.add_argument("--guilds", type=int, default=10, help="Guilds to spread channels over")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per API call")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Latency spread as a fraction of --latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Fraction of API calls that get a random 429 (default: 0)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of random 429s")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the command mix and the fake API")
+    args = parser.parse_args()
+
+    api = FakeDiscord(args.latency, args.jitter, args.rate_limit, args.retry_after, args.seed)
+    print(f"🚀 {args.invocations} invocations over {args.channels} channels ({args.mix})")
+    report = asyncio.run(run_load(
+        parse_mix(args.mix), args.invocations, api,
+        arrival_rate=args.arrival_rate, channels=args.channels, guilds=args.guilds, seed=args.seed
+    ))
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+ASDF X Post Generator - Replay
+==============================
+Feeds a session recorded with RECORD_FILE (see recorder.py) back through
+the slash-command handlers against the fake Discord, keeping the original
+inter-arrival times, channels and guilds, and compares latencies with
+the recorded ones.
+
+Usage:
+    python -m benchmarks.replay interactions.log
+    python -m benchmarks.replay interactions.log --since 2026-10-12T08:00 --until 2026-10-12T10:00
+    python -m benchmarks.replay interactions.log --speed 10     # 10x faster
+    python -m benchmarks.replay interactions.log --speed 0      # All at once
+
+Commands that change bot state (/reload, /profile, /guildconfig) are
+skipped unless --skip says otherwise.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import bot
+from benchmarks.fake_discord import FakeChannel, FakeDiscord
+from benchmarks.loadtest import Invocation, LoadReport, format_ms, invoke, percentile, sample_lag
+from recorder import RecordedInteraction, read_recording
+
+DEFAULT_SKIP = "reload,profile,guildconfig"
+
+
+def parse_time(value: str) -> float:
+    """Unix seconds from a number or an ISO 8601 date/time (local time if naive)."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def load_session(
+    path: str,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    skip: Sequence[str] = ()
+) -> List[RecordedInteraction]:
+    """Recorded commands in [since, until), sorted by arrival."""
+    records = [
+        record for record in read_recording(path)
+        if (since is None or record.at >= since)
+        and (until is None or record.at < until)
+        and record.command not in skip
+    ]
+    records.sort(key=lambda record: record.at)
+    return records
+
+
+async def replay(
+    records: Sequence[RecordedInteraction],
+    api: Optional[FakeDiscord] = None,
+    speed: float = 1.0
+) -> LoadReport:
+    """Run recorded commands at their recorded offsets, divided by speed.
+
+    speed 0 starts everything at once. Commands no longer in the tree are
+    reported as errors.
+    """
+    api = api or FakeDiscord()
+    channels: Dict[Optional[int], FakeChannel] = {}
+    lag: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(sample_lag(stop, lag))
+
+    started = time.monotonic()
+    first = records[0].at if records else 0.0
+    tasks = []
+    missing = []
+    for record in records:
+        if speed:
+            delay = started + (record.at - first) / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        channel = channels.get(record.channel_id)
+        if channel is None:
+            channel = channels[record.channel_id] = FakeChannel(api, record.channel_id or 0)
+        command = bot.bot.tree.get_command(record.command)
+        if command is None:
+            now = time.monotonic()
+            missing.append(Invocation(record.command, now, None, now, 0, f"Unknown command: {record.command!r}"))
+            continue
+        tasks.append(asyncio.create_task(invoke(api, command, channel, record.guild_id, record.options)))
+
+    results = [*await asyncio.gather(*tasks), *missing]
+    wall = time.monotonic() - started
+    stop.set()
+    await monitor
+    return LoadReport(list(results), dict(api.requests), wall, lag)
+
+
+def compare_table(records: Sequence[RecordedInteraction], report: LoadReport) -> str:
+    """Recorded vs replayed completion latency per command."""
+    recorded: Dict[str, List[float]] = {}
+    for record in records:
+        recorded.setdefault(record.command, []).append(record.duration_ms / 1000)
+    replayed = report.by_command()
+
+    lines = [f"{'command':<12} {'runs':>6} {'recorded p50':>13} {'p95':>9} {'replayed p50':>13} {'p95':>9}"]
+    for name in sorted(recorded):
+        before = recorded[name]
+        after = [r.total for r in replayed.get(name, [])]
+        lines.append(
+            f"{name:<12} {len(before):>6} {format_ms(percentile(before, 50)):>13} {format_ms(percentile(before, 95)):>9} "
+            f"{format_ms(percentile(after, 50)):>13} {format_ms(percentile(after, 95)):>9}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded slash commands against a fake Discord")
+    parser.add_argument("recording", help="File written with RECORD_FILE")
+    parser.add_argument("--since", type=parse_time, default=None, help="Start (Unix seconds or ISO time)")
+    parser.add_argument("--until", type=parse_time, default=None, help="End (Unix seconds or ISO time)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Time compression, e.g. 10 for 10x faster (0 = all at once)")
+    parser.add_argument("--skip", default=DEFAULT_SKIP, help=f"Commands to leave out (default: {DEFAULT_SKIP})")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per API call")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of API calls that get a random 429")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the fake API")
+    args = parser.parse_args()
+
+    skip = [name.strip() for name in args.skip.split(",") if name.strip()]
+    records = load_session(args.recording, args.since, args.until, skip)
+    if not records:
+        print("❌ No recorded commands in that range.")
+        return
+
+    span = records[-1].at - records[0].at
+    print(f"▶️ Replaying {len(records)} commands spanning {span:.0f}s"
+          + (f" at {args.speed:g}x" if args.speed else " all at once"))
+    api = FakeDiscord(latency=args.latency, rate_limit=args.rate_limit, seed=args.seed)
+    report = asyncio.run(replay(records, api, args.speed))
+    print(report.format())
+    print()
+    print(compare_table(records, report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+ASDF X Post Generator - Benchmark Suite
+=======================================
+Times every PostGenerator public method, get_hashtags and the bot's
+message helpers on the built-in templates ("small") and on a synthetic
+pack with 10k entries per family ("large"), and compares the results
+with a stored JSON baseline.
+
+Usage:
+    python -m benchmarks.suite                  # Compare with the baseline
+    python -m benchmarks.suite --update         # Record a new baseline
+    python -m benchmarks.suite --filter split   # Only matching cases
+
+Exits with status 1 when any case is slower than its baseline by more than
+--threshold (default 25%). Baselines are machine-specific: record one on
+the host that runs the comparison.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from cache import fingerprint
+from config import PostType
+from generator import PostGenerator
+from live_config import builtin_snapshot
+from post_history import RecentWindow
+from template_store import TemplateFamilies, builtin_families
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Allowed slowdown before a case counts as a regression (0.25 = 25%)
+DEFAULT_THRESHOLD = 0.25
+
+# Entries per family in the synthetic pack
+LARGE_PACK_SIZE = 10_000
+
+# Seconds per timed repeat, and repeats per case (the best one counts)
+TARGET_TIME = 0.05
+REPEATS = 5
+
+Case = Tuple[str, Callable[[], object]]
+
+
+# =============================================================================
+# INPUTS
+# =============================================================================
+
+def synthetic_families(size: int = LARGE_PACK_SIZE) -> TemplateFamilies:
+    """The built-in templates with raid, cult, viral and FUD families padded to size entries."""
+    base = builtin_families()
+
+    def grow(entries: List[str]) -> List[str]:
+        return [f"{entry}\n\nvariant {i}" for i, entry in zip(range(size), itertools.cycle(entries))]
+
+    raid = dict(base.raid_templates)
+    for i in range(size - len(raid)):
+        raid[f"comparison_{i}"] = {**raid["comparison"], "template": f"{raid['comparison']['template']}\n\nvariant {i}"}
+
+    return replace(
+        base,
+        raid_templates=raid,
+        cult_templates=grow(base.cult_templates),
+        viral_templates=grow(base.viral_templates),
+        fud_responses={key: grow(responses) for key, responses in base.fud_responses.items()},
+        digest=fingerprint("synthetic", base.digest, size),
+    )
+
+
+def sample_export(size: int) -> str:
+    """Weekly exports concatenated to at least size characters."""
+    generator = PostGenerator()
+    weeks = []
+    total = 0
+    for week in itertools.count(1):
+        text = generator.export_weekly_posts(week, seed=week)
+        weeks.append(text)
+        total += len(text) + 1
+        if total >= size:
+            return "\n".join(weeks)
+
+
+# =============================================================================
+# CASES
+# =============================================================================
+
+def generator_cases(label: str, generator: PostGenerator) -> List[Case]:
+    """One case per public PostGenerator method."""
+    uncached = PostGenerator(cache_size=0, variant_cache_size=0, snapshot=generator.snapshot)
+    variants = itertools.count()
+    window = RecentWindow(10, [f"cult:{i}" for i in range(10)])
+    variant_id = generator.generate_variant("raid", "holdex", "imagine", 1).variant_id
+
+    cases = {
+        "generate_raid": lambda: generator.generate_raid("what_do_you_think", "holdex", rng=1),
+        "generate_raid_viral": lambda: generator.generate_raid("viral", "ignition", rng=1),
+        "generate_thread": lambda: generator.generate_thread("ecosystem", rng=1),
+        "generate_cult_post": lambda: generator.generate_cult_post(rng=1),
+        "generate_fud_response": lambda: generator.generate_fud_response("scam", rng=1),
+        "generate_tracked": lambda: generator.generate_tracked("cult", rng=1, avoid=window),
+        "generate_reply": lambda: generator.generate_reply("ecosystem"),
+        "generate_milestone": lambda: generator.generate_milestone(3, rng=1),
+        "generate_variant": lambda: uncached.generate_variant("raid", "holdex", "imagine", next(variants)),
+        "regenerate": lambda: generator.regenerate(variant_id),
+        "generate_batch": lambda: generator.generate_batch("raid", 20, rng=1),
+        "get_all_fud_responses": generator.get_all_fud_responses,
+        "get_all_replies": generator.get_all_replies,
+        "config_fingerprint": generator.config_fingerprint,
+        "generate_weekly_posts": lambda: uncached.generate_weekly_posts(1, seed=1),
+        "export_weekly_posts": lambda: uncached.export_weekly_posts(1, seed=1),
+        "export_weekly_posts_cached": lambda: generator.export_weekly_posts(1, seed=1),
+        "export_range": lambda: uncached.export_range(1, 4, seed=1),
+        "export_fud_responses": generator.export_fud_responses,
+        "export_reply_templates": generator.export_reply_templates,
+        "iter_weekly_export": lambda: list(uncached.iter_weekly_export(1, seed=1)),
+        "iter_fud_export": lambda: list(generator.iter_fud_export()),
+        "iter_reply_export": lambda: list(generator.iter_reply_export()),
+        "with_snapshot": lambda: generator.with_snapshot(builtin_snapshot()),
+        "apply_snapshot": lambda: uncached.apply_snapshot(uncached.snapshot),
+    }
+    return [(f"generator.{name}[{label}]", func) for name, func in cases.items()]
+
+
+def helper_cases() -> List[Case]:
+    """Hashtag selection and the bot's message helpers."""
+    # Imported here so generator-only runs don't construct the bot
+    from bot import format_post_for_discord, split_message
+
+    small = sample_export(10_000)
+    large = sample_export(1_500_000)
+    return [
+        ("config.get_hashtags", lambda: config.get_hashtags(PostType.RAID, "holdex", "dexscreener")),
+        ("config.hashtag_options", lambda: config.hashtag_options("holdex", "dexscreener")),
+        ("bot.split_message[small]", lambda: split_message(small)),
+        ("bot.split_message[large]", lambda: split_message(large)),
+        ("bot.format_post_for_discord[small]", lambda: format_post_for_discord(small[:1800], "📋 Copy this:")),
+        ("bot.format_post_for_discord[large]", lambda: format_post_for_discord(large, "📋 Copy this:")),
+    ]
+
+
+def all_cases(large_size: int = LARGE_PACK_SIZE) -> List[Case]:
+    """Every benchmark case, built once."""
+    small = PostGenerator()
+    large = PostGenerator(snapshot=builtin_snapshot(synthetic_families(large_size)))
+    return generator_cases("small", small) + generator_cases("large", large) + helper_cases()
+
+
+# =============================================================================
+# TIMING & BASELINES
+# =============================================================================
+
+def time_case(func: Callable[[], object], target: float = TARGET_TIME, repeats: int = REPEATS) -> float:
+    """Best seconds per call over repeats, each running for about target seconds."""
+    started = time.perf_counter()
+    func()  # Warm caches and lazily compiled templates
+    once = max(time.perf_counter() - started, 1e-7)
+    number = max(1, int(target / once))
+
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def compare(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[Tuple[str, float, float]]:
+    """(case, baseline, result) for every case slower than baseline * (1 + threshold)."""
+    return [
+        (name, baseline[name], seconds)
+        for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, float]:
+    """Seconds per call by case name; empty when there is no baseline yet."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["cases"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_baseline(results: Dict[str, float], path: str = BASELINE_PATH) -> None:
+    """Write results as the new baseline."""
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "recorded_at": time.strftime("%Y-%m-%d"),
+        "cases": dict(sorted(results.items())),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    return f"{seconds * 1e3:.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generator and bot helpers")
+    parser.add_argument("--update", action="store_true", help="Record the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown, e.g. 0.25 for 25%% (default: 0.25)")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--large-size", type=int, default=LARGE_PACK_SIZE,
+                        help="Entries per family in the synthetic pack (default: 10000)")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results: Dict[str, float] = {}
+
+    print(f"{'case':<52} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, func in all_cases(args.large_size):
+        if args.filter not in name:
+            continue
+        results[name] = seconds = time_case(func)
+        before = baseline.get(name)
+        change = f"{(seconds / before - 1) * 100:+.0f}%" if before else "new"
+        print(f"{name:<52} {format_seconds(before):>10} {format_seconds(seconds):>10} {change:>8}")
+
+    if args.update:
+        save_baseline({**baseline, **results} if args.filter else results, args.baseline)
+        print(f"\n💾 Baseline written to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} case(s) regressed by more than {args.threshold:.0%}:")
+        for name, before, now in regressions:
+            print(f"  {name}: {format_seconds(before)} → {format_seconds(now)}")
+        sys.exit(1)
+    print(f"\n✅ No regressions over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,22 +13,41 @@ Commands:
 - /milestone [week] - Generate a milestone post
 - /templates - Show all available templates
 - /help_posts - Show help for post generation
+- /botstats - Show outbound queue and rate-limit stats
+- /shards - Show gateway latency and health per shard
+- /reload - Reload templates, products and stats (admin)
+- /guildconfig [action] [setting] [value] - Per-server config overrides (admin)
+- /profile [action] [rate] [name] - Sample commands under cProfile (admin)
 """
 
+import asyncio
+import json
 import os
+import sqlite3
+import tempfile
+import zipfile
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
 from datetime import datetime, time
-import asyncio
-from typing import List
-
-from generator import PostGenerator
-from config import (
-    PRODUCTS, DayOfWeek, WEEKLY_SCHEDULE,
-    THREAD_TEMPLATES, FUD_RESPONSES, REPLY_TEMPLATES,
-    RAID_TEMPLATES
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from generator import PostGenerator, TrackedPost
+from outbound import OutboundQueue
+from offload import Offloader
+from command_sync import sync_if_changed
+from shards import SHARD_COUNT, SHARD_IDS, SHARDING, owns_guild, shard_stats, summarize_shards
+from cluster_store import CLUSTER_ID, open_cluster_store
+from config import DayOfWeek, PostType
+from live_config import RELOAD_INTERVAL, ConfigReloader, ConfigSnapshot
+from guild_config import SETTINGS, open_guild_config
+from post_history import RecentWindow, open_post_history
+from near_duplicates import MinHashIndex
+from profiling import Profiler
+from recorder import open_recorder
+from metrics import (
+    METRICS_HOST, METRICS_PORT, REGISTRY, MetricFamily, instrument_trace, start_command, start_metrics_server
 )
 
 # Load environment variables
@@ -44,35 +63,436 @@ intents = discord.Intents.default()
 # Note: message_content intent not needed for slash commands only
 # If you want to use prefix commands, enable it in Discord Developer Portal
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+# Outbound sends are paced per channel from Discord's rate-limit headers
+outbound = OutboundQueue()
+
+# Exports and message packing run on worker threads, not the event loop
+offloader = Offloader()
+
+# SHARDING=1 runs one gateway connection per shard instead of a single one
+BotBase = commands.AutoShardedBot if SHARDING else commands.Bot
+bot_options = {"shard_count": SHARD_COUNT} if SHARDING and SHARD_COUNT else {}
+if SHARDING and SHARD_IDS:
+    bot_options["shard_ids"] = SHARD_IDS
+
+# Shared with the other processes when launched by cluster.py
+cluster = open_cluster_store()
+
+class TimedTree(app_commands.CommandTree):
+    """Command tree that starts a latency timer for every slash command."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.command is not None:
+            interaction.extras["timer"] = start_command(interaction.command.qualified_name)
+        return True
+
+class PostBot(BotBase):
+    """Bot that syncs its command tree once per process, before connecting."""
+
+    async def setup_hook(self):
+        """Start the metrics endpoint and sync commands if the tree changed.
+
+        on_ready fires again after every gateway reconnect; setup_hook runs
+        once per process.
+        """
+        if METRICS_PORT:
+            # Cluster workers share a host, so each takes the next port
+            port = METRICS_PORT + (int(CLUSTER_ID) if cluster else 0)
+            try:
+                await start_metrics_server(port)
+                print(f'📈 Metrics at http://{METRICS_HOST}:{port}/metrics')
+            except OSError as e:
+                print(f'❌ Failed to start metrics endpoint on port {port}: {e}')
+
+        # Commands belong to the application, so one cluster worker syncs for all
+        if cluster and CLUSTER_ID != "0":
+            return
+
+        guild = discord.Object(id=int(GUILD_ID)) if GUILD_ID else None
+        scope = f"guild {GUILD_ID}" if GUILD_ID else "globally"
+        try:
+            synced = await sync_if_changed(self.tree, guild=guild)
+        except Exception as e:
+            print(f'❌ Failed to sync commands: {e}')
+            return
+
+        if synced is None:
+            print(f'🔄 Command tree unchanged, skipped sync {scope}')
+        else:
+            print(f'🔄 Synced {len(synced)} command(s) {scope}')
+
+bot = PostBot(
+    command_prefix='!',
+    intents=intents,
+    tree_cls=TimedTree,
+    http_trace=instrument_trace(outbound.trace_config()),
+    **bot_options
+)
 generator = PostGenerator()
 
+# Rebuilds the generator's config snapshot when config.py or the template pack changes
+reloader = ConfigReloader()
+
+# Per-guild overrides of stats, products, schedule and reminder channel (GUILD_DB)
+guild_configs = open_guild_config()
+
+def generator_for_guild(guild_id: Optional[int]) -> PostGenerator:
+    """The generator with a guild's overrides applied, sharing its caches."""
+    if not guild_configs or guild_id is None:
+        return generator
+    return generator.with_snapshot(guild_configs.snapshot_for(guild_id, generator.snapshot))
+
+def generator_for(interaction: discord.Interaction) -> PostGenerator:
+    """The generator for the guild an interaction came from."""
+    return generator_for_guild(interaction.guild_id)
+
+# What each channel was recently given, so templates aren't repeated (HISTORY_DB)
+history = open_post_history()
+
+# Windows and indexes are only changed on the event loop; worker threads
+# just load cold ones from SQLite and write flushed rows
+
+async def recent_templates(interaction: discord.Interaction, post_type: PostType) -> Optional[RecentWindow]:
+    """Template ids recently generated in the interaction's channel, loaded off the event loop."""
+    if not history or interaction.channel_id is None:
+        return None
+    window = history.cached_recent(interaction.guild_id, interaction.channel_id, post_type.value)
+    if window is not None:
+        return window
+    return await load_history(interaction, history.recent, interaction.guild_id, interaction.channel_id, post_type.value)
+
+async def similar_posts(interaction: discord.Interaction) -> Optional[MinHashIndex]:
+    """Near-duplicate index of the guild's recent posts, loaded off the event loop."""
+    if not history:
+        return None
+    index = history.cached_similar(interaction.guild_id)
+    if index is not None:
+        return index
+    return await load_history(interaction, history.similar, interaction.guild_id)
+
+async def load_history(interaction: discord.Interaction, func: Callable[..., Any], *args: Any) -> Any:
+    """Load a cold history scope on the offloader, deferring the interaction first.
+
+    A cold load can take a while and queue behind exports on the
+    offloader, past Discord's 3s deadline for a first response.
+    """
+    if not interaction.response.is_done():
+        await interaction.response.defer()
+    return await offloader.run(func, *args)
+
+async def remember_post(interaction: discord.Interaction, post_type: PostType, post: TrackedPost) -> None:
+    """Add a generated post to the channel's history, writing full batches off the event loop.
+
+    A failed write is logged, not raised; the rows stay buffered for the next flush.
+    """
+    if not history or interaction.channel_id is None:
+        return
+    if history.record(interaction.guild_id, interaction.channel_id, post_type.value, post.template_id, post.content):
+        try:
+            await offloader.run(history.flush)
+        except sqlite3.Error as e:
+            print(f"❌ Post history flush failed: {e}")
+
+# Append-only log of handled commands for offline replay (RECORD_FILE)
+recorder = open_recorder()
+
+DEFERRED_RESPONSES = (
+    discord.InteractionResponseType.deferred_channel_message,
+    discord.InteractionResponseType.deferred_message_update,
+)
+
+def finish_command(interaction: discord.Interaction, status: str) -> None:
+    """Record a finished command's latencies for /metrics, and log it if recording."""
+    timer = interaction.extras.pop("timer", None)
+    if timer is None:
+        return
+    timer.finish(status, interaction.response.type in DEFERRED_RESPONSES)
+    if recorder:
+        recorder.record_interaction(interaction, status, timer.started)
+
+def outbound_metrics() -> List[MetricFamily]:
+    """Outbound queue totals, read at scrape time."""
+    stats = outbound.stats()
+    return [
+        MetricFamily("bot_messages_sent_total", "counter",
+                     "Messages sent through the outbound queue", [({}, stats["sent"])]),
+        MetricFamily("bot_messages_rate_limited_total", "counter",
+                     "429 responses to outbound queue sends", [({}, stats["rate_limited"])]),
+        MetricFamily("bot_outbound_queue_depth", "gauge",
+                     "Send sessions waiting for or holding a channel lane", [({}, stats["depth"])]),
+    ]
+
+def offload_metrics() -> List[MetricFamily]:
+    """Offloaded generation/export jobs, read at scrape time."""
+    stats = offloader.stats()
+    return [
+        MetricFamily("bot_offload_queue_depth", "gauge",
+                     "Generation and export jobs waiting for a worker thread", [({}, stats["depth"])]),
+        MetricFamily("bot_offload_running", "gauge",
+                     "Generation and export jobs running on worker threads", [({}, stats["running"])]),
+        MetricFamily("bot_offload_jobs_total", "counter",
+                     "Generation and export jobs started on worker threads", [({}, stats["jobs"])]),
+        MetricFamily("bot_offload_wait_seconds_total", "counter",
+                     "Seconds jobs waited for a worker thread", [({}, offloader.wait_total)]),
+    ]
+
+def shard_metrics() -> List[MetricFamily]:
+    """Gateway latency and health of each shard this process runs, read at scrape time."""
+    shards = shard_stats(bot)
+    return [
+        MetricFamily("bot_shard_up", "gauge", "1 if the shard's gateway is open and its heartbeats are acknowledged",
+                     [({"shard": str(s["id"])}, 0 if s["closed"] or s["latency"] is None else 1) for s in shards]),
+        MetricFamily("bot_shard_latency_seconds", "gauge", "Gateway heartbeat latency per shard",
+                     [({"shard": str(s["id"])}, s["latency"]) for s in shards if s["latency"] is not None]),
+        MetricFamily("bot_shard_ratelimited", "gauge", "1 if the shard's gateway sends are rate limited",
+                     [({"shard": str(s["id"])}, 1 if s["ratelimited"] else 0) for s in shards]),
+        MetricFamily("bot_shard_guilds", "gauge", "Guilds handled per shard",
+                     [({"shard": str(s["id"])}, s["guilds"]) for s in shards]),
+    ]
+
+REGISTRY.register_collector(outbound_metrics)
+REGISTRY.register_collector(offload_metrics)
+REGISTRY.register_collector(shard_metrics)
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Discord message limits
+MAX_MESSAGE_LENGTH = 2000
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+FENCE = "```"
+
+# Longest /export range, in weeks
+MAX_EXPORT_WEEKS = 52
+
 def split_message(content: str, max_length: int = 1900) -> List[str]:
-    """Split a long message into chunks."""
+    """Split a long message into chunks of at most max_length characters.
+
+    Splits on line breaks where possible; lines longer than a chunk are cut
+    at the last space that fits, or hard-cut when there is none. Code fences
+    stay balanced: a chunk that ends inside a ``` block is closed, and the
+    block is reopened with the same fence line at the top of the next chunk.
+    Runs in linear time.
+    """
     if len(content) <= max_length:
         return [content]
 
-    chunks = []
-    lines = content.split('\n')
-    current_chunk = ""
-
-    for line in lines:
-        if len(current_chunk) + len(line) + 1 > max_length:
-            if current_chunk:
-                chunks.append(current_chunk)
-            current_chunk = line
-        else:
-            current_chunk += ('\n' if current_chunk else '') + line
-
-    if current_chunk:
-        chunks.append(current_chunk)
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0  # len("\n".join(current))
+    fence: Optional[str] = None  # Opening line of the block we're inside
+
+    def add(piece: str):
+        nonlocal size
+        size += len(piece) + (1 if current else 0)
+        current.append(piece)
+
+    def close_chunk():
+        nonlocal current, size
+        if fence is not None:
+            current.append(FENCE)
+        chunks.append("\n".join(current))
+        current, size = [], 0
+        if fence is not None:
+            add(fence)
+
+    def has_content() -> bool:
+        return bool(current) and not (fence is not None and len(current) == 1)
+
+    for line in content.split("\n"):
+        opens = closes = False
+        if FENCE in line:
+            stripped = line.strip()
+            if stripped.startswith(FENCE):
+                if fence is None:
+                    opens = FENCE not in stripped[len(FENCE):]
+                else:
+                    closes = not stripped.strip("`")
+                    if closes:
+                        line = FENCE
+
+        # Keep room to close the block if this line leaves us inside one
+        reserve = len(FENCE) + 1 if opens or (fence is not None and not closes) else 0
+        start = 0
+
+        while True:
+            room = max_length - size - (1 if current else 0) - reserve
+            if len(line) - start <= room:
+                piece = line[start:] if start else line
+                size += len(piece) + (1 if current else 0)
+                current.append(piece)
+                break
+            if has_content():
+                close_chunk()
+                continue
+
+            # Too long even for an empty chunk: cut at a space if possible
+            room = max(room, 1)
+            cut = line.rfind(" ", start, start + room + 1)
+            if cut > start + room // 2:
+                add(line[start:cut])
+                start = cut + 1
+            else:
+                add(line[start:start + room])
+                start += room
+            close_chunk()
+
+        if opens:
+            fence = stripped
+        elif closes:
+            fence = None
+
+    if has_content():
+        if fence is not None:
+            current.append(FENCE)
+        chunks.append("\n".join(current))
 
     return chunks
 
+class MessagePacker:
+    """Packs consecutive items into as few messages as possible.
+
+    Items keep their order and are joined with separator; a message is closed
+    as soon as the next item would push it past max_length (including the
+    prefix/suffix wrapped around every message). Greedy filling is optimal
+    when order has to be preserved. Items that can't fit on their own are
+    split with split_message.
+    """
+
+    def __init__(self, max_length: int = 2000, separator: str = "\n", prefix: str = "", suffix: str = ""):
+        self.budget = max_length - len(prefix) - len(suffix)
+        self.separator = separator
+        self.prefix = prefix
+        self.suffix = suffix
+        self._items: List[str] = []
+        self._size = 0
+
+    def add(self, item: str) -> List[str]:
+        """Add an item, returning any messages that are now complete."""
+        done = []
+        for piece in split_message(item, self.budget):
+            extra = len(piece) + (len(self.separator) if self._items else 0)
+            if self._items and self._size + extra > self.budget:
+                done.append(self._close())
+                extra = len(piece)
+            self._items.append(piece)
+            self._size += extra
+        return done
+
+    def flush(self) -> List[str]:
+        """Close the message in progress, if any."""
+        return [self._close()] if self._items else []
+
+    def _close(self) -> str:
+        message = f"{self.prefix}{self.separator.join(self._items)}{self.suffix}"
+        self._items, self._size = [], 0
+        return message
+
+
+def pack_messages(items: Iterable[str], max_length: int = 2000, separator: str = "\n") -> List[str]:
+    """Pack items, in order, into the fewest messages under max_length."""
+    packer = MessagePacker(max_length, separator)
+    messages = []
+    for item in items:
+        messages.extend(packer.add(item))
+    messages.extend(packer.flush())
+    return messages
+
+def pack_embeds(embeds: Iterable[discord.Embed]) -> List[List[discord.Embed]]:
+    """Group embeds, in order, into as few messages as Discord allows.
+
+    A message holds at most 10 embeds and 6000 embed characters in total.
+    """
+    groups: List[List[discord.Embed]] = []
+    current: List[discord.Embed] = []
+    size = 0
+
+    for embed in embeds:
+        if current and (len(current) == MAX_EMBEDS_PER_MESSAGE or size + len(embed) > MAX_EMBED_CHARS_PER_MESSAGE):
+            groups.append(current)
+            current, size = [], 0
+        current.append(embed)
+        size += len(embed)
+
+    if current:
+        groups.append(current)
+    return groups
+
+async def stream_chunks(
+    channel: discord.abc.Messageable,
+    sections: Iterable[str],
+    max_length: int = MAX_MESSAGE_LENGTH
+) -> int:
+    """Send sections as code-block messages while they're being generated.
+
+    Sections are packed into as few messages as possible and each message
+    goes out as soon as it is full, so the first message is sent before the
+    rest of the export exists. Generating and packing run on the offloader's
+    worker threads. Returns the number of messages sent.
+    """
+    sent = 0
+    async with outbound.session(channel) as send:
+        async for message in offloader.iterate(packed_chunks(sections, max_length)):
+            await send(message)
+            sent += 1
+    return sent
+
+def packed_chunks(sections: Iterable[str], max_length: int = MAX_MESSAGE_LENGTH) -> Iterator[str]:
+    """Code-block messages packed from sections, each yielded once full."""
+    packer = MessagePacker(max_length, prefix="```\n", suffix="\n```")
+    for section in sections:
+        yield from packer.add(section)
+    yield from packer.flush()
+
+async def send_packed(
+    channel: discord.abc.Messageable,
+    blocks: List[Tuple[str, str]],
+    use_embeds: bool = False,
+    color: int = 0x00ff00
+) -> int:
+    """Send (title, body) blocks in as few messages as possible.
+
+    Blocks become bold-titled code blocks packed under the message limit,
+    or with use_embeds, one embed each, up to 10 per message. Returns the
+    number of messages sent.
+    """
+    async with outbound.session(channel) as send:
+        if use_embeds:
+            embeds = [
+                discord.Embed(title=title, description=f"```\n{body}\n```", color=color)
+                for title, body in blocks
+            ]
+            groups = pack_embeds(embeds)
+            for group in groups:
+                await send(embeds=group)
+            return len(groups)
+
+        messages = pack_messages(f"**{title}**\n```\n{body}\n```" for title, body in blocks)
+        for message in messages:
+            await send(message)
+        return len(messages)
+
+def spool_sections(sections: Iterable[str]) -> IO[bytes]:
+    """Write export sections to a temporary file instead of one big string."""
+    fp = tempfile.TemporaryFile(mode="w+b")
+    for i, section in enumerate(sections):
+        if i:
+            fp.write(b"\n")
+        fp.write(section.encode("utf-8"))
+    fp.seek(0)
+    return fp
+
+def archive_weeks(exports: Dict[int, str]) -> IO[bytes]:
+    """Zip one text file per week into a temporary file."""
+    fp = tempfile.TemporaryFile(mode="w+b")
+    with zipfile.ZipFile(fp, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for week, text in exports.items():
+            archive.writestr(f"week{week}_posts.txt", text)
+    fp.seek(0)
+    return fp
+
 def format_post_for_discord(content: str, title: str = None) -> str:
     """Format a post for Discord display."""
     output = ""
@@ -83,6 +503,29 @@ def format_post_for_discord(content: str, title: str = None) -> str:
     output += "\n```"
     return output
 
+async def respond(interaction: discord.Interaction, content: Optional[str] = None, **kwargs) -> None:
+    """Answer an interaction, as a followup if it was deferred."""
+    if interaction.response.is_done():
+        await interaction.followup.send(content, **kwargs)
+    else:
+        await interaction.response.send_message(content, **kwargs)
+
+async def send_post(interaction: discord.Interaction, embed: discord.Embed, post: str) -> None:
+    """Answer with the embed and the copyable post in a single response.
+
+    The post goes in the message content, above the embed, so one API call
+    delivers both. A post too long for one message is sent as followups.
+    If the interaction was deferred, the answer is a followup too.
+    """
+    content = format_post_for_discord(post, "📋 Copy this:")
+    if len(content) <= MAX_MESSAGE_LENGTH:
+        await respond(interaction, content, embed=embed)
+        return
+
+    await respond(interaction, embed=embed)
+    for chunk in split_message(content):
+        await interaction.followup.send(chunk)
+
 def create_embed(title: str, description: str, color: int = 0x00ff00) -> discord.Embed:
     """Create a Discord embed."""
     embed = discord.Embed(
@@ -103,24 +546,35 @@ async def on_ready():
     """Called when bot is ready."""
     print(f'✅ {bot.user} is now running!')
     print(f'📊 Connected to {len(bot.guilds)} guild(s)')
-
-    # Sync commands
-    try:
-        if GUILD_ID:
-            guild = discord.Object(id=int(GUILD_ID))
-            synced = await bot.tree.sync(guild=guild)
-            print(f'🔄 Synced {len(synced)} command(s) to guild {GUILD_ID}')
-        else:
-            synced = await bot.tree.sync()
-            print(f'🔄 Synced {len(synced)} command(s) globally')
-    except Exception as e:
-        print(f'❌ Failed to sync commands: {e}')
-
-    # Start scheduled tasks if channel is configured (only if not already running)
-    if OUTPUT_CHANNEL_ID and not daily_post_reminder.is_running():
+    if SHARDING:
+        shard_ids = bot.shard_ids or range(bot.shard_count)
+        print(f'🛰️ Running {len(shard_ids)} of {bot.shard_count} shard(s)')
+    if cluster:
+        print(f'🧩 Cluster worker {CLUSTER_ID}, shared store {cluster.path}')
+
+    # Start scheduled tasks if a channel can be configured (only if not already running)
+    if (OUTPUT_CHANNEL_ID or guild_configs) and not daily_post_reminder.is_running():
         daily_post_reminder.start()
         print('⏰ Scheduled tasks started')
 
+    if history and not flush_history.is_running():
+        flush_history.start()
+
+    if RELOAD_INTERVAL > 0 and not watch_config.is_running():
+        watch_config.change_interval(seconds=RELOAD_INTERVAL)
+        watch_config.start()
+        print(f'👀 Watching config for changes every {RELOAD_INTERVAL:g}s')
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command: app_commands.Command):
+    """Called after a slash command finished without raising."""
+    finish_command(interaction, "ok")
+
+@bot.event
+async def on_shard_ready(shard_id: int):
+    """Called when one shard is ready (sharded mode only)."""
+    print(f'🛰️ Shard {shard_id} ready')
+
 # =============================================================================
 # SLASH COMMANDS
 # =============================================================================
@@ -136,17 +590,8 @@ async def week_command(interaction: discord.Interaction, week_number: int = 1):
     await interaction.response.defer()
 
     try:
-        output = generator.export_weekly_posts(week_number)
-        chunks = split_message(output, 1900)
-
-        # Send first message as response
-        await interaction.followup.send(f"**📅 WEEK {week_number} POSTS GENERATED**\n\n*Sending {len(chunks)} message(s)...*")
-
-        # Send remaining chunks
-        for i, chunk in enumerate(chunks):
-            await interaction.channel.send(f"```\n{chunk}\n```")
-            if i < len(chunks) - 1:
-                await asyncio.sleep(0.5)  # Avoid rate limiting
+        await interaction.followup.send(f"**📅 WEEK {week_number} POSTS GENERATED**\n\n*Sending posts...*")
+        await stream_chunks(interaction.channel, generator_for(interaction).iter_weekly_export(week_number))
 
     except Exception as e:
         await interaction.followup.send(f"❌ Error generating posts: {str(e)}")
@@ -182,7 +627,13 @@ async def raid_command(
 ):
     """Generate a raid post."""
     try:
-        post = generator.generate_raid(style, product)
+        tracked = generator_for(interaction).generate_tracked(
+            "raid", product, style,
+            avoid=await recent_templates(interaction, PostType.RAID),
+            near_duplicates=await similar_posts(interaction)
+        )
+        await remember_post(interaction, PostType.RAID, tracked)
+        post = tracked.content
 
         embed = create_embed(
             f"🔥 RAID POST - {product.upper()}",
@@ -190,18 +641,20 @@ async def raid_command(
             color=0xff5500
         )
 
-        await interaction.response.send_message(embed=embed)
-        await interaction.channel.send(format_post_for_discord(post, "📋 Copy this:"))
+        await send_post(interaction, embed, post)
 
     except Exception as e:
-        await interaction.response.send_message(f"❌ Error: {str(e)}")
+        await respond(interaction, f"❌ Error: {str(e)}")
 
 # -----------------------------------------------------------------------------
 # /thread - Generate thread
 # -----------------------------------------------------------------------------
 
 @bot.tree.command(name="thread", description="Generate a thread")
-@app_commands.describe(thread_type="Type of thread")
+@app_commands.describe(
+    thread_type="Type of thread",
+    embeds="Show each tweet as an embed"
+)
 @app_commands.choices(
     thread_type=[
         app_commands.Choice(name="HolDEX", value="holdex"),
@@ -211,19 +664,17 @@ async def raid_command(
         app_commands.Choice(name="Builder Story", value="builder_story"),
     ]
 )
-async def thread_command(interaction: discord.Interaction, thread_type: str = "ecosystem"):
+async def thread_command(interaction: discord.Interaction, thread_type: str = "ecosystem", embeds: bool = False):
     """Generate a thread."""
     await interaction.response.defer()
 
     try:
-        tweets = generator.generate_thread(thread_type)
+        tweets = generator_for(interaction).generate_thread(thread_type)
 
         await interaction.followup.send(f"**🧵 THREAD GENERATED - {thread_type.upper()}**\n\n*{len(tweets)} tweets*")
 
-        for i, tweet in enumerate(tweets, 1):
-            header = f"**Tweet {i}/{len(tweets)}**"
-            await interaction.channel.send(f"{header}\n```\n{tweet}\n```")
-            await asyncio.sleep(0.3)
+        blocks = [(f"Tweet {i}/{len(tweets)}", tweet) for i, tweet in enumerate(tweets, 1)]
+        await send_packed(interaction.channel, blocks, use_embeds=embeds, color=0x1da1f2)
 
     except Exception as e:
         await interaction.followup.send(f"❌ Error: {str(e)}")
@@ -236,7 +687,13 @@ async def thread_command(interaction: discord.Interaction, thread_type: str = "e
 async def cult_command(interaction: discord.Interaction):
     """Generate a cult/philosophy post."""
     try:
-        post = generator.generate_cult_post()
+        tracked = generator_for(interaction).generate_tracked(
+            "cult",
+            avoid=await recent_templates(interaction, PostType.CULT),
+            near_duplicates=await similar_posts(interaction)
+        )
+        await remember_post(interaction, PostType.CULT, tracked)
+        post = tracked.content
 
         embed = create_embed(
             "💊 CULT POST",
@@ -244,11 +701,10 @@ async def cult_command(interaction: discord.Interaction):
             color=0x9b59b6
         )
 
-        await interaction.response.send_message(embed=embed)
-        await interaction.channel.send(format_post_for_discord(post, "📋 Copy this:"))
+        await send_post(interaction, embed, post)
 
     except Exception as e:
-        await interaction.response.send_message(f"❌ Error: {str(e)}")
+        await respond(interaction, f"❌ Error: {str(e)}")
 
 # -----------------------------------------------------------------------------
 # /fud - Generate FUD response
@@ -272,7 +728,13 @@ async def cult_command(interaction: discord.Interaction):
 async def fud_command(interaction: discord.Interaction, fud_type: str = "universal"):
     """Generate a FUD response."""
     try:
-        response = generator.generate_fud_response(fud_type)
+        tracked = generator_for(interaction).generate_tracked(
+            "fud", style=fud_type,
+            avoid=await recent_templates(interaction, PostType.FUD_RESPONSE),
+            near_duplicates=await similar_posts(interaction)
+        )
+        await remember_post(interaction, PostType.FUD_RESPONSE, tracked)
+        response = tracked.content
 
         embed = create_embed(
             f"🛡️ FUD RESPONSE - {fud_type.upper().replace('_', ' ')}",
@@ -280,18 +742,20 @@ async def fud_command(interaction: discord.Interaction, fud_type: str = "univers
             color=0xe74c3c
         )
 
-        await interaction.response.send_message(embed=embed)
-        await interaction.channel.send(format_post_for_discord(response, "📋 Copy this:"))
+        await send_post(interaction, embed, response)
 
     except Exception as e:
-        await interaction.response.send_message(f"❌ Error: {str(e)}")
+        await respond(interaction, f"❌ Error: {str(e)}")
 
 # -----------------------------------------------------------------------------
 # /fudall - Get all FUD responses
 # -----------------------------------------------------------------------------
 
 @bot.tree.command(name="fudall", description="Get all FUD responses for a type")
-@app_commands.describe(fud_type="Type of FUD")
+@app_commands.describe(
+    fud_type="Type of FUD",
+    embeds="Show each response as an embed"
+)
 @app_commands.choices(
     fud_type=[
         app_commands.Choice(name="Scam accusations", value="scam"),
@@ -305,18 +769,18 @@ async def fud_command(interaction: discord.Interaction, fud_type: str = "univers
         app_commands.Choice(name="Nuclear response", value="nuclear"),
     ]
 )
-async def fudall_command(interaction: discord.Interaction, fud_type: str = "universal"):
+async def fudall_command(interaction: discord.Interaction, fud_type: str = "universal", embeds: bool = False):
     """Get all FUD responses for a specific type."""
     await interaction.response.defer()
 
     try:
-        responses = FUD_RESPONSES.get(fud_type, FUD_RESPONSES["universal"])
+        fud_responses = generator_for(interaction).families.fud_responses
+        responses = fud_responses.get(fud_type, fud_responses["universal"])
 
         await interaction.followup.send(f"**🛡️ ALL FUD RESPONSES - {fud_type.upper().replace('_', ' ')}**\n\n*{len(responses)} response(s)*")
 
-        for i, response in enumerate(responses, 1):
-            await interaction.channel.send(f"**Response {i}:**\n```\n{response}\n```")
-            await asyncio.sleep(0.3)
+        blocks = [(f"Response {i}:", response) for i, response in enumerate(responses, 1)]
+        await send_packed(interaction.channel, blocks, use_embeds=embeds, color=0xe74c3c)
 
     except Exception as e:
         await interaction.followup.send(f"❌ Error: {str(e)}")
@@ -343,7 +807,7 @@ async def fudall_command(interaction: discord.Interaction, fud_type: str = "univ
 async def reply_command(interaction: discord.Interaction, reply_type: str = "ecosystem"):
     """Generate an engagement reply."""
     try:
-        reply = generator.generate_reply(reply_type)
+        reply = generator_for(interaction).generate_reply(reply_type)
 
         embed = create_embed(
             f"💬 REPLY TEMPLATE - {reply_type.upper().replace('_', ' ')}",
@@ -351,11 +815,10 @@ async def reply_command(interaction: discord.Interaction, reply_type: str = "eco
             color=0x3498db
         )
 
-        await interaction.response.send_message(embed=embed)
-        await interaction.channel.send(format_post_for_discord(reply, "📋 Copy this:"))
+        await send_post(interaction, embed, reply)
 
     except Exception as e:
-        await interaction.response.send_message(f"❌ Error: {str(e)}")
+        await respond(interaction, f"❌ Error: {str(e)}")
 
 # -----------------------------------------------------------------------------
 # /milestone - Generate milestone post
@@ -366,7 +829,7 @@ async def reply_command(interaction: discord.Interaction, reply_type: str = "eco
 async def milestone_command(interaction: discord.Interaction, week_number: int = 1):
     """Generate a milestone post."""
     try:
-        post = generator.generate_milestone(week_number)
+        post = generator_for(interaction).generate_milestone(week_number)
 
         embed = create_embed(
             f"📊 MILESTONE POST - WEEK {week_number}",
@@ -374,11 +837,10 @@ async def milestone_command(interaction: discord.Interaction, week_number: int =
             color=0x2ecc71
         )
 
-        await interaction.response.send_message(embed=embed)
-        await interaction.channel.send(format_post_for_discord(post, "📋 Copy this:"))
+        await send_post(interaction, embed, post)
 
     except Exception as e:
-        await interaction.response.send_message(f"❌ Error: {str(e)}")
+        await respond(interaction, f"❌ Error: {str(e)}")
 
 # -----------------------------------------------------------------------------
 # /templates - Show available templates
@@ -387,6 +849,7 @@ async def milestone_command(interaction: discord.Interaction, week_number: int =
 @bot.tree.command(name="templates", description="Show all available templates")
 async def templates_command(interaction: discord.Interaction):
     """Show all available templates."""
+    guild_generator = generator_for(interaction)
     embed = discord.Embed(
         title="📚 AVAILABLE TEMPLATES",
         color=0xf39c12,
@@ -394,7 +857,7 @@ async def templates_command(interaction: discord.Interaction):
     )
 
     # Raid styles
-    raid_styles = list(RAID_TEMPLATES.keys())
+    raid_styles = list(guild_generator.families.raid_templates)
     embed.add_field(
         name="🔥 Raid Styles",
         value="\n".join([f"• `{s}`" for s in raid_styles]),
@@ -402,7 +865,7 @@ async def templates_command(interaction: discord.Interaction):
     )
 
     # Thread types
-    thread_types = list(THREAD_TEMPLATES.keys())
+    thread_types = list(guild_generator.families.thread_templates)
     embed.add_field(
         name="🧵 Thread Types",
         value="\n".join([f"• `{t}`" for t in thread_types]),
@@ -410,7 +873,7 @@ async def templates_command(interaction: discord.Interaction):
     )
 
     # FUD types
-    fud_types = list(FUD_RESPONSES.keys())
+    fud_types = list(guild_generator.families.fud_responses)
     embed.add_field(
         name="🛡️ FUD Types",
         value="\n".join([f"• `{f}`" for f in fud_types]),
@@ -418,7 +881,7 @@ async def templates_command(interaction: discord.Interaction):
     )
 
     # Products
-    products = list(PRODUCTS.keys())
+    products = list(guild_generator.products)
     embed.add_field(
         name="📦 Products",
         value="\n".join([f"• `{p}`" for p in products]),
@@ -426,7 +889,7 @@ async def templates_command(interaction: discord.Interaction):
     )
 
     # Reply types
-    reply_types = list(REPLY_TEMPLATES.keys())
+    reply_types = list(guild_generator.families.reply_templates)
     embed.add_field(
         name="💬 Reply Types",
         value="\n".join([f"• `{r}`" for r in reply_types[:5]]) + f"\n• *+{len(reply_types)-5} more*",
@@ -458,14 +921,14 @@ async def help_command(interaction: discord.Interaction):
 `/raid [product] [style]` - Generate a raid post
 
 **🧵 Threads**
-`/thread [type]` - Generate a thread
+`/thread [type] [embeds]` - Generate a thread
 
 **💊 Cult**
 `/cult` - Generate a cult/philosophy post
 
 **🛡️ FUD Responses**
 `/fud [type]` - Generate a single FUD response
-`/fudall [type]` - Get all responses for a FUD type
+`/fudall [type] [embeds]` - Get all responses for a FUD type
 
 **💬 Replies**
 `/reply [type]` - Generate an engagement reply
@@ -476,13 +939,19 @@ async def help_command(interaction: discord.Interaction):
 **📚 Info**
 `/templates` - Show all available templates
 `/help_posts` - Show this help message
+`/export [type] [week] [end_week]` - Export posts to a file (zip for a week range)
+`/botstats` - Show outbound queue and rate-limit stats
+`/shards` - Show gateway latency and health per shard
+`/reload` - Reload templates, products and stats (admin)
+`/guildconfig` - Per-server stats, products, schedule and channel (admin)
+`/profile` - Profile a sample of commands and show the top functions (admin)
 """
 
     embed.add_field(name="Commands", value=commands_info, inline=False)
 
     tips = """
 • Posts are formatted for easy copy-paste
-• Threads are split into individual tweets
+• Threads and FUD lists are packed into as few messages as possible
 • Use `/templates` to see all options
 • Hashtags are automatically added
 """
@@ -504,7 +973,7 @@ async def schedule_command(interaction: discord.Interaction):
         timestamp=datetime.utcnow()
     )
 
-    for day, schedule in WEEKLY_SCHEDULE.items():
+    for day, schedule in generator_for(interaction).weekly_schedule.items():
         day_name = day.name.capitalize()
         theme = schedule["theme"]
         posts_info = []
@@ -531,7 +1000,8 @@ async def schedule_command(interaction: discord.Interaction):
 @bot.tree.command(name="export", description="Export posts to a text file")
 @app_commands.describe(
     export_type="What to export",
-    week_number="Week number (for weekly export)"
+    week_number="Week number (for weekly export)",
+    end_week="Last week to export; exports a zip of week_number..end_week"
 )
 @app_commands.choices(
     export_type=[
@@ -543,30 +1013,46 @@ async def schedule_command(interaction: discord.Interaction):
 async def export_command(
     interaction: discord.Interaction,
     export_type: str = "weekly",
-    week_number: int = 1
+    week_number: int = 1,
+    end_week: Optional[int] = None
 ):
     """Export posts to a text file."""
     await interaction.response.defer()
+    guild_generator = generator_for(interaction)
 
     try:
+        if export_type == "weekly" and end_week is not None and end_week != week_number:
+            if end_week < week_number or end_week - week_number >= MAX_EXPORT_WEEKS:
+                await interaction.followup.send(
+                    f"❌ end_week must be between {week_number} and {week_number + MAX_EXPORT_WEEKS - 1}"
+                )
+                return
+
+            # Rendered in worker processes and zipped, both off the event loop
+            exports = await offloader.run(guild_generator.export_range, week_number, end_week)
+            filename = f"weeks{week_number}-{end_week}_posts.zip"
+            file = discord.File(fp=await offloader.run(archive_weeks, exports), filename=filename)
+            await interaction.followup.send(
+                f"📦 **Export complete!** {len(exports)} weeks in `{filename}`:",
+                file=file
+            )
+            return
+
         if export_type == "weekly":
-            content = generator.export_weekly_posts(week_number)
+            sections = guild_generator.iter_weekly_export(week_number)
             filename = f"week{week_number}_posts.txt"
         elif export_type == "fud":
-            content = generator.export_fud_responses()
+            sections = guild_generator.iter_fud_export()
             filename = "fud_responses.txt"
         elif export_type == "replies":
-            content = generator.export_reply_templates()
+            sections = guild_generator.iter_reply_export()
             filename = "reply_templates.txt"
         else:
-            content = generator.export_weekly_posts(1)
+            sections = guild_generator.iter_weekly_export(1)
             filename = "posts.txt"
 
-        # Create file and send
-        file = discord.File(
-            fp=__import__('io').StringIO(content),
-            filename=filename
-        )
+        # Generate into a temp file on a worker thread and send
+        file = discord.File(fp=await offloader.run(spool_sections, sections), filename=filename)
 
         await interaction.followup.send(
             f"📄 **Export complete!** Here's your `{filename}`:",
@@ -576,23 +1062,286 @@ async def export_command(
     except Exception as e:
         await interaction.followup.send(f"❌ Error exporting: {str(e)}")
 
+# -----------------------------------------------------------------------------
+# /shards - Show per-shard latency and health
+# -----------------------------------------------------------------------------
+
+def format_latency(latency: Optional[float]) -> str:
+    """Format a latency in ms, or a dash before the first heartbeat."""
+    return f"{latency * 1000:.0f}ms" if latency is not None else "—"
+
+@bot.tree.command(name="shards", description="Show gateway latency and health per shard")
+async def shards_command(interaction: discord.Interaction):
+    """Show gateway latency and health per shard."""
+    shards = shard_stats(bot)
+    summary = summarize_shards(shards)
+    current = interaction.guild.shard_id if interaction.guild else None
+
+    lines = []
+    for shard in shards[:25]:
+        status = "🔴" if shard["closed"] else "🟠" if shard["ratelimited"] else "🟢"
+        here = " ← this server" if shard["id"] == current else ""
+        lines.append(
+            f"{status} `#{shard['id']}` {format_latency(shard['latency'])} · {shard['guilds']} guild(s){here}"
+        )
+    if len(shards) > 25:
+        lines.append(f"*+{len(shards) - 25} more*")
+
+    embed = discord.Embed(
+        title="🛰️ SHARDS",
+        description="\n".join(lines),
+        color=0x95a5a6,
+        timestamp=datetime.utcnow()
+    )
+    footer = (
+        f"{summary['connected']}/{summary['shards']} connected · "
+        f"avg {format_latency(summary['avg_latency'])} · max {format_latency(summary['max_latency'])}"
+    )
+    if cluster:
+        footer += f" · cluster worker {CLUSTER_ID}"
+    embed.set_footer(text=footer)
+
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+# -----------------------------------------------------------------------------
+# /reload - Reload config without restarting
+# -----------------------------------------------------------------------------
+
+@bot.tree.command(name="reload", description="Reload templates, products and stats without restarting")
+@app_commands.default_permissions(administrator=True)
+async def reload_command(interaction: discord.Interaction):
+    """Reload templates, products and stats without restarting."""
+    await interaction.response.defer(ephemeral=True)
+
+    snapshot = await reload_config()
+    if snapshot is None:
+        await interaction.followup.send(f"❌ Reload failed: {reloader.last_error}", ephemeral=True)
+        return
+
+    await interaction.followup.send(
+        f"🔄 Config reloaded (v{snapshot.version}) in {reloader.last_duration * 1000:.0f}ms",
+        ephemeral=True
+    )
+
+# -----------------------------------------------------------------------------
+# /guildconfig - Per-server config overrides
+# -----------------------------------------------------------------------------
+
+@bot.tree.command(name="guildconfig", description="Show or change this server's config overrides")
+@app_commands.describe(
+    action="Show, set or reset overrides",
+    setting="Setting to change",
+    value="JSON value (a channel id or mention for output_channel_id)"
+)
+@app_commands.choices(
+    action=[app_commands.Choice(name=a, value=a) for a in ("show", "set", "reset")],
+    setting=[app_commands.Choice(name=s, value=s) for s in SETTINGS]
+)
+@app_commands.default_permissions(administrator=True)
+@app_commands.guild_only()
+async def guildconfig_command(
+    interaction: discord.Interaction,
+    action: str = "show",
+    setting: Optional[str] = None,
+    value: Optional[str] = None
+):
+    """Show, set or reset this server's config overrides."""
+    if not guild_configs:
+        await interaction.response.send_message("❌ Per-server config is disabled (set GUILD_DB).", ephemeral=True)
+        return
+
+    guild_id = interaction.guild_id
+    if action == "set":
+        if not setting or value is None:
+            await interaction.response.send_message("❌ `set` needs a setting and a value.", ephemeral=True)
+            return
+        try:
+            parsed = value if setting == "output_channel_id" else json.loads(value)
+            guild_configs.set(guild_id, setting, parsed)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ Invalid {setting}: {e}", ephemeral=True)
+            return
+        await interaction.response.send_message(f"✅ Set **{setting}** for this server.", ephemeral=True)
+        return
+
+    if action == "reset":
+        guild_configs.reset(guild_id, setting)
+        await interaction.response.send_message(
+            f"♻️ Reset **{setting or 'all settings'}** to the global config.", ephemeral=True
+        )
+        return
+
+    overrides = guild_configs.overrides(guild_id)
+    if not overrides:
+        await interaction.response.send_message("ℹ️ This server uses the global config.", ephemeral=True)
+        return
+
+    content = f"⚙️ **Server overrides:**\n```json\n{json.dumps(overrides, indent=2, ensure_ascii=False)}\n```"
+    chunks = split_message(content)
+    await interaction.response.send_message(chunks[0], ephemeral=True)
+    for chunk in chunks[1:]:
+        await interaction.followup.send(chunk, ephemeral=True)
+
+# -----------------------------------------------------------------------------
+# /profile - Sample commands under cProfile
+# -----------------------------------------------------------------------------
+
+@bot.tree.command(name="profile", description="Profile a sample of commands and generator calls")
+@app_commands.describe(
+    action="Turn sampling on or off, show status, or show the slowest functions",
+    rate="Fraction of calls to profile when turning on (default 0.1)",
+    name="Only include profiles whose name contains this, e.g. cmd.week",
+    limit="Functions to show for top"
+)
+@app_commands.choices(
+    action=[app_commands.Choice(name=a, value=a) for a in ("status", "on", "off", "top")]
+)
+@app_commands.default_permissions(administrator=True)
+async def profile_command(
+    interaction: discord.Interaction,
+    action: str = "status",
+    rate: float = 0.1,
+    name: Optional[str] = None,
+    limit: app_commands.Range[int, 1, 40] = 15
+):
+    """Control sampled profiling and summarize the captured profiles."""
+    if action in ("on", "off"):
+        try:
+            profiler.set_rate(rate if action == "on" else 0.0)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+
+    if action == "top":
+        await interaction.response.defer(ephemeral=True)
+        lines = await asyncio.get_running_loop().run_in_executor(None, profiler.top, limit, name)
+        if not lines:
+            await interaction.followup.send("ℹ️ No profiles captured yet.", ephemeral=True)
+            return
+        header = f"{'cumtime':>9} {'tottime':>9} {'calls':>7} function"
+        content = f"🔬 **Top {len(lines)} by cumulative time**\n```\n{header}\n" + "\n".join(lines) + "\n```"
+        for chunk in split_message(content):
+            await interaction.followup.send(chunk, ephemeral=True)
+        return
+
+    state = f"on, sampling {profiler.rate:.0%} of calls" if profiler.enabled else "off"
+    await interaction.response.send_message(
+        f"🔬 Profiling is **{state}**. {len(profiler.captures)} profile(s) in `{profiler.directory}`.",
+        ephemeral=True
+    )
+
+# -----------------------------------------------------------------------------
+# /botstats - Show bot performance stats
+# -----------------------------------------------------------------------------
+
+@bot.tree.command(name="botstats", description="Show outbound queue and rate-limit stats")
+async def botstats_command(interaction: discord.Interaction):
+    """Show outbound queue and rate-limit stats."""
+    stats = outbound.stats()
+
+    embed = discord.Embed(
+        title="📈 BOT STATS",
+        color=0x95a5a6,
+        timestamp=datetime.utcnow()
+    )
+
+    embed.add_field(
+        name="📤 Outbound Queue",
+        value=(
+            f"Depth: **{stats['depth']}**\n"
+            f"Messages sent: **{stats['sent']}**\n"
+            f"429s: **{stats['rate_limited']}**\n"
+            f"Avg queue wait: **{stats['avg_queue_wait']:.2f}s** (max {stats['max_queue_wait']:.2f}s)\n"
+            f"Avg pacing wait: **{stats['avg_pacing_wait']:.2f}s**"
+        ),
+        inline=False
+    )
+
+    jobs = offloader.stats()
+    embed.add_field(
+        name="🧮 Offloaded Work",
+        value=(
+            f"Running: **{jobs['running']}/{jobs['workers']}**, queued: **{jobs['depth']}**\n"
+            f"Jobs: **{jobs['jobs']}**\n"
+            f"Avg wait: **{jobs['avg_wait'] * 1000:.0f}ms** (max {jobs['max_wait'] * 1000:.0f}ms)"
+        ),
+        inline=False
+    )
+
+    shards = summarize_shards(shard_stats(bot))
+    embed.add_field(
+        name="🛰️ Gateway",
+        value=(
+            f"Shards: **{shards['connected']}/{shards['shards']}** connected\n"
+            f"Avg latency: **{format_latency(shards['avg_latency'])}** "
+            f"(max {format_latency(shards['max_latency'])})"
+        ),
+        inline=False
+    )
+
+    embed.add_field(
+        name="⚙️ Config",
+        value=(
+            f"Version: **{generator.snapshot.version}**\n"
+            f"Reloads: **{reloader.reloads}** ({reloader.failures} failed)\n"
+            f"Last reload: **{reloader.last_duration * 1000:.0f}ms**"
+            + (f"\nLast error: `{reloader.last_error}`" if reloader.last_error else "")
+        ),
+        inline=False
+    )
+
+    busiest = sorted(stats["channels"].items(), key=lambda item: item[1]["sent"], reverse=True)[:5]
+    if busiest:
+        embed.add_field(
+            name="📺 Busiest Channels",
+            value="\n".join(
+                f"<#{channel_id}> - {c['sent']} sent, depth {c['depth']}, {c['rate']:.2f} msg/s"
+                for channel_id, c in busiest
+            ),
+            inline=False
+        )
+
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
 # =============================================================================
 # SCHEDULED TASKS
 # =============================================================================
 
 @tasks.loop(time=time(hour=8, minute=0))  # 8 AM daily
 async def daily_post_reminder():
-    """Send daily posting reminder."""
-    if not OUTPUT_CHANNEL_ID:
-        return
-
-    channel = bot.get_channel(int(OUTPUT_CHANNEL_ID))
+    """Send the daily posting reminder to every configured channel."""
+    channel_ids = [int(OUTPUT_CHANNEL_ID)] if OUTPUT_CHANNEL_ID else []
+    if guild_configs:
+        overrides = await asyncio.get_running_loop().run_in_executor(
+            None, guild_configs.guilds_with, "output_channel_id"
+        )
+        channel_ids.extend(channel_id for _, channel_id in overrides)
+
+    for channel_id in dict.fromkeys(channel_ids):
+        try:
+            await send_daily_reminder(channel_id)
+        except discord.HTTPException as e:
+            print(f"❌ Daily reminder: can't send to channel {channel_id}: {e}")
+
+async def send_daily_reminder(channel_id: int):
+    """Send today's schedule to one channel, using its guild's config."""
+    # Fall back to the API if the channel's shard hasn't filled the cache yet
+    channel = bot.get_channel(channel_id)
     if not channel:
+        try:
+            channel = await bot.fetch_channel(channel_id)
+        except discord.HTTPException as e:
+            print(f"❌ Daily reminder: can't fetch channel {channel_id}: {e}")
+            return
+
+    # Outside a cluster, only the process running the channel's guild shard sends
+    guild = getattr(channel, "guild", None)
+    if not cluster and guild and not owns_guild(bot, guild.id):
         return
 
     # Get today's schedule
     today = DayOfWeek(datetime.now().weekday())
-    schedule = WEEKLY_SCHEDULE.get(today)
+    schedule = generator_for_guild(guild.id if guild else None).weekly_schedule.get(today)
 
     if not schedule:
         return
@@ -624,8 +1373,45 @@ async def daily_post_reminder():
         inline=False
     )
 
+    # In a cluster every process runs this task; the first to claim today's
+    # slot for the channel sends
+    if cluster:
+        slot = f"{datetime.now().date().isoformat()}:{channel_id}"
+        claimed = await asyncio.get_running_loop().run_in_executor(
+            None, cluster.claim, "daily_post_reminder", slot
+        )
+        if not claimed:
+            return
+
     await channel.send(embed=embed)
 
+async def reload_config() -> Optional[ConfigSnapshot]:
+    """Rebuild the config snapshot off the event loop and swap it in.
+
+    Returns None if the new config failed to load; the old one stays live.
+    """
+    try:
+        snapshot = await reloader.reload()
+    except Exception as e:
+        print(f"❌ Config reload failed: {e}")
+        return None
+
+    generator.apply_snapshot(snapshot)
+    print(f"🔄 Config reloaded (v{snapshot.version}) in {reloader.last_duration * 1000:.0f}ms")
+    return snapshot
+
+@tasks.loop(seconds=2)  # Interval set from RELOAD_INTERVAL on start
+async def watch_config():
+    """Reload the config when its source files change."""
+    if reloader.changed():
+        await reload_config()
+
+@tasks.loop(seconds=30)
+async def flush_history():
+    """Write buffered post history so a crash loses at most 30s of it."""
+    if history.pending:
+        await asyncio.get_running_loop().run_in_executor(None, history.flush)
+
 # =============================================================================
 # ERROR HANDLING
 # =============================================================================
@@ -633,13 +1419,26 @@ async def daily_post_reminder():
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
     """Handle slash command errors."""
-    if isinstance(error, app_commands.MissingPermissions):
-        await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
-    elif isinstance(error, app_commands.CommandOnCooldown):
-        await interaction.response.send_message(f"⏳ Command on cooldown. Try again in {error.retry_after:.2f}s", ephemeral=True)
-    else:
-        await interaction.response.send_message(f"❌ An error occurred: {str(error)}", ephemeral=True)
-        print(f"Command error: {error}")
+    try:
+        if isinstance(error, app_commands.MissingPermissions):
+            await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        elif isinstance(error, app_commands.CommandOnCooldown):
+            await interaction.response.send_message(f"⏳ Command on cooldown. Try again in {error.retry_after:.2f}s", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"❌ An error occurred: {str(error)}", ephemeral=True)
+            print(f"Command error: {error}")
+    finally:
+        finish_command(interaction, "error")
+
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+# Wrapped once, after every command is defined; sampling is off until
+# PROFILE_SAMPLE_RATE or /profile turns it on
+profiler = Profiler()
+profiler.instrument_tree(bot.tree)
+profiler.instrument_class(PostGenerator)
 
 # =============================================================================
 # MAIN
@@ -654,7 +1453,14 @@ def main():
         return
 
     print("🚀 Starting ASDF X Post Generator Bot...")
-    bot.run(TOKEN)
+    try:
+        bot.run(TOKEN)
+    finally:
+        if history:
+            history.close()
+        if recorder:
+            recorder.close()
+        offloader.shutdown()
 
 if __name__ == "__main__":
     main()
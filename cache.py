@@ -0,0 +1,120 @@
+"""
+ASDF X Post Generator - Caching
+===============================
+Small in-process caches used to avoid regenerating identical output.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+def fingerprint(*parts: Any) -> str:
+    """Content hash of the given config objects.
+
+    Uses ``repr``, which is stable for the dicts, lists, enums and
+    dataclasses that make up config.py.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with a fixed entry limit."""
+
+    def __init__(self, maxsize: int = 32):
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return a cached value and mark it as recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for key, building it with factory on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._data.clear()
+
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries also expire a fixed time after being stored."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self._expires: Dict[Hashable, float] = {}
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return a cached value unless it has expired."""
+        expires = self._expires.get(key)
+        if expires is not None and time.monotonic() >= expires:
+            self.invalidate(key)
+        return super().get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value for ttl seconds."""
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._expires[key] = time.monotonic() + self.ttl
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                self._expires.pop(evicted, None)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop one entry."""
+        with self._lock:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
@@ -0,0 +1,156 @@
+"""
+ASDF X Post Generator - Cluster Launcher
+========================================
+Runs several bot processes, each owning a contiguous range of shards, so
+the bot can use more than one CPU core.
+
+Workers share a SQLite database (see cluster_store.py) so scheduled jobs
+like the daily reminder run once across the cluster. A worker that
+crashes is restarted after a short delay.
+
+Usage:
+    python cluster.py [--processes 4] [--shards 8] [--db cluster.db]
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Worker processes (0 = one per CPU)
+CLUSTER_PROCESSES = int(os.getenv('CLUSTER_PROCESSES', '0'))
+
+# Default shared database for the cluster
+DEFAULT_CLUSTER_DB = os.getenv('CLUSTER_DB', '') or 'cluster.db'
+
+BOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+
+# Discord allows one IDENTIFY per 5 seconds; stagger workers by their shard count
+IDENTIFY_DELAY = 5.0
+RESTART_DELAY = 5.0
+
+
+def shard_ranges(shard_count: int, processes: int) -> List[List[int]]:
+    """Split shard ids 0..shard_count-1 into contiguous, near-equal ranges."""
+    if shard_count < 1 or processes < 1:
+        raise ValueError("shard_count and processes must be >= 1")
+    processes = min(processes, shard_count)
+    base, extra = divmod(shard_count, processes)
+
+    ranges = []
+    start = 0
+    for i in range(processes):
+        size = base + (1 if i < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def worker_env(cluster_id: int, shard_ids: List[int], shard_count: int, db_path: str) -> Dict[str, str]:
+    """Environment for one worker process."""
+    env = dict(os.environ)
+    env.update(
+        SHARDING="1",
+        SHARD_COUNT=str(shard_count),
+        SHARD_IDS=",".join(str(shard_id) for shard_id in shard_ids),
+        CLUSTER_ID=str(cluster_id),
+        CLUSTER_DB=db_path,
+    )
+    return env
+
+
+class Worker:
+    """One bot process and the shards it owns."""
+
+    def __init__(self, cluster_id: int, shard_ids: List[int], env: Dict[str, str]):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.env = env
+        self.process: Optional[subprocess.Popen] = None
+        self.restart_at: Optional[float] = None
+        self.restarts = 0
+
+    def start(self) -> None:
+        """Spawn the bot process."""
+        self.process = subprocess.Popen([sys.executable, BOT_PATH], env=self.env)
+        self.restart_at = None
+        print(f"🚀 Worker {self.cluster_id} (pid {self.process.pid}) shards {self.shard_ids[0]}-{self.shard_ids[-1]}")
+
+
+def run_cluster(processes: int, shard_count: int, db_path: str) -> None:
+    """Start the workers and keep them running until SIGINT/SIGTERM."""
+    ranges = shard_ranges(shard_count, processes)
+    workers = [
+        Worker(i, shard_ids, worker_env(i, shard_ids, shard_count, db_path))
+        for i, shard_ids in enumerate(ranges)
+    ]
+    print(f"🛰️ Starting {len(workers)} worker(s) for {shard_count} shard(s), store {db_path}")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for i, worker in enumerate(workers):
+        if i:
+            time.sleep(IDENTIFY_DELAY * len(workers[i - 1].shard_ids))
+        if stopping:
+            break
+        worker.start()
+
+    while not stopping:
+        time.sleep(1)
+        now = time.monotonic()
+        for worker in workers:
+            if worker.process is None:
+                continue
+            if worker.restart_at is not None:
+                if now >= worker.restart_at:
+                    worker.restarts += 1
+                    worker.start()
+                continue
+            code = worker.process.poll()
+            if code == 0:
+                # A clean exit (e.g. missing token) would just repeat
+                print(f"⏹️ Worker {worker.cluster_id} exited cleanly, not restarting")
+                worker.process = None
+            elif code is not None:
+                print(f"⚠️ Worker {worker.cluster_id} exited with code {code}, restarting in {RESTART_DELAY:g}s")
+                worker.restart_at = now + RESTART_DELAY
+
+        if all(worker.process is None for worker in workers):
+            break
+
+    print("🛑 Stopping workers...")
+    for worker in workers:
+        if worker.process and worker.process.poll() is None:
+            worker.process.terminate()
+    for worker in workers:
+        if worker.process:
+            try:
+                worker.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                worker.process.kill()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the bot as a multi-process shard cluster")
+    parser.add_argument("--processes", type=int, default=CLUSTER_PROCESSES or os.cpu_count() or 1,
+                        help="Worker processes (default: CLUSTER_PROCESSES or one per CPU)")
+    parser.add_argument("--shards", type=int, default=int(os.getenv('SHARD_COUNT') or 0),
+                        help="Total shards (default: SHARD_COUNT or one per process)")
+    parser.add_argument("--db", default=DEFAULT_CLUSTER_DB, help="Shared SQLite database")
+    args = parser.parse_args()
+
+    run_cluster(args.processes, args.shards or args.processes, os.path.abspath(args.db))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+ASDF X Post Generator - Cluster Store
+=====================================
+SQLite store shared by the bot processes of one cluster.
+
+The database runs in WAL mode so every process can read while another
+writes. Scheduled jobs claim a (job, slot) row before running - the slot
+is e.g. today's date - and only the process whose insert succeeds runs
+the job, so it happens exactly once across the cluster.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# Shared database path (set by cluster.py; unset = not clustered)
+CLUSTER_DB = os.getenv('CLUSTER_DB', '')
+
+# This process's id within the cluster
+CLUSTER_ID = os.getenv('CLUSTER_ID', '0')
+
+# How long claimed job slots are kept before pruning (seconds)
+CLAIM_RETENTION = 30 * 24 * 3600
+
+
+def connect_wal(path: str, timeout: float = 10.0) -> sqlite3.Connection:
+    """Open a SQLite connection in WAL mode, usable from any thread."""
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ClusterStore:
+    """Job claims shared by every process in the cluster."""
+
+    def __init__(self, path: str, owner: str = CLUSTER_ID):
+        self.path = path
+        self.owner = owner
+        self._conn = connect_wal(path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_claims (
+                job TEXT NOT NULL,
+                slot TEXT NOT NULL,
+                owner TEXT NOT NULL,
+                claimed_at REAL NOT NULL,
+                PRIMARY KEY (job, slot)
+            )
+            """
+        )
+
+    def claim(self, job: str, slot: str) -> bool:
+        """Claim one run of a job. True for exactly one caller per (job, slot)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO job_claims (job, slot, owner, claimed_at) VALUES (?, ?, ?, ?)",
+                (job, slot, self.owner, time.time())
+            )
+            claimed = cursor.rowcount == 1
+            if claimed:
+                self._conn.execute(
+                    "DELETE FROM job_claims WHERE claimed_at < ?",
+                    (time.time() - CLAIM_RETENTION,)
+                )
+        return claimed
+
+    def claimed_by(self, job: str, slot: str) -> Optional[str]:
+        """Which process claimed a job slot, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT owner FROM job_claims WHERE job = ? AND slot = ?", (job, slot)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def open_cluster_store(path: str = CLUSTER_DB) -> Optional[ClusterStore]:
+    """The cluster store for this process, or None when not clustered."""
+    return ClusterStore(path) if path else None
@@ -0,0 +1,78 @@
+"""
+ASDF X Post Generator - Command Sync
+====================================
+Syncs the slash command tree with Discord only when it has changed.
+
+The serialized tree is hashed and the hash is stored per application and
+scope (global or one guild) in a small JSON file. A restart with the same
+commands skips the sync call, which is rate limited by Discord.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+import discord
+from discord import app_commands
+
+# Where the last synced schema hashes are kept
+SYNC_STATE_FILE = os.getenv('SYNC_STATE_FILE', '.command_sync.json')
+
+# Set to 1 to sync on startup even if the schema hash matches
+FORCE_COMMAND_SYNC = os.getenv('FORCE_COMMAND_SYNC', '') == '1'
+
+
+def tree_schema_hash(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """Hash the command payload tree.sync would send for this scope."""
+    payload = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def sync_scope(application_id: Optional[int], guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """Key for one application's global or guild command set."""
+    scope = f"guild:{guild.id}" if guild else "global"
+    return f"{application_id}:{scope}"
+
+
+def load_sync_state(path: str = SYNC_STATE_FILE) -> Dict[str, str]:
+    """Read the stored schema hashes; an unreadable file counts as empty."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_sync_state(state: Dict[str, str], path: str = SYNC_STATE_FILE) -> None:
+    """Write the schema hashes atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+async def sync_if_changed(
+    tree: app_commands.CommandTree,
+    guild: Optional[discord.abc.Snowflake] = None,
+    path: str = SYNC_STATE_FILE,
+    force: bool = FORCE_COMMAND_SYNC
+) -> Optional[List[app_commands.AppCommand]]:
+    """Sync the tree for one scope unless its schema hash is unchanged.
+
+    Returns the synced commands, or None when the sync was skipped.
+    """
+    state = load_sync_state(path)
+    key = sync_scope(tree.client.application_id, guild)
+    schema_hash = tree_schema_hash(tree, guild)
+
+    if not force and state.get(key) == schema_hash:
+        return None
+
+    synced = await tree.sync(guild=guild)
+    state[key] = schema_hash
+    save_sync_state(state, path)
+    return synced
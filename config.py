@@ -6,8 +6,9 @@ Easily modifiable to adapt to changing needs.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
+from itertools import permutations
 import random
 
 # =============================================================================
@@ -114,27 +115,128 @@ HASHTAGS = {
     "cashtags": ["$ASDF", "$ASDFASDFA", "$SOL", "$PUMP"]
 }
 
-def get_hashtags(post_type: PostType, product: str = None, topic: str = None, count: int = 3) -> str:
-    """Generate appropriate hashtags for a post."""
-    tags = []
-
-    # Always include 1-2 core tags
-    tags.extend(random.sample(HASHTAGS["core"][:2], min(2, len(HASHTAGS["core"][:2]))))
-
-    # Add product tag if specified
-    if product and product in PRODUCTS:
-        product_tags = PRODUCTS[product].tags
-        if product_tags:
-            tags.append(random.choice(product_tags))
-
-    # Add topic tag if specified
-    if topic and topic in HASHTAGS["topics"]:
-        tags.append(random.choice(HASHTAGS["topics"][topic]))
+HashtagKey = Tuple[Optional[str], Optional[str], int]
+
+def _hashtag_key(
+    product: Optional[str],
+    topic: Optional[str],
+    count: int,
+    products: Dict[str, Product] = PRODUCTS,
+    hashtags: Dict = HASHTAGS
+) -> HashtagKey:
+    """Normalize arguments so unknown products/topics share the plain pool."""
+    return (
+        product if product in products else None,
+        topic if topic in hashtags["topics"] else None,
+        count,
+    )
 
-    # Limit to count
-    tags = list(dict.fromkeys(tags))[:count]  # Remove duplicates and limit
+def _build_hashtag_pool(
+    product: Optional[str],
+    topic: Optional[str],
+    count: int,
+    products: Dict[str, Product] = PRODUCTS,
+    hashtags: Dict = HASHTAGS
+) -> Tuple[str, ...]:
+    """Every equally likely hashtag line, one entry per (core order, product tag, topic tag).
+
+    Lines can repeat, so a uniform pick from the pool has the same odds as
+    sampling the tags one by one.
+    """
+    core = hashtags["core"][:2]
+    product_tags = products[product].tags if product else []
+    topic_tags = hashtags["topics"][topic] if topic else []
+
+    pool = []
+    for core_tags in permutations(core, min(2, len(core))):
+        for product_tag in product_tags or [None]:
+            for topic_tag in topic_tags or [None]:
+                tags = [*core_tags, product_tag, topic_tag]
+                tags = list(dict.fromkeys(t for t in tags if t))[:count]
+                pool.append(" ".join(tags))
+    return tuple(pool)
+
+def build_hashtag_pools(
+    count: int = 3,
+    products: Dict[str, Product] = PRODUCTS,
+    hashtags: Dict = HASHTAGS
+) -> Dict[HashtagKey, Tuple[str, ...]]:
+    """Precompute the pools for every (product, topic) pair at one count."""
+    return {
+        (product, topic, count): _build_hashtag_pool(product, topic, count, products, hashtags)
+        for product in [None, *products]
+        for topic in [None, *hashtags["topics"]]
+    }
 
-    return " ".join(tags)
+def build_hashtag_options(pools: Dict[HashtagKey, Tuple[str, ...]]) -> Dict[HashtagKey, Tuple[str, ...]]:
+    """The distinct lines of each pool, in pool order."""
+    return {key: tuple(dict.fromkeys(pool)) for key, pool in pools.items()}
+
+# Built at import; other counts are added on first use.
+HASHTAG_POOLS = build_hashtag_pools()
+HASHTAG_OPTIONS = build_hashtag_options(HASHTAG_POOLS)
+
+def hashtag_pool(product: str = None, topic: str = None, count: int = 3) -> Tuple[str, ...]:
+    """Return the precomputed pool for these arguments."""
+    key = _hashtag_key(product, topic, count)
+    pool = HASHTAG_POOLS.get(key)
+    if pool is None:
+        pool = HASHTAG_POOLS[key] = _build_hashtag_pool(*key)
+    return pool
+
+def get_hashtags(
+    post_type: PostType,
+    product: str = None,
+    topic: str = None,
+    count: int = 3,
+    rng: Optional[random.Random] = None
+) -> str:
+    """Generate appropriate hashtags for a post.
+
+    Pass rng to draw from a seeded random.Random instead of the global one.
+    """
+    return (rng or random).choice(hashtag_pool(product, topic, count))
+
+def hashtag_options(product: str = None, topic: str = None, count: int = 3) -> Tuple[str, ...]:
+    """Every distinct hashtag line get_hashtags can return for these arguments."""
+    key = _hashtag_key(product, topic, count)
+    options = HASHTAG_OPTIONS.get(key)
+    if options is None:
+        options = HASHTAG_OPTIONS[key] = tuple(dict.fromkeys(hashtag_pool(*key)))
+    return options
+
+class HashtagPools:
+    """get_hashtags and hashtag_options for another set of products and hashtags, e.g. a guild's."""
+
+    def __init__(self, products: Dict[str, Product], hashtags: Dict):
+        self.products = products
+        self.hashtags = hashtags
+        self.pools = build_hashtag_pools(3, products, hashtags)
+        self.options = build_hashtag_options(self.pools)
+
+    def pool(self, product: str = None, topic: str = None, count: int = 3) -> Tuple[str, ...]:
+        key = _hashtag_key(product, topic, count, self.products, self.hashtags)
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = _build_hashtag_pool(*key, self.products, self.hashtags)
+        return pool
+
+    def get_hashtags(
+        self,
+        post_type: PostType,
+        product: str = None,
+        topic: str = None,
+        count: int = 3,
+        rng: Optional[random.Random] = None
+    ) -> str:
+        return (rng or random).choice(self.pool(product, topic, count))
+
+    def hashtag_options(self, product: str = None, topic: str = None, count: int = 3) -> Tuple[str, ...]:
+        key = _hashtag_key(product, topic, count, self.products, self.hashtags)
+        options = self.options.get(key)
+        if options is None:
+            options = self.options[key] = tuple(dict.fromkeys(self.pool(*key)))
+        return options
 
 # =============================================================================
 # POST TEMPLATES
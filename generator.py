@@ -4,17 +4,71 @@ ASDF X Post Generator - Generation Logic
 Generates posts based on templates and configuration.
 """
 
+import copy
+import os
 import random
-from typing import List, Dict, Optional
-from dataclasses import dataclass
-
-from config import (
-    PRODUCTS, HASHTAGS, PostType, DayOfWeek,
-    RAID_TEMPLATES, THREAD_TEMPLATES, CULT_TEMPLATES,
-    FUD_RESPONSES, REPLY_TEMPLATES, ANNOUNCEMENT_TEMPLATES,
-    VIRAL_TEMPLATES, WEEKLY_SCHEDULE, CURRENT_STATS,
-    get_hashtags, Product
-)
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, replace
+
+from config import PostType, DayOfWeek, Product
+from templates import CompiledTemplates, render
+from template_store import TemplateFamilies
+from live_config import ConfigSnapshot, builtin_snapshot
+from cache import LRUCache, fingerprint
+from near_duplicates import MinHashIndex
+from metrics import timed
+
+# Max number of rendered weeks kept per generator (0 disables caching)
+WEEKLY_CACHE_SIZE = int(os.getenv('WEEKLY_CACHE_SIZE', '32'))
+
+# Max number of memoized variants kept per generator
+VARIANT_CACHE_SIZE = int(os.getenv('VARIANT_CACHE_SIZE', '1024'))
+
+# A seed (int/str), a random.Random, or None for the global random module
+RandomSource = Union[None, int, str, random.Random]
+
+VARIANT_KINDS = ("raid", "thread", "cult", "fud", "milestone")
+
+# Candidates tried before a near-duplicate post is returned anyway
+NEAR_DUP_ATTEMPTS = 8
+
+# Template ids recently used in a channel, mapped to an increasing use number
+# (post_history.RecentWindow, or any dict)
+RecentTemplates = Mapping[str, int]
+
+
+def resolve_rng(rng: RandomSource) -> random.Random:
+    """Turn a seed or Random into something with choice/sample.
+
+    None keeps the old behaviour of drawing from the global random module.
+    Pass a seed or your own Random to get reproducible output and to avoid
+    sharing RNG state between threads.
+    """
+    if rng is None or rng is random:
+        return random
+    if isinstance(rng, random.Random):
+        return rng
+    return random.Random(rng)
+
+
+def choose_fresh(
+    rng: random.Random,
+    options: Sequence[Any],
+    family: str,
+    avoid: Optional[RecentTemplates] = None
+) -> Tuple[str, Any]:
+    """Pick an option and its template id ("family:index"), avoiding repeats.
+
+    The first draw matches rng.choice(options), so output only changes when
+    it hits a template in avoid. Then a fresh one is drawn instead, or the
+    least recently used one when every option is recent.
+    """
+    index = rng.choice(range(len(options)))
+    if avoid and f"{family}:{index}" in avoid:
+        ids = [f"{family}:{i}" for i in range(len(options))]
+        fresh = [i for i, template_id in enumerate(ids) if template_id not in avoid]
+        index = rng.choice(fresh) if fresh else min(range(len(ids)), key=lambda i: avoid[ids[i]])
+    return f"{family}:{index}", options[index]
 
 @dataclass
 class GeneratedPost:
@@ -28,191 +82,303 @@ class GeneratedPost:
     is_thread: bool = False
     thread_tweets: Optional[List[str]] = None
 
+@dataclass(frozen=True)
+class TrackedPost:
+    """A generated post plus the id of the template it came from."""
+    content: str
+    template_id: str
+
+@dataclass(frozen=True)
+class PostVariant:
+    """A generated post plus the id that regenerates it exactly."""
+    content: Union[str, List[str]]
+    variant_id: str
+
 class PostGenerator:
     """Generates X posts based on templates and configuration."""
 
-    def __init__(self):
-        self.products = PRODUCTS
-        self.hashtags = HASHTAGS
-        self.current_stats = CURRENT_STATS
+    def __init__(
+        self,
+        cache_size: int = WEEKLY_CACHE_SIZE,
+        variant_cache_size: int = VARIANT_CACHE_SIZE,
+        families: Optional[TemplateFamilies] = None,
+        snapshot: Optional[ConfigSnapshot] = None
+    ):
+        self.snapshot = snapshot or builtin_snapshot(families)
+        self.weekly_cache = LRUCache(cache_size)
+        self.variant_cache = LRUCache(variant_cache_size)
+
+    # =========================================================================
+    # CONFIG SNAPSHOT
+    # =========================================================================
+    # Config is read through self.snapshot so a reload swaps it in one
+    # assignment, between calls.
+
+    def with_snapshot(self, snapshot: ConfigSnapshot) -> "PostGenerator":
+        """A view of this generator over another snapshot, e.g. a guild's.
+
+        The view shares the caches; their keys include the config
+        fingerprint, so guilds with different config never share entries.
+        """
+        if snapshot is self.snapshot:
+            return self
+        view = copy.copy(self)
+        view.snapshot = snapshot
+        return view
+
+    def apply_snapshot(self, snapshot: ConfigSnapshot) -> None:
+        """Swap in a reloaded config and drop output built from the old one."""
+        self.snapshot = snapshot
+        self.weekly_cache.clear()
+        self.variant_cache.clear()
+
+    @property
+    def products(self) -> Dict[str, Product]:
+        return self.snapshot.products
+
+    @property
+    def hashtags(self) -> Dict:
+        return self.snapshot.hashtags
+
+    @property
+    def current_stats(self) -> Dict[str, str]:
+        return self.snapshot.current_stats
+
+    @current_stats.setter
+    def current_stats(self, stats: Dict[str, str]) -> None:
+        self.snapshot = replace(self.snapshot, current_stats=stats)
+
+    @property
+    def weekly_schedule(self) -> Dict[DayOfWeek, Dict]:
+        return self.snapshot.weekly_schedule
+
+    @property
+    def families(self) -> TemplateFamilies:
+        return self.snapshot.families
+
+    @property
+    def templates(self) -> CompiledTemplates:
+        return self.snapshot.templates
 
     # =========================================================================
     # RAID GENERATION
     # =========================================================================
 
-    def generate_raid(self, template_name: str, product_key: str = "holdex") -> str:
+    @timed()
+    def generate_raid(
+        self,
+        template_name: str,
+        product_key: str = "holdex",
+        rng: RandomSource = None,
+        avoid: Optional[RecentTemplates] = None
+    ) -> str:
         """Generate a raid post."""
-        product = self.products.get(product_key)
-        if not product:
-            product = self.products["holdex"]
-
-        hashtags = get_hashtags(PostType.RAID, product_key, "dexscreener")
-
-        if template_name == "imagine":
-            return self._generate_imagine_raid(product, hashtags)
-        elif template_name == "what_do_you_think":
-            return self._generate_what_do_you_think(product_key, hashtags)
-        elif template_name == "fuck_x":
-            return self._generate_fuck_x(product_key, hashtags)
-        elif template_name == "comparison":
-            return self._generate_comparison(product, hashtags)
-        elif template_name == "provocation":
-            return self._generate_provocation(product_key, hashtags)
-        elif template_name == "viral":
-            return self._generate_viral(hashtags)
-        else:
-            return self._generate_comparison(product, hashtags)
-
-    def _generate_imagine_raid(self, product: Product, hashtags: str) -> str:
-        """Generate an 'Imagine' style raid."""
-        template = RAID_TEMPLATES["imagine"]["template"]
-        return template.format(
-            competitor=product.competitor,
-            competitor_price=product.competitor_price,
-            price=product.price,
-            url=product.url,
-            hashtags=hashtags
-        )
-
-    def _generate_what_do_you_think(self, product_key: str, hashtags: str) -> str:
-        """Generate a 'What do you think' style raid."""
-        template_data = RAID_TEMPLATES["what_do_you_think"]
-        product = self.products[product_key]
+        return self._tracked_raid(template_name, product_key, resolve_rng(rng), avoid).content
 
-        problem = template_data["problems"].get(product_key, "extractive fees")
-        solution = template_data["solutions"].get(product_key, "burn fees instead")
-
-        return template_data["template"].format(
-            problem=problem,
-            product_name=product.name,
-            solution=solution,
-            url=product.url,
-            hashtags=hashtags
+    def _tracked_raid(
+        self,
+        template_name: str,
+        product_key: str,
+        rng: random.Random,
+        avoid: Optional[RecentTemplates]
+    ) -> TrackedPost:
+        if product_key not in self.products:
+            product_key = "holdex"
+
+        hashtags = self.snapshot.get_hashtags(PostType.RAID, product_key, "dexscreener", rng=rng)
+
+        if template_name == "viral":
+            return self._tracked_viral(hashtags, rng, avoid)
+        if template_name not in self.templates.raid:
+            template_name = "comparison"
+
+        content = render(
+            self.templates.raid[template_name],
+            hashtags=hashtags,
+            **self._raid_fields(template_name, product_key)
         )
+        return TrackedPost(content, f"raid:{template_name}:{product_key}")
 
-    def _generate_fuck_x(self, product_key: str, hashtags: str) -> str:
-        """Generate a 'Fuck X' style raid (Jean Terre style)."""
-        template_data = RAID_TEMPLATES["fuck_x"]
+    def _raid_fields(self, template_name: str, product_key: str) -> Dict[str, Optional[str]]:
+        """Resolve every template field except hashtags for a raid style."""
         product = self.products[product_key]
+        template_data = self.families.raid_templates.get(template_name, {})
+
+        fields = {
+            "competitor": product.competitor,
+            "competitor_price": product.competitor_price,
+            "price": product.price,
+            "url": product.url,
+            "product_name": product.name,
+            "product_lower": product.name.lower(),
+        }
+
+        if template_name == "what_do_you_think":
+            # Kovni style
+            fields["problem"] = template_data["problems"].get(product_key, "extractive fees")
+            fields["solution"] = template_data["solutions"].get(product_key, "burn fees instead")
+        elif template_name == "fuck_x":
+            # Jean Terre style
+            target, complaint, value_prop = template_data["targets"].get(
+                product_key,
+                ("extractors", "taking your money", "$20. burned.")
+            )
+            fields.update(
+                target=target,
+                complaint=complaint,
+                product_name=product.name.lower(),
+                value_prop=value_prop
+            )
+        elif template_name == "provocation":
+            fields["action"] = template_data["actions"].get(product_key, "extracting fees")
 
-        target_data = template_data["targets"].get(
-            product_key,
-            ("extractors", "taking your money", "$20. burned.")
-        )
-        target, complaint, value_prop = target_data
-
-        return template_data["template"].format(
-            target=target,
-            complaint=complaint,
-            product_name=product.name.lower(),
-            value_prop=value_prop,
-            url=product.url,
-            hashtags=hashtags
-        )
-
-    def _generate_comparison(self, product: Product, hashtags: str) -> str:
-        """Generate a comparison raid."""
-        template = RAID_TEMPLATES["comparison"]["template"]
-        return template.format(
-            competitor=product.competitor,
-            competitor_price=product.competitor_price,
-            product_lower=product.name.lower(),
-            price=product.price,
-            url=product.url,
-            hashtags=hashtags
-        )
-
-    def _generate_provocation(self, product_key: str, hashtags: str) -> str:
-        """Generate a provocation raid."""
-        template_data = RAID_TEMPLATES["provocation"]
-        product = self.products[product_key]
-        action = template_data["actions"].get(product_key, "extracting fees")
-
-        return template_data["template"].format(
-            competitor=product.competitor,
-            action=action,
-            product_lower=product.name.lower(),
-            price=product.price,
-            url=product.url,
-            hashtags=hashtags
-        )
+        return fields
 
-    def _generate_viral(self, hashtags: str) -> str:
+    def _generate_viral(
+        self,
+        hashtags: str,
+        rng: RandomSource = None,
+        avoid: Optional[RecentTemplates] = None
+    ) -> str:
         """Generate a viral/meme post."""
-        template = random.choice(VIRAL_TEMPLATES)
-        return template.format(hashtags=hashtags)
+        return self._tracked_viral(hashtags, resolve_rng(rng), avoid).content
+
+    def _tracked_viral(self, hashtags: str, rng: random.Random, avoid: Optional[RecentTemplates]) -> TrackedPost:
+        template_id, plan = choose_fresh(rng, self.templates.viral, "viral", avoid)
+        return TrackedPost(render(plan, hashtags=hashtags), template_id)
 
     # =========================================================================
     # THREAD GENERATION
     # =========================================================================
 
-    def generate_thread(self, thread_type: str) -> List[str]:
+    @timed()
+    def generate_thread(self, thread_type: str, rng: RandomSource = None) -> List[str]:
         """Generate a thread (list of tweets)."""
-        if thread_type not in THREAD_TEMPLATES:
-            thread_type = "ecosystem"
-
-        hashtags = get_hashtags(PostType.THREAD, topic="building")
-        tweets = THREAD_TEMPLATES[thread_type].copy()
-
-        # Format hashtags in first and last tweets
-        formatted_tweets = []
-        for i, tweet in enumerate(tweets):
-            if "{hashtags}" in tweet:
-                formatted_tweets.append(tweet.format(hashtags=hashtags))
-            else:
-                formatted_tweets.append(tweet)
+        plans = self.templates.thread.get(thread_type)
+        if plans is None:
+            plans = self.templates.thread["ecosystem"]
 
-        return formatted_tweets
+        # Hashtags only appear in the first and last tweets
+        hashtags = self.snapshot.get_hashtags(PostType.THREAD, topic="building", rng=resolve_rng(rng))
+        return [render(plan, hashtags=hashtags) for plan in plans]
 
     # =========================================================================
     # CULT/PHILOSOPHY GENERATION
     # =========================================================================
 
-    def generate_cult_post(self) -> str:
+    @timed()
+    def generate_cult_post(self, rng: RandomSource = None, avoid: Optional[RecentTemplates] = None) -> str:
         """Generate a cult/philosophy post."""
-        hashtags = get_hashtags(PostType.CULT)
-        template = random.choice(CULT_TEMPLATES)
-        return template.format(hashtags=hashtags)
+        return self._tracked_cult(resolve_rng(rng), avoid).content
+
+    def _tracked_cult(self, rng: random.Random, avoid: Optional[RecentTemplates]) -> TrackedPost:
+        hashtags = self.snapshot.get_hashtags(PostType.CULT, rng=rng)
+        template_id, plan = choose_fresh(rng, self.templates.cult, "cult", avoid)
+        return TrackedPost(render(plan, hashtags=hashtags), template_id)
 
     # =========================================================================
     # FUD RESPONSE GENERATION
     # =========================================================================
 
-    def generate_fud_response(self, fud_type: str = "universal") -> str:
+    @timed()
+    def generate_fud_response(
+        self,
+        fud_type: str = "universal",
+        rng: RandomSource = None,
+        avoid: Optional[RecentTemplates] = None
+    ) -> str:
         """Generate a FUD response."""
-        if fud_type not in FUD_RESPONSES:
+        return self._tracked_fud(fud_type, resolve_rng(rng), avoid).content
+
+    def _tracked_fud(self, fud_type: str, rng: random.Random, avoid: Optional[RecentTemplates]) -> TrackedPost:
+        fud_responses = self.families.fud_responses
+        if fud_type not in fud_responses:
             fud_type = "universal"
 
-        responses = FUD_RESPONSES[fud_type]
-        return random.choice(responses)
+        template_id, response = choose_fresh(rng, fud_responses[fud_type], f"fud:{fud_type}", avoid)
+        return TrackedPost(response, template_id)
+
+    # =========================================================================
+    # REPEAT-AWARE GENERATION
+    # =========================================================================
+
+    @timed()
+    def generate_tracked(
+        self,
+        kind: str,
+        product: str = "holdex",
+        style: Optional[str] = None,
+        rng: RandomSource = None,
+        avoid: Optional[RecentTemplates] = None,
+        near_duplicates: Optional[MinHashIndex] = None
+    ) -> TrackedPost:
+        """Generate a raid, cult or FUD post and report its template id.
+
+        Templates in avoid (typically a channel's recent history) are skipped
+        while a fresh one is left; record the returned template id so the
+        next call skips it too. style is the raid style or FUD type.
+
+        With near_duplicates, a candidate too similar to an indexed post is
+        rejected and another template is tried, up to NEAR_DUP_ATTEMPTS
+        times; the last candidate is returned if none pass or the family
+        has no other template left (fixed raid styles have just one). The
+        index is not updated - add the post once it is actually used.
+        """
+        if kind not in ("raid", "cult", "fud"):
+            raise ValueError(f"Unknown tracked kind: {kind!r}")
+        rng = resolve_rng(rng)
+
+        # Raid styles other than viral render one template per product;
+        # only the hashtags vary, and those aren't shingled
+        retry = near_duplicates is not None and not (kind == "raid" and style != "viral")
+        rejected = set()
+        for _ in range(NEAR_DUP_ATTEMPTS if retry else 1):
+            if kind == "raid":
+                post = self._tracked_raid(style or "comparison", product, rng, avoid)
+            elif kind == "cult":
+                post = self._tracked_cult(rng, avoid)
+            else:
+                post = self._tracked_fud(style or "universal", rng, avoid)
+
+            # A rejected template coming back means every one has been tried
+            if not retry or post.template_id in rejected or not near_duplicates.is_near_duplicate(post.content):
+                break
+            rejected.add(post.template_id)
+            # Treat the rejected template as the most recent one and try again
+            avoid = {**(avoid or {}), post.template_id: max((avoid or {}).values(), default=0) + 1}
+        return post
 
     def get_all_fud_responses(self) -> Dict[str, List[str]]:
         """Get all FUD responses organized by type."""
-        return FUD_RESPONSES.copy()
+        return dict(self.families.fud_responses)
 
     # =========================================================================
     # REPLY/ENGAGEMENT GENERATION
     # =========================================================================
 
+    @timed()
     def generate_reply(self, reply_type: str = "ecosystem") -> str:
         """Generate an engagement reply."""
-        if reply_type not in REPLY_TEMPLATES:
+        reply_templates = self.families.reply_templates
+        if reply_type not in reply_templates:
             reply_type = "ecosystem"
-        return REPLY_TEMPLATES[reply_type]
+        return reply_templates[reply_type]
 
     def get_all_replies(self) -> Dict[str, str]:
         """Get all reply templates."""
-        return REPLY_TEMPLATES.copy()
+        return dict(self.families.reply_templates)
 
     # =========================================================================
     # ANNOUNCEMENT GENERATION
     # =========================================================================
 
-    def generate_milestone(self, week_num: int = 1) -> str:
+    @timed()
+    def generate_milestone(self, week_num: int = 1, rng: RandomSource = None) -> str:
         """Generate a milestone post."""
-        hashtags = get_hashtags(PostType.MILESTONE)
+        hashtags = self.snapshot.get_hashtags(PostType.MILESTONE, rng=resolve_rng(rng))
 
-        return ANNOUNCEMENT_TEMPLATES["milestone"].format(
+        return render(
+            self.templates.announcement["milestone"],
             week_num=week_num,
             holdex_stat=self.current_stats["holdex_listings"],
             ignition_stat=self.current_stats["ignition_airdrops"],
@@ -221,20 +387,204 @@ class PostGenerator:
             hashtags=hashtags
         )
 
+    # =========================================================================
+    # REPRODUCIBLE VARIANTS
+    # =========================================================================
+
+    @timed()
+    def generate_variant(
+        self,
+        kind: str,
+        product: Optional[str] = None,
+        style: Optional[str] = None,
+        variant: Optional[int] = None
+    ) -> PostVariant:
+        """Generate a post identified by (kind, product, style, variant).
+
+        The same arguments always give the same post, so callers can store
+        the variant id and regenerate the text later instead of storing it.
+        Leave variant unset to pick a random one. style is the raid style,
+        thread type or FUD type; for milestones, product is unused and style
+        is the week number.
+        """
+        if kind not in VARIANT_KINDS:
+            raise ValueError(f"Unknown variant kind: {kind!r}")
+        if variant is None:
+            variant = random.getrandbits(32)
+
+        variant_id = f"{kind}:{product or ''}:{style or ''}:{variant}"
+        key = (variant_id, self.snapshot.static_fingerprint)
+        if kind == "milestone":
+            key += (fingerprint(self.current_stats),)
+
+        content = self.variant_cache.get_or_create(
+            key, lambda: self._render_variant(kind, product, style, random.Random(variant_id))
+        )
+        return PostVariant(content=content, variant_id=variant_id)
+
+    def regenerate(self, variant_id: str) -> PostVariant:
+        """Rebuild a post from the variant id generate_variant returned."""
+        try:
+            kind, product, style, variant = variant_id.split(":")
+            variant_num = int(variant)
+        except ValueError:
+            raise ValueError(f"Malformed variant id: {variant_id!r}") from None
+        return self.generate_variant(kind, product or None, style or None, variant_num)
+
+    def _render_variant(
+        self,
+        kind: str,
+        product: Optional[str],
+        style: Optional[str],
+        rng: random.Random
+    ) -> Union[str, List[str]]:
+        """Dispatch a variant to the matching generate_* method."""
+        if kind == "raid":
+            return self.generate_raid(style or "comparison", product or "holdex", rng)
+        if kind == "thread":
+            return self.generate_thread(style or "ecosystem", rng)
+        if kind == "cult":
+            return self.generate_cult_post(rng)
+        if kind == "fud":
+            return self.generate_fud_response(style or "universal", rng)
+        return self.generate_milestone(int(style or 1), rng)
+
+    # =========================================================================
+    # BATCH GENERATION
+    # =========================================================================
+
+    @timed()
+    def generate_batch(
+        self,
+        kind: str,
+        n: int,
+        product: str = "holdex",
+        style: Optional[str] = None,
+        rng: RandomSource = None,
+        near_duplicates: Optional[MinHashIndex] = None
+    ) -> List[str]:
+        """Generate up to n distinct posts of one kind in a single pass.
+
+        kind is "raid", "cult" or "fud". For raids, style picks the raid
+        style (leave it unset to mix every style); for FUD it picks the FUD
+        type. Variants are sampled without replacement from every
+        (template, hashtag line) combination, so fewer than n posts come
+        back when the pool can't produce n distinct ones.
+
+        With near_duplicates, candidates too similar to a post in the index
+        (or earlier in the batch) are skipped, and accepted posts are added
+        to it. Pass an empty MinHashIndex to only dedupe within the batch.
+        """
+        if n <= 0:
+            return []
+        rng = resolve_rng(rng)
+
+        if kind == "fud":
+            fud_responses = self.families.fud_responses
+            responses = fud_responses.get(style or "universal", fud_responses["universal"])
+            if near_duplicates is None:
+                return rng.sample(responses, min(n, len(responses)))
+            posts = []
+            for post in rng.sample(responses, len(responses)):
+                if near_duplicates.add_if_new(post):
+                    posts.append(post)
+                    if len(posts) == n:
+                        break
+            return posts
+
+        if kind == "raid":
+            if product not in self.products:
+                product = "holdex"
+            slots = self._raid_batch_slots(product, style)
+            hashtag_pool = self.snapshot.hashtag_options(product, "dexscreener")
+        elif kind == "cult":
+            slots = [(plan, {}) for plan in self.templates.cult]
+            hashtag_pool = self.snapshot.hashtag_options()
+        else:
+            raise ValueError(f"Unknown batch kind: {kind!r}")
+
+        pool_size = len(hashtag_pool)
+        total = len(slots) * pool_size
+        posts = []
+        seen = set()
+
+        # Near-duplicate checks can reject candidates, so walk the whole pool
+        draws = total if near_duplicates is not None else min(n, total)
+        for index in rng.sample(range(total), draws):
+            plan, fields = slots[index // pool_size]
+            post = render(plan, hashtags=hashtag_pool[index % pool_size], **fields)
+            if post in seen:
+                continue
+            seen.add(post)
+            if near_duplicates is not None and not near_duplicates.add_if_new(post):
+                continue
+            posts.append(post)
+            if len(posts) == n:
+                break
+
+        return posts
+
+    def _raid_batch_slots(self, product_key: str, style: Optional[str]) -> List[tuple]:
+        """Resolve (plan, fields) pairs for the raid styles in a batch."""
+        if style:
+            styles = [style if style == "viral" or style in self.templates.raid else "comparison"]
+        else:
+            styles = [*self.templates.raid, "viral"]
+
+        slots = []
+        for name in styles:
+            if name == "viral":
+                slots.extend((plan, {}) for plan in self.templates.viral)
+            else:
+                slots.append((self.templates.raid[name], self._raid_fields(name, product_key)))
+        return slots
+
     # =========================================================================
     # WEEKLY GENERATION
     # =========================================================================
 
-    def generate_weekly_posts(self, week_num: int = 1) -> Dict[str, List[GeneratedPost]]:
-        """Generate all posts for a week."""
+    def config_fingerprint(self) -> str:
+        """Hash of everything that feeds weekly output.
+
+        Templates, products and hashtags are hashed once per snapshot; the
+        schedule and stats are rehashed on every call since they're the
+        parts that get edited.
+        """
+        snapshot = self.snapshot
+        return fingerprint(snapshot.static_fingerprint, snapshot.weekly_schedule, snapshot.current_stats)
+
+    @timed()
+    def generate_weekly_posts(
+        self,
+        week_num: int = 1,
+        seed: Optional[Union[int, str]] = None
+    ) -> Dict[str, List[GeneratedPost]]:
+        """Generate all posts for a week.
+
+        With a seed the week is reproducible. Results are cached per
+        (week, seed) until the config fingerprint changes.
+        """
+        key = ("posts", week_num, seed, self.config_fingerprint())
+        weekly_posts = self.weekly_cache.get_or_create(
+            key, lambda: self._build_weekly_posts(week_num, seed)
+        )
+        return {day: list(posts) for day, posts in weekly_posts.items()}
+
+    def _build_weekly_posts(
+        self,
+        week_num: int,
+        seed: Optional[Union[int, str]] = None
+    ) -> Dict[str, List[GeneratedPost]]:
+        """Generate all posts for a week, bypassing the cache."""
+        rng = resolve_rng(seed)
         weekly_posts = {}
 
-        for day, schedule in WEEKLY_SCHEDULE.items():
+        for day, schedule in self.weekly_schedule.items():
             day_name = day.name.capitalize()
             weekly_posts[day_name] = []
 
             for post_config in schedule["posts"]:
-                post = self._generate_scheduled_post(day, post_config, week_num)
+                post = self._generate_scheduled_post(day, post_config, week_num, rng)
                 if post:
                     weekly_posts[day_name].append(post)
 
@@ -244,7 +594,8 @@ class PostGenerator:
         self,
         day: DayOfWeek,
         config: Dict,
-        week_num: int
+        week_num: int,
+        rng: RandomSource = None
     ) -> Optional[GeneratedPost]:
         """Generate a single scheduled post."""
         post_type = config["type"]
@@ -253,7 +604,7 @@ class PostGenerator:
         time = config["time"]
 
         if post_type == PostType.THREAD:
-            tweets = self.generate_thread(template)
+            tweets = self.generate_thread(template, rng)
             return GeneratedPost(
                 content="\n\n---\n\n".join(tweets),
                 post_type=post_type,
@@ -265,7 +616,7 @@ class PostGenerator:
             )
 
         elif post_type == PostType.RAID:
-            content = self.generate_raid(template, product or "holdex")
+            content = self.generate_raid(template, product or "holdex", rng)
             return GeneratedPost(
                 content=content,
                 post_type=post_type,
@@ -276,7 +627,7 @@ class PostGenerator:
             )
 
         elif post_type == PostType.CULT:
-            content = self.generate_cult_post()
+            content = self.generate_cult_post(rng)
             return GeneratedPost(
                 content=content,
                 post_type=post_type,
@@ -285,7 +636,7 @@ class PostGenerator:
             )
 
         elif post_type == PostType.MILESTONE:
-            content = self.generate_milestone(week_num)
+            content = self.generate_milestone(week_num, rng)
             return GeneratedPost(
                 content=content,
                 post_type=post_type,
@@ -299,88 +650,103 @@ class PostGenerator:
     # EXPORT METHODS
     # =========================================================================
 
-    def export_weekly_posts(self, week_num: int = 1) -> str:
+    @timed()
+    def export_weekly_posts(self, week_num: int = 1, seed: Optional[Union[int, str]] = None) -> str:
         """Export weekly posts to formatted string."""
-        posts = self.generate_weekly_posts(week_num)
-        output = []
-        output.append("=" * 80)
-        output.append(f"ASDF ECOSYSTEM - WEEK {week_num} POSTS")
-        output.append("Ready to Copy-Paste")
-        output.append("=" * 80)
-        output.append("")
-
-        for day_name, day_posts in posts.items():
-            output.append("=" * 80)
-            output.append(f"{day_name.upper()}")
-            output.append("=" * 80)
-            output.append("")
+        key = ("export", week_num, seed, self.config_fingerprint())
+        return self.weekly_cache.get_or_create(
+            key, lambda: self._build_weekly_export(week_num, seed)
+        )
+
+    def _build_weekly_export(self, week_num: int, seed: Optional[Union[int, str]] = None) -> str:
+        """Render the weekly export text, bypassing the cache."""
+        return "\n".join(self.iter_weekly_export(week_num, seed))
+
+    @timed()
+    def export_range(
+        self,
+        start_week: int,
+        end_week: int,
+        seed: Optional[Union[int, str]] = None
+    ) -> Dict[int, str]:
+        """Export weeks start_week..end_week (inclusive).
+
+        Each week is seeded with "{seed}:{week}", so the same seed gives the
+        same calendar. Without a seed one is picked at random. Returns
+        {week: export text} in week order.
+        """
+        if end_week < start_week:
+            raise ValueError("end_week must be >= start_week")
+        if seed is None:
+            seed = random.getrandbits(32)
+        return {week: self.export_weekly_posts(week, f"{seed}:{week}") for week in range(start_week, end_week + 1)}
+
+    @timed()
+    def export_fud_responses(self) -> str:
+        """Export all FUD responses to formatted string."""
+        return "\n".join(self.iter_fud_export())
+
+    @timed()
+    def export_reply_templates(self) -> str:
+        """Export all reply templates to formatted string."""
+        return "\n".join(self.iter_reply_export())
+
+    # =========================================================================
+    # STREAMING EXPORTS
+    # =========================================================================
+    # Each iterator yields one section at a time (a header, a day banner, a
+    # post). Joining the sections with "\n" gives the matching export_* string.
+
+    @timed()
+    def iter_weekly_export(self, week_num: int = 1, seed: Optional[Union[int, str]] = None) -> Iterator[str]:
+        """Yield the weekly export section by section."""
+        yield _export_header(f"ASDF ECOSYSTEM - WEEK {week_num} POSTS")
+
+        for day_name, day_posts in self.generate_weekly_posts(week_num, seed).items():
+            yield "\n".join(["=" * 80, day_name.upper(), "=" * 80, ""])
 
             for i, post in enumerate(day_posts, 1):
-                output.append("-" * 40)
                 post_label = f"POST {i} - {post.post_type.value.upper()} ({post.time})"
                 if post.is_thread:
                     post_label += " - THREAD"
-                output.append(post_label)
-                output.append("-" * 40)
-                output.append("")
+                header = ["-" * 40, post_label, "-" * 40, ""]
 
                 if post.is_thread and post.thread_tweets:
+                    # One section per tweet so long threads break between tweets
+                    yield "\n".join(header)
                     for j, tweet in enumerate(post.thread_tweets, 1):
-                        output.append(f"[TWEET {j}/{len(post.thread_tweets)} - START]")
-                        output.append(tweet)
-                        output.append("[END]")
-                        output.append("")
+                        yield "\n".join([f"[TWEET {j}/{len(post.thread_tweets)} - START]", tweet, "[END]", ""])
                 else:
-                    output.append("[START]")
-                    output.append(post.content)
-                    output.append("[END]")
-                    output.append("")
+                    yield "\n".join([*header, "[START]", post.content, "[END]", ""])
 
-        return "\n".join(output)
+    @timed()
+    def iter_fud_export(self) -> Iterator[str]:
+        """Yield the FUD responses export section by section."""
+        yield _export_header("ASDF - FUD RESPONSES")
 
-    def export_fud_responses(self) -> str:
-        """Export all FUD responses to formatted string."""
-        output = []
-        output.append("=" * 80)
-        output.append("ASDF - FUD RESPONSES")
-        output.append("Ready to Copy-Paste")
-        output.append("=" * 80)
-        output.append("")
-
-        for fud_type, responses in FUD_RESPONSES.items():
-            output.append("-" * 40)
-            output.append(f"FUD TYPE: {fud_type.upper().replace('_', ' ')}")
-            output.append("-" * 40)
-            output.append("")
+        for fud_type, responses in self.families.fud_responses.items():
+            yield _export_subheader(f"FUD TYPE: {fud_type.upper().replace('_', ' ')}")
 
             for i, response in enumerate(responses, 1):
-                output.append(f"[RESPONSE {i} - START]")
-                output.append(response)
-                output.append("[END]")
-                output.append("")
+                yield "\n".join([f"[RESPONSE {i} - START]", response, "[END]", ""])
 
-        return "\n".join(output)
+    @timed()
+    def iter_reply_export(self) -> Iterator[str]:
+        """Yield the reply templates export section by section."""
+        yield _export_header("ASDF - REPLY TEMPLATES")
 
-    def export_reply_templates(self) -> str:
-        """Export all reply templates to formatted string."""
-        output = []
-        output.append("=" * 80)
-        output.append("ASDF - REPLY TEMPLATES")
-        output.append("Ready to Copy-Paste")
-        output.append("=" * 80)
-        output.append("")
-
-        for reply_type, template in REPLY_TEMPLATES.items():
-            output.append("-" * 40)
-            output.append(f"REPLY TYPE: {reply_type.upper().replace('_', ' ')}")
-            output.append("-" * 40)
-            output.append("")
-            output.append("[START]")
-            output.append(template)
-            output.append("[END]")
-            output.append("")
-
-        return "\n".join(output)
+        for reply_type, template in self.families.reply_templates.items():
+            yield _export_subheader(f"REPLY TYPE: {reply_type.upper().replace('_', ' ')}")
+            yield "\n".join(["[START]", template, "[END]", ""])
+
+
+def _export_header(title: str) -> str:
+    """Top banner shared by every export."""
+    return "\n".join(["=" * 80, title, "Ready to Copy-Paste", "=" * 80, ""])
+
+def _export_subheader(title: str) -> str:
+    """Section banner used by the FUD and reply exports."""
+    return "\n".join(["-" * 40, title, "-" * 40, ""])
 
 
 # =============================================================================
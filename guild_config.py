@@ -0,0 +1,208 @@
+"""
+ASDF X Post Generator - Per-Guild Config
+========================================
+Per-guild overrides for products, schedule, stats and the reminder
+channel, stored in SQLite behind an in-memory read-through cache.
+
+Overrides are layered on the live ConfigSnapshot: stats and products are
+merged key by key, schedule days replace whole days. Guilds without
+overrides use the global config unchanged. Reads hit SQLite at most once
+per guild per GUILD_CONFIG_TTL seconds; writes through this process
+invalidate its cache at once, other cluster workers pick them up when
+their entry expires.
+"""
+
+import dataclasses
+import json
+import os
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from cache import TTLCache
+from cluster_store import connect_wal
+from config import PRODUCTS, DayOfWeek, PostType, Product
+from live_config import ConfigSnapshot, replace_snapshot
+
+# SQLite file for per-guild config (unset = every guild uses the global config)
+GUILD_DB = os.getenv('GUILD_DB', '')
+
+# Seconds a guild's config stays cached before it is re-read
+GUILD_CONFIG_TTL = float(os.getenv('GUILD_CONFIG_TTL', '60'))
+
+SETTINGS = ("current_stats", "products", "weekly_schedule", "output_channel_id")
+
+_PRODUCT_FIELDS = {f.name for f in dataclasses.fields(Product)}
+_REQUIRED_PRODUCT_FIELDS = {"name", "description", "url"}
+
+
+# =============================================================================
+# VALIDATION
+# =============================================================================
+
+def parse_setting(setting: str, value: Any) -> Any:
+    """Validate an override value, raising ValueError with a readable reason."""
+    if setting not in SETTINGS:
+        raise ValueError(f"Unknown setting: {setting!r}")
+
+    if setting == "output_channel_id":
+        channel_id = str(value).strip().lstrip("<#").rstrip(">")
+        if not channel_id.isdigit():
+            raise ValueError("output_channel_id must be a channel id or mention")
+        return int(channel_id)
+
+    if not isinstance(value, dict):
+        raise ValueError(f"{setting} must be a JSON object")
+
+    if setting == "current_stats":
+        if not all(isinstance(v, (str, int, float)) and not isinstance(v, bool) for v in value.values()):
+            raise ValueError("current_stats values must be strings or numbers")
+    elif setting == "products":
+        for key, fields in value.items():
+            if not isinstance(fields, dict) or not set(fields) <= _PRODUCT_FIELDS:
+                raise ValueError(f"products[{key!r}] must only use {sorted(_PRODUCT_FIELDS)}")
+            if key not in PRODUCTS and not _REQUIRED_PRODUCT_FIELDS <= set(fields):
+                raise ValueError(f"new product {key!r} needs {sorted(_REQUIRED_PRODUCT_FIELDS)}")
+            tags = fields.get("tags", [])
+            if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+                raise ValueError(f"products[{key!r}].tags must be a list of hashtags")
+    else:
+        for day, info in value.items():
+            if day.upper() not in DayOfWeek.__members__:
+                raise ValueError(f"Unknown day: {day!r}")
+            if not isinstance(info, dict) or not isinstance(info.get("posts", []), list):
+                raise ValueError(f"{day} must be an object with a list of posts")
+            for post in info.get("posts", []):
+                if not isinstance(post, dict) or "type" not in post or "time" not in post:
+                    raise ValueError(f"{day} posts need a type and a time")
+                PostType(post["type"])
+
+    return value
+
+
+def _merge_products(base: Dict[str, Product], overrides: Dict[str, Dict]) -> Dict[str, Product]:
+    products = dict(base)
+    for key, fields in overrides.items():
+        if key in products:
+            products[key] = replace(products[key], **fields)
+        else:
+            products[key] = Product(**fields)
+    return products
+
+
+def _merge_schedule(base: Dict[DayOfWeek, Dict], overrides: Dict[str, Dict]) -> Dict[DayOfWeek, Dict]:
+    schedule = dict(base)
+    for day, info in overrides.items():
+        schedule[DayOfWeek[day.upper()]] = {
+            "theme": info.get("theme", ""),
+            "posts": [{**post, "type": PostType(post["type"])} for post in info.get("posts", [])],
+        }
+    return dict(sorted(schedule.items(), key=lambda item: item[0].value))
+
+
+def apply_overrides(base: ConfigSnapshot, overrides: Dict[str, Any]) -> ConfigSnapshot:
+    """Layer a guild's overrides on top of the global snapshot."""
+    changes = {}
+    if "current_stats" in overrides:
+        changes["current_stats"] = {**base.current_stats, **overrides["current_stats"]}
+    if "products" in overrides:
+        changes["products"] = _merge_products(base.products, overrides["products"])
+    if "weekly_schedule" in overrides:
+        changes["weekly_schedule"] = _merge_schedule(base.weekly_schedule, overrides["weekly_schedule"])
+    return replace_snapshot(base, **changes) if changes else base
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class GuildConfigStore:
+    """SQLite-backed per-guild overrides with a TTL read-through cache."""
+
+    def __init__(self, path: str, ttl: float = GUILD_CONFIG_TTL, maxsize: int = 1024):
+        self.path = path
+        self.cache = TTLCache(maxsize, ttl)
+        self._conn = connect_wal(path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS guild_config (
+                guild_id INTEGER NOT NULL,
+                setting TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (guild_id, setting)
+            )
+            """
+        )
+
+    def overrides(self, guild_id: int) -> Dict[str, Any]:
+        """A guild's overrides, from the cache or SQLite."""
+        return self._entry(guild_id)[0]
+
+    def _entry(self, guild_id: int) -> Tuple[Dict[str, Any], Dict[str, ConfigSnapshot]]:
+        entry = self.cache.get(guild_id)
+        if entry is None:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT setting, value FROM guild_config WHERE guild_id = ?", (guild_id,)
+                ).fetchall()
+            # The second dict memoizes the merged snapshot for the current base
+            entry = ({setting: json.loads(value) for setting, value in rows}, {})
+            self.cache.put(guild_id, entry)
+        return entry
+
+    def snapshot_for(self, guild_id: int, base: ConfigSnapshot) -> ConfigSnapshot:
+        """The base snapshot with a guild's overrides applied.
+
+        The merged snapshot is cached with the overrides and rebuilt only
+        when the base changes (e.g. after a reload).
+        """
+        overrides, merged = self._entry(guild_id)
+        if not overrides:
+            return base
+
+        if merged.get("base") is not base:
+            merged["snapshot"] = apply_overrides(base, overrides)
+            merged["base"] = base
+        return merged["snapshot"]
+
+    def set(self, guild_id: int, setting: str, value: Any) -> None:
+        """Validate and store one override."""
+        value = parse_setting(setting, value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO guild_config (guild_id, setting, value, updated_at) VALUES (?, ?, ?, ?)",
+                (guild_id, setting, json.dumps(value), time.time())
+            )
+        self.cache.invalidate(guild_id)
+
+    def reset(self, guild_id: int, setting: Optional[str] = None) -> None:
+        """Drop one override, or all of a guild's overrides."""
+        with self._lock:
+            if setting is None:
+                self._conn.execute("DELETE FROM guild_config WHERE guild_id = ?", (guild_id,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM guild_config WHERE guild_id = ? AND setting = ?", (guild_id, setting)
+                )
+        self.cache.invalidate(guild_id)
+
+    def guilds_with(self, setting: str) -> List[Tuple[int, Any]]:
+        """Every (guild_id, value) that overrides a setting."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT guild_id, value FROM guild_config WHERE setting = ?", (setting,)
+            ).fetchall()
+        return [(guild_id, json.loads(value)) for guild_id, value in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def open_guild_config(path: str = GUILD_DB) -> Optional[GuildConfigStore]:
+    """The per-guild config store, or None when GUILD_DB is unset."""
+    return GuildConfigStore(path) if path else None
@@ -0,0 +1,195 @@
+"""
+ASDF X Post Generator - Live Config
+===================================
+Immutable snapshots of the runtime config, and a reloader that rebuilds
+them when config.py or the template pack changes.
+
+PostGenerator reads everything through one ConfigSnapshot, so a reload is
+a single attribute swap: a command that is already running finishes with
+the snapshot it started on, the next one sees the new config. Nothing is
+re-synced with Discord and the gateway connection is left alone.
+"""
+
+import asyncio
+import dataclasses
+import importlib.util
+import os
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from cache import fingerprint
+from config import DayOfWeek, HashtagPools, PostType, Product
+from template_store import (
+    FAMILIES,
+    TEMPLATE_DIR,
+    TEMPLATE_FAMILIES,
+    TEMPLATE_SNAPSHOT,
+    TemplateFamilies,
+    family_path,
+    load_families,
+)
+from templates import CompiledTemplates
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.py")
+
+# Seconds between checks for changed config sources (0 disables watching)
+RELOAD_INTERVAL = float(os.getenv('RELOAD_INTERVAL', '2'))
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Everything PostGenerator reads from config, frozen at one point in time."""
+    products: Dict[str, Product]
+    hashtags: Dict
+    current_stats: Dict[str, str]
+    weekly_schedule: Dict[DayOfWeek, Dict]
+    families: TemplateFamilies
+    get_hashtags: Callable[..., str]
+    hashtag_options: Callable[..., Tuple[str, ...]]
+    version: int = 0
+
+    @property
+    def templates(self) -> CompiledTemplates:
+        """Compiled render plans for this snapshot's template families."""
+        return self.families.compiled
+
+    @cached_property
+    def static_fingerprint(self) -> str:
+        """Fingerprint of the parts that only change on reload."""
+        return fingerprint(self.families.digest, self.products, self.hashtags)
+
+
+def _normalize_schedule(schedule: Dict) -> Dict[DayOfWeek, Dict]:
+    """Map a fresh config module's enums back onto the imported ones."""
+    return {
+        DayOfWeek(day.value): {
+            **info,
+            "posts": [{**post, "type": PostType(post["type"].value)} for post in info["posts"]],
+        }
+        for day, info in schedule.items()
+    }
+
+
+def snapshot_from_module(module: ModuleType, families: TemplateFamilies, version: int = 0) -> ConfigSnapshot:
+    """Build a snapshot from config.py or a fresh copy of it."""
+    if module is config:
+        products = module.PRODUCTS
+        schedule = module.WEEKLY_SCHEDULE
+    else:
+        products = {key: Product(**dataclasses.asdict(p)) for key, p in module.PRODUCTS.items()}
+        schedule = _normalize_schedule(module.WEEKLY_SCHEDULE)
+
+    return ConfigSnapshot(
+        products=products,
+        hashtags=module.HASHTAGS,
+        current_stats=module.CURRENT_STATS,
+        weekly_schedule=schedule,
+        families=families,
+        get_hashtags=module.get_hashtags,
+        hashtag_options=module.hashtag_options,
+        version=version,
+    )
+
+
+def builtin_snapshot(families: Optional[TemplateFamilies] = None) -> ConfigSnapshot:
+    """Snapshot of the config imported at startup."""
+    return snapshot_from_module(config, families or TEMPLATE_FAMILIES)
+
+
+def replace_snapshot(base: ConfigSnapshot, **changes) -> ConfigSnapshot:
+    """dataclasses.replace for snapshots, with hashtags drawn from the new products.
+
+    Use it for derived snapshots (e.g. a guild's) so product tags and new
+    products show up in hashtags too.
+    """
+    snapshot = dataclasses.replace(base, **changes)
+    if snapshot.products is base.products and snapshot.hashtags is base.hashtags:
+        return snapshot
+    pools = HashtagPools(snapshot.products, snapshot.hashtags)
+    return dataclasses.replace(snapshot, get_hashtags=pools.get_hashtags, hashtag_options=pools.hashtag_options)
+
+
+def exec_config(path: str = CONFIG_PATH) -> ModuleType:
+    """Execute a fresh copy of config.py without touching the imported one."""
+    spec = importlib.util.spec_from_file_location("config", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class ConfigReloader:
+    """Watches the config sources and rebuilds snapshots off the event loop."""
+
+    def __init__(
+        self,
+        config_path: str = CONFIG_PATH,
+        data_dir: str = TEMPLATE_DIR,
+        snapshot_path: str = TEMPLATE_SNAPSHOT
+    ):
+        self.config_path = config_path
+        self.data_dir = data_dir
+        self.snapshot_path = snapshot_path
+        self.version = 0
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_duration = 0.0
+        self._mtimes = self.source_mtimes()
+
+    def sources(self) -> List[str]:
+        """Files whose changes trigger a reload."""
+        paths = [self.config_path]
+        if self.data_dir:
+            paths.extend(family_path(self.data_dir, family) for family in FAMILIES)
+        elif self.snapshot_path:
+            paths.append(self.snapshot_path)
+        return paths
+
+    def source_mtimes(self) -> Dict[str, Optional[int]]:
+        """Modification time of each source; None if it doesn't exist."""
+        mtimes = {}
+        for path in self.sources():
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[path] = None
+        return mtimes
+
+    def changed(self) -> bool:
+        """True if any source changed since the last reload attempt."""
+        return self.source_mtimes() != self._mtimes
+
+    def build(self) -> ConfigSnapshot:
+        """Load every source into a new snapshot. Blocking."""
+        module = exec_config(self.config_path)
+        families = load_families(self.data_dir, self.snapshot_path, source=module)
+        snapshot = snapshot_from_module(module, families, self.version + 1)
+        # Compile up front: a bad placeholder fails the reload instead of a
+        # later command, and the swap doesn't pay for compiling
+        families.compile_now()
+        return snapshot
+
+    async def reload(self) -> ConfigSnapshot:
+        """Rebuild the snapshot in a worker thread.
+
+        A failed build raises and leaves the current snapshot in place; it
+        isn't retried until the sources change again.
+        """
+        self._mtimes = self.source_mtimes()
+        started = time.perf_counter()
+        try:
+            snapshot = await asyncio.get_running_loop().run_in_executor(None, self.build)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+
+        self.last_duration = time.perf_counter() - started
+        self.version = snapshot.version
+        self.reloads += 1
+        self.last_error = None
+        return snapshot
@@ -0,0 +1,379 @@
+"""
+ASDF X Post Generator - Metrics
+===============================
+Counters and histograms rendered in the Prometheus text exposition
+format, plus a small HTTP endpoint served from the bot's event loop.
+
+Metrics live in a process-wide REGISTRY. Values that already exist
+elsewhere (e.g. outbound queue stats) are read at scrape time by
+collector functions instead of being counted twice.
+"""
+
+import bisect
+import functools
+import inspect
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Port for the /metrics endpoint (0 = disabled); cluster workers add their CLUSTER_ID
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+
+# Interface the endpoint listens on
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+
+# Seconds; covers fast renders up to slow multi-message exports
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+@dataclass
+class MetricFamily:
+    """One metric and its samples, as returned by a collector."""
+    name: str
+    kind: str  # "counter", "gauge" or "histogram"
+    help: str
+    samples: List[Tuple[Dict[str, str], float]] = field(default_factory=list)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Add amount to the series for these label values."""
+        key = tuple(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Current value of one series."""
+        return self._values.get(tuple(labelvalues), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [count per bucket (+Inf last), sum, count]
+        self._series: Dict[Labels, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation."""
+        key = tuple(labelvalues)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        """Observations recorded for one series."""
+        series = self._series.get(tuple(labelvalues))
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, [list(s[0]), s[1], s[2]]) for labels, s in self._series.items())
+
+        names = self.labelnames + ("le",)
+        lines = []
+        for labels, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, (*labels, _format_value(bound)))} {cumulative}"
+                )
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+class Registry:
+    """Every metric one process exposes."""
+
+    def __init__(self):
+        self.metrics: List[Any] = []
+        self.collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Add a function that reports metric families at scrape time."""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+
+        for collector in self.collectors:
+            for family in collector():
+                lines.append(f"# HELP {family.name} {family.help}")
+                lines.append(f"# TYPE {family.name} {family.kind}")
+                for labels, value in family.samples:
+                    lines.append(f"{family.name}{_format_labels(list(labels), list(labels.values()))} "
+                                 f"{_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+COMMAND_LATENCY = REGISTRY.histogram(
+    "bot_command_latency_seconds",
+    "Seconds from receiving a slash command to its defer, first response and last message",
+    ("command", "phase")
+)
+COMMANDS = REGISTRY.counter("bot_commands_total", "Slash commands handled", ("command", "status"))
+GENERATION_SECONDS = REGISTRY.histogram(
+    "generator_method_seconds", "Seconds spent in PostGenerator methods", ("method",)
+)
+DISCORD_REQUESTS = REGISTRY.counter(
+    "bot_discord_message_requests_total",
+    "Interaction responses, followups and channel messages sent to Discord, by status",
+    ("route", "status")
+)
+
+
+# =============================================================================
+# TIMING
+# =============================================================================
+
+def timed(histogram: Histogram = GENERATION_SECONDS) -> Callable:
+    """Decorator recording each call's duration under the function's name.
+
+    Generator functions are timed across their whole iteration, counting
+    only time spent producing items, not time the caller holds them.
+    """
+    def decorator(func: Callable) -> Callable:
+        name = func.__name__
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                spent = 0.0
+                iterator = func(*args, **kwargs)
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                        finally:
+                            spent += time.perf_counter() - started
+                        yield item
+                finally:
+                    iterator.close()
+                    histogram.observe(spent, name)
+            return wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, name)
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# COMMAND LATENCY
+# =============================================================================
+
+_INTERACTION_CALLBACK = re.compile(r"/interactions/\d+/[^/]+/callback$")
+_WEBHOOK_MESSAGE = re.compile(r"/webhooks/\d+/[^/]+(/messages/[^/]+)?$")
+_CHANNEL_MESSAGES = re.compile(r"/channels/\d+/messages$")
+
+_current_command: ContextVar[Optional["CommandTimer"]] = ContextVar("current_command", default=None)
+
+
+class CommandTimer:
+    """When one slash command was received, answered and finished sending."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.started = time.monotonic()
+        self.callback_at: Optional[float] = None
+        self.first_message: Optional[float] = None
+        self.last_message: Optional[float] = None
+
+    def mark(self, route: str) -> None:
+        """Note a successful request: the interaction callback or a message."""
+        now = time.monotonic()
+        if route == "callback":
+            if self.callback_at is None:
+                self.callback_at = now
+            return
+        if self.first_message is None:
+            self.first_message = now
+        self.last_message = now
+
+    def finish(self, status: str, deferred: bool) -> None:
+        """Record the command's latencies.
+
+        With a deferred response the callback is the defer and the first
+        response is the first followup or message after it; otherwise the
+        callback itself is the first response.
+        """
+        if deferred:
+            if self.callback_at is not None:
+                COMMAND_LATENCY.observe(self.callback_at - self.started, self.command, "defer")
+            first = self.first_message
+        else:
+            first = self.callback_at or self.first_message
+        if first is not None:
+            COMMAND_LATENCY.observe(first - self.started, self.command, "first_response")
+
+        sent = [t for t in (self.callback_at, self.last_message) if t is not None]
+        if sent:
+            COMMAND_LATENCY.observe(max(sent) - self.started, self.command, "last_chunk")
+        COMMANDS.inc(self.command, status)
+
+
+def start_command(command: str) -> CommandTimer:
+    """Start timing a command in the current task."""
+    timer = CommandTimer(command)
+    _current_command.set(timer)
+    return timer
+
+
+def current_command() -> Optional[CommandTimer]:
+    """The command being handled by the current task, if any."""
+    return _current_command.get()
+
+
+def message_route(method: str, path: str) -> Optional[str]:
+    """Classify a Discord API request that answers a command or sends a message."""
+    if _INTERACTION_CALLBACK.search(path):
+        return "callback"
+    if method in ("POST", "PATCH"):
+        if _WEBHOOK_MESSAGE.search(path):
+            return "webhook"
+        if _CHANNEL_MESSAGES.search(path):
+            return "channel"
+    return None
+
+
+def instrument_trace(trace: Any) -> Any:
+    """Add request counting and command timing to an aiohttp TraceConfig.
+
+    Trace callbacks run in the task that made the request, so the command
+    timer set by start_command is visible here.
+    """
+    async def on_request_end(session, context, params):
+        route = message_route(params.method, params.url.path)
+        if route is None:
+            return
+        status = params.response.status
+        DISCORD_REQUESTS.inc(route, str(status))
+        timer = _current_command.get()
+        if timer is not None and status < 400:
+            timer.mark(route)
+
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+
+# =============================================================================
+# HTTP ENDPOINT
+# =============================================================================
+
+async def start_metrics_server(
+    port: int = METRICS_PORT,
+    host: str = METRICS_HOST,
+    registry: Registry = REGISTRY
+) -> Optional[Any]:
+    """Serve GET /metrics on the running event loop. Returns the aiohttp runner."""
+    if not port:
+        return None
+
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(body=registry.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
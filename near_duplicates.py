@@ -0,0 +1,174 @@
+"""
+ASDF X Post Generator - Near Duplicates
+=======================================
+MinHash signatures and an LSH index for spotting posts that are almost
+the same, e.g. one raid template with two different hashtag lines.
+
+A post is split into overlapping word shingles, and its MinHash signature
+estimates the Jaccard similarity of two posts' shingle sets. Signatures
+are cut into bands that are hashed into buckets, so a lookup only compares
+against posts sharing a bucket instead of every post in the index.
+"""
+
+import hashlib
+import os
+import random
+import re
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+# Estimated Jaccard similarity at or above which a post counts as a near duplicate
+NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', '0.8'))
+
+# Hash functions per signature; more is more accurate and slower
+NUM_PERMUTATIONS = 64
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Max posts kept per index before the oldest are dropped
+MAX_INDEXED = 5000
+
+_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"[\w$%#@'.]+")
+
+Signature = Tuple[int, ...]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Lowercased word n-grams of a post, ignoring hashtags.
+
+    A different hashtag line doesn't make a post distinct to X, so only a
+    post made of nothing but hashtags is shingled on them.
+    """
+    tokens = _WORD.findall(text.lower())
+    words = [token for token in tokens if not token.startswith("#")] or tokens
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash(shingle: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) whose LSH cut-off is the highest one not above threshold.
+
+    Two posts with similarity s share a bucket with probability
+    1 - (1 - s^rows)^bands, which rises steeply around (1/bands)^(1/rows).
+    Keeping that point at or just below the threshold favours recall; the
+    exact signature comparison then drops the extra candidates.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(bands, rows) for bands, rows in options if (1 / bands) ** (1 / rows) <= threshold]
+    return max(below, key=lambda option: (1 / option[0]) ** (1 / option[1])) if below else options[0]
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures."""
+
+    def __init__(self, num_perm: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Signature:
+        """MinHash signature of a post's shingles."""
+        hashes = [_hash(shingle) for shingle in shingles(text)]
+        if not hashes:
+            return (_PRIME,) * self.num_perm
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b, strict=True)) / len(a)
+
+
+def text_key(text: str) -> str:
+    """Default index key for a post."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class MinHashIndex:
+    """LSH index of post signatures with a similarity threshold."""
+
+    def __init__(
+        self,
+        threshold: float = NEAR_DUP_THRESHOLD,
+        num_perm: int = NUM_PERMUTATIONS,
+        max_items: int = MAX_INDEXED,
+        hasher: Optional[MinHasher] = None
+    ):
+        self.threshold = threshold
+        self.max_items = max_items
+        self.hasher = hasher or MinHasher(num_perm)
+        self.bands, self.rows = lsh_bands(self.hasher.num_perm, threshold)
+        self._signatures: "OrderedDict[Hashable, Signature]" = OrderedDict()
+        self._buckets: List[Dict[Signature, Set[Hashable]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: Signature) -> List[Signature]:
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+    def add(self, text: str, key: Optional[Hashable] = None) -> Hashable:
+        """Index a post, dropping the oldest one past max_items. Returns its key."""
+        key = text_key(text) if key is None else key
+        if key in self._signatures:
+            self._signatures.move_to_end(key)
+            return key
+        self._insert(key, self.hasher.signature(text))
+        return key
+
+    def add_if_new(self, text: str, key: Optional[Hashable] = None) -> bool:
+        """Index a post unless it is a near duplicate. True if it was added."""
+        signature = self.hasher.signature(text)
+        if self._matches(signature):
+            return False
+        self._insert(text_key(text) if key is None else key, signature)
+        return True
+
+    def _insert(self, key: Hashable, signature: Signature) -> None:
+        self._signatures[key] = signature
+        for buckets, band in zip(self._buckets, self._band_keys(signature), strict=True):
+            buckets.setdefault(band, set()).add(key)
+
+        while len(self._signatures) > self.max_items:
+            self.remove(next(iter(self._signatures)))
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a post from the index."""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for buckets, band in zip(self._buckets, self._band_keys(signature), strict=True):
+            bucket = buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[band]
+
+    def query(self, text: str) -> List[Tuple[Hashable, float]]:
+        """Indexed posts at or above the threshold, most similar first."""
+        return self._matches(self.hasher.signature(text))
+
+    def _matches(self, signature: Signature) -> List[Tuple[Hashable, float]]:
+        candidates: Set[Hashable] = set()
+        for buckets, band in zip(self._buckets, self._band_keys(signature), strict=True):
+            candidates.update(buckets.get(band, ()))
+
+        matches = [(key, similarity(signature, self._signatures[key])) for key in candidates]
+        matches = [(key, score) for key, score in matches if score >= self.threshold]
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def is_near_duplicate(self, text: str) -> bool:
+        """True if any indexed post is at or above the threshold."""
+        return bool(self.query(text))
@@ -0,0 +1,111 @@
+"""
+ASDF X Post Generator - Offloading
+==================================
+Runs CPU-bound generation and export work on a bounded thread pool, so the
+event loop stays free for gateway heartbeats and other users' commands.
+
+At most OFFLOAD_WORKERS jobs run at once. Later jobs wait their turn in
+arrival order and are counted as queued, which /metrics and /botstats
+report. Worker threads still share the GIL. But the interpreter switches
+threads every few milliseconds, so a large export no longer holds the loop
+for its whole duration.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+# Max generation/export jobs running at once off the event loop (0 = run on the loop)
+OFFLOAD_WORKERS = int(os.getenv('OFFLOAD_WORKERS', '4'))
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class Offloader:
+    """Bounded thread pool for blocking work called from coroutines."""
+
+    def __init__(self, workers: int = OFFLOAD_WORKERS):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="offload") if workers else None
+        self._slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        self.waiting = 0
+        self.running = 0
+        self.jobs = 0
+        self.wait_total = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return self.waiting
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # One per event loop; a semaphore can't be shared between loops
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots[0] is not loop:
+            self._slots = (loop, asyncio.Semaphore(self.workers))
+        return self._slots[1]
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        slots = self._semaphore()
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.jobs += 1
+        self.wait_total += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            slots.release()
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call func in a worker thread once one is free."""
+        if self._executor is None:
+            return func(*args, **kwargs)
+        async with self._slot():
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def iterate(self, items: Iterable[T]) -> AsyncIterator[T]:
+        """Advance an iterator in worker threads, yielding each item as it's ready.
+
+        Every step is its own job, so a consumer that is slow to take items
+        (e.g. paced sends) doesn't hold a worker in between.
+        """
+        iterator = iter(items)
+        while True:
+            item = await self.run(next, iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running jobs and wait-time stats."""
+        return {
+            "workers": self.workers,
+            "depth": self.depth,
+            "running": self.running,
+            "jobs": self.jobs,
+            "avg_wait": self.wait_total / self.jobs if self.jobs else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,273 @@
+"""
+ASDF X Post Generator - Outbound Message Queue
+==============================================
+Per-channel send queue paced by a token bucket.
+
+Each channel gets a lane: a FIFO lock so one command's messages stay
+together, plus a token bucket that follows Discord's X-RateLimit-* headers
+and backs off on 429s. Replaces the fixed sleeps between sends.
+"""
+
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+import discord
+
+# Discord allows 5 messages per 5 seconds per channel
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 5
+MIN_RATE = 0.2
+MAX_RETRIES = 3
+
+_CHANNEL_MESSAGES_PATH = re.compile(r"/channels/(\d+)/messages")
+
+
+class TokenBucket:
+    """Token bucket that adapts to Discord rate-limit feedback.
+
+    The refill rate halves on every 429 and creeps back up to its base rate
+    after successful sends.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: int = DEFAULT_BURST):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token if one is free, else return seconds to wait."""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            delay = self.reserve()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def update(self, limit: Optional[int], remaining: Optional[int], reset_after: Optional[float]) -> None:
+        """Sync the bucket with Discord's X-RateLimit-* headers."""
+        now = time.monotonic()
+        self._refill(now)
+        if limit:
+            self.capacity = limit
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining == 0 and reset_after:
+                self.blocked_until = max(self.blocked_until, now + reset_after)
+            elif remaining > 0:
+                self.rate = min(self.base_rate, self.rate + 0.1 * self.base_rate)
+
+    def penalize(self, retry_after: float) -> None:
+        """Back off after a 429."""
+        now = time.monotonic()
+        self.tokens = 0.0
+        self._updated = now
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.rate = max(MIN_RATE, self.rate / 2)
+
+
+class ChannelLane:
+    """Send lane and stats for one channel."""
+
+    def __init__(self, rate: float, burst: int):
+        self.lock = asyncio.Lock()
+        self.bucket = TokenBucket(rate, burst)
+        self.waiting = 0
+        self.sessions = 0
+        self.sent = 0
+        self.rate_limited = 0
+        self.queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.pacing_wait = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Sessions waiting for or holding the lane."""
+        return self.waiting + (1 if self.lock.locked() else 0)
+
+    @property
+    def avg_queue_wait(self) -> float:
+        """Average seconds a session waited for the lane."""
+        return self.queue_wait / self.sessions if self.sessions else 0.0
+
+    @property
+    def avg_pacing_wait(self) -> float:
+        """Average seconds a message waited on the token bucket."""
+        return self.pacing_wait / self.sent if self.sent else 0.0
+
+
+class OutboundQueue:
+    """Per-channel outbound queue for bot messages."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.lanes: Dict[int, ChannelLane] = {}
+        self.tracing = False
+
+    def lane(self, channel_id: int) -> ChannelLane:
+        """Get or create the lane for a channel."""
+        lane = self.lanes.get(channel_id)
+        if lane is None:
+            lane = self.lanes[channel_id] = ChannelLane(self.rate, self.burst)
+        return lane
+
+    @asynccontextmanager
+    async def session(self, channel: discord.abc.Messageable) -> AsyncIterator[Callable[..., Awaitable[Any]]]:
+        """Hold a channel's lane so a batch of messages stays contiguous.
+
+        Yields a send function with the same arguments as channel.send.
+        Sessions on the same channel are served in arrival order.
+        """
+        lane = self.lane(channel.id)
+        started = time.monotonic()
+        lane.waiting += 1
+        try:
+            await lane.lock.acquire()
+        finally:
+            lane.waiting -= 1
+
+        waited = time.monotonic() - started
+        lane.sessions += 1
+        lane.queue_wait += waited
+        lane.max_queue_wait = max(lane.max_queue_wait, waited)
+
+        try:
+            async def send(*args, **kwargs):
+                return await self._send(lane, channel, *args, **kwargs)
+            yield send
+        finally:
+            lane.lock.release()
+
+    async def send(self, channel: discord.abc.Messageable, *args, **kwargs) -> Any:
+        """Queue a single message."""
+        async with self.session(channel) as send:
+            return await send(*args, **kwargs)
+
+    async def _send(self, lane: ChannelLane, channel: discord.abc.Messageable, *args, **kwargs) -> Any:
+        for attempt in range(MAX_RETRIES + 1):
+            started = time.monotonic()
+            await lane.bucket.acquire()
+            lane.pacing_wait += time.monotonic() - started
+            try:
+                message = await channel.send(*args, **kwargs)
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == MAX_RETRIES:
+                    raise
+                if not self.tracing:  # Otherwise observe() already counted it
+                    lane.rate_limited += 1
+                lane.bucket.penalize(_retry_after(e.response))
+                continue
+
+            lane.sent += 1
+            return message
+
+    # =========================================================================
+    # RATE LIMIT FEEDBACK
+    # =========================================================================
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """aiohttp trace hook that feeds Discord's rate-limit headers back in.
+
+        Pass it to the bot as ``http_trace``.
+        """
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_end(session, context, params):
+            match = _CHANNEL_MESSAGES_PATH.search(params.url.path)
+            if not match or params.method != "POST":
+                return
+            self.observe(int(match.group(1)), params.response.status, params.response.headers)
+
+        trace.on_request_end.append(on_request_end)
+        self.tracing = True
+        return trace
+
+    def observe(self, channel_id: int, status: int, headers: Any) -> None:
+        """Apply one Discord response's rate-limit headers to a channel lane."""
+        lane = self.lane(channel_id)
+        if status == 429:
+            lane.rate_limited += 1
+            lane.bucket.penalize(_retry_after_headers(headers))
+            return
+
+        lane.bucket.update(
+            _int_header(headers, "X-RateLimit-Limit"),
+            _int_header(headers, "X-RateLimit-Remaining"),
+            _float_header(headers, "X-RateLimit-Reset-After"),
+        )
+
+    # =========================================================================
+    # STATS
+    # =========================================================================
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait-time stats, overall and per channel."""
+        lanes = self.lanes.values()
+        sessions = sum(lane.sessions for lane in lanes)
+        sent = sum(lane.sent for lane in lanes)
+        return {
+            "depth": sum(lane.depth for lane in lanes),
+            "sessions": sessions,
+            "sent": sent,
+            "rate_limited": sum(lane.rate_limited for lane in lanes),
+            "avg_queue_wait": sum(lane.queue_wait for lane in lanes) / sessions if sessions else 0.0,
+            "max_queue_wait": max((lane.max_queue_wait for lane in lanes), default=0.0),
+            "avg_pacing_wait": sum(lane.pacing_wait for lane in lanes) / sent if sent else 0.0,
+            "channels": {
+                channel_id: {
+                    "depth": lane.depth,
+                    "sent": lane.sent,
+                    "rate_limited": lane.rate_limited,
+                    "avg_queue_wait": lane.avg_queue_wait,
+                    "max_queue_wait": lane.max_queue_wait,
+                    "avg_pacing_wait": lane.avg_pacing_wait,
+                    "rate": lane.bucket.rate,
+                }
+                for channel_id, lane in self.lanes.items()
+            },
+        }
+
+
+def _int_header(headers: Any, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+def _float_header(headers: Any, name: str) -> Optional[float]:
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def _retry_after_headers(headers: Any) -> float:
+    return _float_header(headers, "Retry-After") or _float_header(headers, "X-RateLimit-Reset-After") or 1.0
+
+def _retry_after(response: Any) -> float:
+    headers = getattr(response, "headers", None)
+    return _retry_after_headers(headers) if headers is not None else 1.0
@@ -0,0 +1,280 @@
+"""
+ASDF X Post Generator - Post History
+====================================
+Records what was generated for each channel so the same template isn't
+handed to the same channel twice in a row.
+
+Rows are appended to a SQLite table (WAL mode) indexed by guild, channel,
+post type and template id. Writes are buffered and flushed in batches, off
+the hot path. Each (guild, channel, post type) scope keeps an in-memory
+window of its last HISTORY_WINDOW template ids, loaded from SQLite on first
+use, so checking a candidate against recent history is a dict lookup.
+
+Each guild also gets a MinHash index of its last HISTORY_SIMILAR posts
+(see near_duplicates.py), so a post that only differs from an earlier one
+in its hashtags can be rejected too.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from cache import LRUCache
+from cluster_store import connect_wal
+from near_duplicates import MinHashIndex
+
+# SQLite file for post history (unset = no history, repeats are allowed)
+HISTORY_DB = os.getenv('HISTORY_DB', '')
+
+# Recent templates per channel and post type that generation avoids
+HISTORY_WINDOW = int(os.getenv('HISTORY_WINDOW', '10'))
+
+# Buffered rows that trigger a flush
+HISTORY_BATCH = int(os.getenv('HISTORY_BATCH', '32'))
+
+# Past posts per guild checked for near duplicates
+HISTORY_SIMILAR = int(os.getenv('HISTORY_SIMILAR', '1000'))
+
+# Max channel scopes whose windows stay in memory
+HISTORY_SCOPES = 4096
+
+# Max guilds whose near-duplicate indexes stay in memory
+HISTORY_INDEXES = 256
+
+Scope = Tuple[int, int, str]
+
+
+class RecentWindow(Mapping):
+    """The last `size` template ids used in one scope.
+
+    Maps each template id in the window to the number of its latest use
+    (higher = more recent), so membership and recency are O(1).
+    """
+
+    def __init__(self, size: int, template_ids: Iterable[str] = ()):
+        self.size = size
+        self._order: Deque[Tuple[int, str]] = deque()
+        self._last: Dict[str, int] = {}
+        self._uses = 0
+        for template_id in template_ids:
+            self.add(template_id)
+
+    def add(self, template_id: str) -> None:
+        """Record a use, dropping the oldest one past the window size."""
+        self._uses += 1
+        self._order.append((self._uses, template_id))
+        self._last[template_id] = self._uses
+        while len(self._order) > self.size:
+            use, old = self._order.popleft()
+            if self._last.get(old) == use:
+                del self._last[old]
+
+    def __getitem__(self, template_id: str) -> int:
+        return self._last[template_id]
+
+    def __contains__(self, template_id: object) -> bool:
+        return template_id in self._last
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._last)
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+
+def content_hash(content: str) -> str:
+    """Short stable hash of a post's text."""
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class PostHistory:
+    """Append-only post history with per-channel recent windows."""
+
+    def __init__(
+        self,
+        path: str,
+        window: int = HISTORY_WINDOW,
+        batch_size: int = HISTORY_BATCH,
+        max_scopes: int = HISTORY_SCOPES
+    ):
+        self.path = path
+        self.window = window
+        self.batch_size = batch_size
+        self.windows = LRUCache(max_scopes)
+        self.indexes = LRUCache(HISTORY_INDEXES)
+        self.similar_limit = HISTORY_SIMILAR
+        self.written = 0
+        self._pending: List[Tuple] = []
+        # Rows taken by a flush that hasn't committed yet
+        self._flushing: List[Tuple] = []
+        self._conn = connect_wal(path)
+        # _lock guards the buffers and is only held briefly, so record() can
+        # run on the event loop; _db_lock serializes use of the connection
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS post_history (
+                id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                post_type TEXT NOT NULL,
+                template_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS post_history_scope
+                ON post_history (guild_id, channel_id, post_type, id);
+            CREATE INDEX IF NOT EXISTS post_history_template
+                ON post_history (template_id, created_at);
+            """
+        )
+
+    @property
+    def pending(self) -> int:
+        """Rows buffered but not yet written."""
+        return len(self._pending)
+
+    def cached_recent(self, guild_id: Optional[int], channel_id: int, post_type: str) -> Optional[RecentWindow]:
+        """The scope's window if it is already in memory, else None. Never touches SQLite."""
+        return self.windows.get((guild_id or 0, channel_id, post_type))
+
+    def recent(self, guild_id: Optional[int], channel_id: int, post_type: str) -> RecentWindow:
+        """The recent-template window for one channel and post type.
+
+        Loaded from SQLite on first use - call it from a worker thread when
+        it may not be loaded yet.
+        """
+        scope: Scope = (guild_id or 0, channel_id, post_type)
+        window = self.windows.get(scope)
+        if window is None:
+            window = RecentWindow(self.window, self._load(scope))
+            self.windows.put(scope, window)
+        return window
+
+    def _buffered(self) -> List[Tuple]:
+        with self._lock:
+            return [*self._flushing, *self._pending]
+
+    def _load(self, scope: Scope) -> List[str]:
+        """The scope's last template ids, oldest first, including unflushed rows."""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT template_id FROM post_history WHERE guild_id = ? AND channel_id = ? AND post_type = ? "
+                "ORDER BY id DESC LIMIT ?",
+                (*scope, self.window)
+            ).fetchall()
+            buffered = [row[3] for row in self._buffered() if row[:3] == scope]
+        return ([row[0] for row in reversed(rows)] + buffered)[-self.window:]
+
+    def cached_similar(self, guild_id: Optional[int]) -> Optional[MinHashIndex]:
+        """The guild's near-duplicate index if it is already in memory, else None."""
+        return self.indexes.get(guild_id or 0)
+
+    def similar(self, guild_id: Optional[int]) -> MinHashIndex:
+        """The near-duplicate index of a guild's recent posts.
+
+        Built from SQLite on first use, which hashes up to HISTORY_SIMILAR
+        posts - call it from a worker thread when it may not be loaded yet.
+        """
+        guild_id = guild_id or 0
+        index = self.indexes.get(guild_id)
+        if index is None:
+            with self._db_lock:
+                rows = self._conn.execute(
+                    "SELECT content_hash, content FROM post_history WHERE guild_id = ? ORDER BY id DESC LIMIT ?",
+                    (guild_id, self.similar_limit)
+                ).fetchall()
+                buffered = [(row[4], row[5]) for row in self._buffered() if row[0] == guild_id]
+            index = MinHashIndex(max_items=self.similar_limit)
+            for key, content in [*reversed(rows), *buffered]:
+                index.add(content, key)
+            self.indexes.put(guild_id, index)
+        return index
+
+    def record(
+        self,
+        guild_id: Optional[int],
+        channel_id: int,
+        post_type: str,
+        template_id: str,
+        content: str
+    ) -> bool:
+        """Remember a generated post. Returns True once a flush is due.
+
+        Windows and indexes already in memory are updated at once; ones
+        loaded later pick the row up from the buffer or SQLite. Nothing
+        here touches SQLite, so an event loop can call it inline (keeping
+        the in-memory state on one thread) and flush from a worker thread.
+        """
+        window = self.cached_recent(guild_id, channel_id, post_type)
+        if window is not None:
+            window.add(template_id)
+        digest = content_hash(content)
+        index = self.cached_similar(guild_id)
+        if index is not None:
+            index.add(content, digest)
+        with self._lock:
+            self._pending.append(
+                (guild_id or 0, channel_id, post_type, template_id, digest, content, time.time())
+            )
+            return len(self._pending) >= self.batch_size
+
+    def flush(self) -> int:
+        """Write buffered rows in one transaction. Returns how many were written.
+
+        The buffer lock is only held to take the rows, so record() isn't
+        blocked while they are written.
+        """
+        with self._db_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+                self._flushing = rows
+            if not rows:
+                return 0
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO post_history "
+                    "(guild_id, channel_id, post_type, template_id, content_hash, content, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                # Keep the rows for the next flush
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                with self._lock:
+                    self._pending[:0] = rows
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = []
+            self.written += len(rows)
+        return len(rows)
+
+    def template_uses(self, template_id: str, since: float = 0.0) -> int:
+        """How often a template was used since a timestamp, across all channels."""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM post_history WHERE template_id = ? AND created_at >= ?",
+                (template_id, since)
+            ).fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        """Flush and close the database connection."""
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+
+def open_post_history(path: str = HISTORY_DB) -> Optional[PostHistory]:
+    """The post history store, or None when HISTORY_DB is unset."""
+    return PostHistory(path) if path else None
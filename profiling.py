@@ -0,0 +1,206 @@
+"""
+ASDF X Post Generator - Profiling
+=================================
+Samples slash commands and PostGenerator methods under cProfile and
+writes one .pstats file per sampled call.
+
+Wrappers are installed once at startup and cost a float comparison while
+profiling is off. Set PROFILE_SAMPLE_RATE, or use /profile, to sample a
+fraction of calls. Only one call is profiled at a time per process, so
+nested and concurrent calls run unprofiled. A sampled async command also
+records whatever else the event loop ran while it was awaiting.
+"""
+
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional
+
+from discord import app_commands
+
+# Fraction of calls to profile, 0-1 (0 = off)
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+
+# Where .pstats files are written
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+
+# Most recent profiles kept on disk
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '200'))
+
+
+@dataclass(frozen=True)
+class Capture:
+    """One profiled call."""
+    name: str
+    path: str
+    seconds: float
+    captured_at: float
+
+
+class Profiler:
+    """Samples calls under cProfile and keeps the latest captures."""
+
+    def __init__(self, rate: float = PROFILE_SAMPLE_RATE, directory: str = PROFILE_DIR, keep: int = PROFILE_KEEP):
+        self.rate = rate
+        self.directory = directory
+        self.captures: Deque[Capture] = deque()
+        self.keep = keep
+        self.sampled = 0
+        self._active = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def set_rate(self, rate: float) -> None:
+        """Change the sampled fraction; 0 turns profiling off."""
+        if not 0 <= rate <= 1:
+            raise ValueError("rate must be between 0 and 1")
+        self.rate = rate
+
+    # =========================================================================
+    # SAMPLING
+    # =========================================================================
+
+    def _start(self) -> Optional[cProfile.Profile]:
+        if not self.rate or random.random() >= self.rate:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. python -m cProfile) owns the hooks
+            self._active.release()
+            return None
+        return profile
+
+    def _finish(self, profile: cProfile.Profile, name: str, seconds: float) -> None:
+        profile.disable()
+        self._active.release()
+        self._save(profile, name, seconds)
+
+    def _save(self, profile: cProfile.Profile, name: str, seconds: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.sampled += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"{stamp}-{name}-{self.sampled}.pstats")
+        profile.dump_stats(path)
+
+        self.captures.append(Capture(name, path, seconds, time.time()))
+        while len(self.captures) > self.keep:
+            old = self.captures.popleft()
+            try:
+                os.remove(old.path)
+            except OSError:
+                pass
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Wrap a function, coroutine function or generator function."""
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                profile = self._start()
+                if profile is None:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self._finish(profile, name, time.perf_counter() - started)
+            return async_wrapper
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                profile = self._start()
+                if profile is None:
+                    return (yield from func(*args, **kwargs))
+                # Profile only while producing items, not while the caller holds them
+                profile.disable()
+                spent = 0.0
+                iterator = func(*args, **kwargs)
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        profile.enable()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                        finally:
+                            profile.disable()
+                            spent += time.perf_counter() - started
+                        yield item
+                finally:
+                    iterator.close()
+                    self._active.release()
+                    self._save(profile, name, spent)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = self._start()
+            if profile is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish(profile, name, time.perf_counter() - started)
+        return wrapper
+
+    # =========================================================================
+    # INSTRUMENTATION
+    # =========================================================================
+
+    def instrument_class(self, cls: type, prefix: Optional[str] = None) -> List[str]:
+        """Wrap every public method of a class in place. Returns their names."""
+        prefix = prefix or cls.__name__
+        wrapped = []
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(attr):
+                continue
+            setattr(cls, name, self.wrap(f"{prefix}.{name}", attr))
+            wrapped.append(name)
+        return wrapped
+
+    def instrument_tree(self, tree: app_commands.CommandTree) -> List[str]:
+        """Wrap the callback of every slash command in a tree. Returns their names."""
+        wrapped = []
+        for command in tree.walk_commands():
+            if isinstance(command, app_commands.Command):
+                # discord.py reads parameters once at definition, so swapping
+                # the stored callback keeps the command's options intact
+                command._callback = self.wrap(f"cmd.{command.qualified_name}", command._callback)
+                wrapped.append(command.qualified_name)
+        return wrapped
+
+    # =========================================================================
+    # REPORTING
+    # =========================================================================
+
+    def top(self, limit: int = 15, name: Optional[str] = None) -> List[str]:
+        """The slowest functions by cumulative time across captured profiles.
+
+        name filters captures by substring, e.g. "cmd.week" or "generate_raid".
+        """
+        paths = [c.path for c in self.captures if (name is None or name in c.name) and os.path.exists(c.path)]
+        if not paths:
+            return []
+
+        stats = pstats.Stats(*paths)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        lines = []
+        for (filename, line, function), (_, calls, own, cumulative, _) in rows:
+            where = f"{os.path.basename(filename)}:{line}" if line else filename
+            lines.append(f"{cumulative:8.3f}s {own:8.3f}s {calls:>7} {function} ({where})")
+        return lines
@@ -0,0 +1,139 @@
+"""
+ASDF X Post Generator - Interaction Recorder
+============================================
+Appends every handled slash command to a file so real traffic can be
+replayed offline (python -m benchmarks.replay).
+
+One compact JSON object per line:
+
+    {"t":1760680800.125,"cmd":"raid","opts":{"style":"viral"},"g":123,"c":456,"ms":84.2,"st":"ok"}
+
+t is when Discord created the interaction (Unix seconds), opts are the
+options exactly as Discord sent them, g/c the guild and channel ids, ms
+how long the bot took to handle it and st "ok" or "error". Lines are
+written when a command finishes, so they are roughly but not strictly
+in t order. Each line is a single append, so cluster workers can share
+one file.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+# File interactions are appended to (unset = recording off)
+RECORD_FILE = os.getenv('RECORD_FILE', '')
+
+
+@dataclass(frozen=True)
+class RecordedInteraction:
+    """One slash command from a recording."""
+    at: float
+    command: str
+    options: Dict[str, Any]
+    guild_id: Optional[int]
+    channel_id: Optional[int]
+    duration_ms: float
+    status: str
+
+
+def interaction_options(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Option values from an interaction's raw payload, by option name.
+
+    Subcommand options are flattened; the command's qualified name
+    already says which subcommand ran.
+    """
+    options: Dict[str, Any] = {}
+    stack: List[Dict[str, Any]] = list((data or {}).get("options", []))
+    while stack:
+        option = stack.pop(0)
+        if "options" in option:
+            stack.extend(option["options"])
+        elif "value" in option:
+            options[option["name"]] = option["value"]
+    return options
+
+
+class InteractionRecorder:
+    """Append-only log of handled slash commands."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.recorded = 0
+        # Line buffered: each record is one write() with O_APPEND
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        command: str,
+        options: Dict[str, Any],
+        guild_id: Optional[int],
+        channel_id: Optional[int],
+        at: float,
+        duration: float,
+        status: str
+    ) -> None:
+        """Append one command. duration is in seconds."""
+        line = json.dumps(
+            {
+                "t": round(at, 3),
+                "cmd": command,
+                "opts": options,
+                "g": guild_id,
+                "c": channel_id,
+                "ms": round(duration * 1000, 1),
+                "st": status,
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self.recorded += 1
+
+    def record_interaction(self, interaction: Any, status: str, started: float) -> None:
+        """Append a finished interaction; started is its time.monotonic() start."""
+        if interaction.command is None:
+            return
+        self.record(
+            interaction.command.qualified_name,
+            interaction_options(interaction.data),
+            interaction.guild_id,
+            interaction.channel_id,
+            interaction.created_at.timestamp(),
+            time.monotonic() - started,
+            status,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def read_recording(path: str) -> Iterator[RecordedInteraction]:
+    """Commands from a recording, in file order. Skips unreadable lines."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                yield RecordedInteraction(
+                    at=float(row["t"]),
+                    command=row["cmd"],
+                    options=row.get("opts") or {},
+                    guild_id=row.get("g"),
+                    channel_id=row.get("c"),
+                    duration_ms=float(row.get("ms", 0.0)),
+                    status=row.get("st", "ok"),
+                )
+            except (ValueError, KeyError, TypeError):
+                # A line cut short by a crash, or not ours
+                continue
+
+
+def open_recorder(path: str = RECORD_FILE) -> Optional[InteractionRecorder]:
+    """The interaction recorder, or None when RECORD_FILE is unset."""
+    return InteractionRecorder(path) if path else None
@@ -0,0 +1,89 @@
+"""
+ASDF X Post Generator - Shards
+==============================
+Shard helpers shared by the single-connection and autosharded bot.
+
+A plain commands.Bot is treated as shard 0 of 1, so commands and metrics
+don't need to care which mode is running.
+"""
+
+import math
+import os
+from typing import Any, Dict, List, Optional
+
+import discord
+
+# Set to 1 to run as an AutoShardedBot
+SHARDING = os.getenv('SHARDING', '') == '1'
+
+# Total shards when sharding (unset = Discord's recommended count)
+SHARD_COUNT = int(os.getenv('SHARD_COUNT')) if os.getenv('SHARD_COUNT') else None
+
+# Shards this process runs, e.g. "0,1,2" (set by cluster.py; unset = all)
+SHARD_IDS = [int(i) for i in os.getenv('SHARD_IDS', '').split(',') if i.strip()] or None
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """The shard Discord routes a guild to."""
+    return (guild_id >> 22) % shard_count
+
+
+def owns_guild(client: discord.Client, guild_id: int) -> bool:
+    """True if one of this process's shards handles the guild."""
+    shard_count = client.shard_count or 1
+    shard_ids = getattr(client, "shard_ids", None) or [client.shard_id or 0]
+    return shard_for_guild(guild_id, shard_count) in shard_ids
+
+
+def shard_connected(client: discord.Client, shard_id: int) -> bool:
+    """True if the shard's gateway connection is up."""
+    if isinstance(client, discord.AutoShardedClient):
+        shard = client.get_shard(shard_id)
+        return shard is not None and not shard.is_closed()
+    return not client.is_closed()
+
+
+def _latency(value: float) -> Optional[float]:
+    # Latency is inf/nan until the first heartbeat is acknowledged
+    return value if math.isfinite(value) else None
+
+
+def shard_stats(client: discord.Client) -> List[Dict[str, Any]]:
+    """Latency and health of every shard this process runs."""
+    guilds: Dict[int, int] = {}
+    for guild in client.guilds:
+        guilds[guild.shard_id] = guilds.get(guild.shard_id, 0) + 1
+
+    if isinstance(client, discord.AutoShardedClient):
+        shards = [
+            {
+                "id": shard.id,
+                "latency": _latency(shard.latency),
+                "closed": shard.is_closed(),
+                "ratelimited": shard.is_ws_ratelimited(),
+            }
+            for shard in client.shards.values()
+        ]
+    else:
+        shards = [{
+            "id": client.shard_id or 0,
+            "latency": _latency(client.latency),
+            "closed": client.is_closed(),
+            "ratelimited": client.is_ws_ratelimited(),
+        }]
+
+    shards.sort(key=lambda s: s["id"])
+    for shard in shards:
+        shard["guilds"] = guilds.get(shard["id"], 0)
+    return shards
+
+
+def summarize_shards(shards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals for the metrics output."""
+    latencies = [s["latency"] for s in shards if s["latency"] is not None]
+    return {
+        "shards": len(shards),
+        "connected": sum(1 for s in shards if not s["closed"]),
+        "avg_latency": sum(latencies) / len(latencies) if latencies else None,
+        "max_latency": max(latencies, default=None),
+    }
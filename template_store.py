@@ -0,0 +1,378 @@
+"""
+ASDF X Post Generator - Template Store
+======================================
+Loads the template families from an external data directory instead of
+the literals in config.py.
+
+The directory holds one JSON file per family (raid_templates.json,
+fud_responses.json, ...); families without a file fall back to config.py.
+It is compiled into a versioned binary snapshot with one section per
+dict key (or per list family). The bot memory-maps the snapshot and only
+parses a section the first time it is used.
+
+Usage:
+    python template_store.py build <data_dir> [--output <snapshot>]
+    python template_store.py dump <data_dir>
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from functools import cached_property
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import config
+from cache import fingerprint
+from templates import CompiledTemplates, compile_all
+
+# Template pack directory (unset = use the templates in config.py)
+TEMPLATE_DIR = os.getenv('TEMPLATE_DIR', '')
+
+# Snapshot file (default: <TEMPLATE_DIR>/templates.snapshot)
+TEMPLATE_SNAPSHOT = os.getenv('TEMPLATE_SNAPSHOT', '')
+
+SNAPSHOT_NAME = "templates.snapshot"
+SNAPSHOT_MAGIC = b"ASDFTPL\x00"
+SNAPSHOT_VERSION = 1
+
+# Family name -> JSON type. Dict families get one snapshot section per key.
+FAMILIES = {
+    "RAID_TEMPLATES": dict,
+    "THREAD_TEMPLATES": dict,
+    "CULT_TEMPLATES": list,
+    "VIRAL_TEMPLATES": list,
+    "ANNOUNCEMENT_TEMPLATES": dict,
+    "FUD_RESPONSES": dict,
+    "REPLY_TEMPLATES": dict,
+}
+
+# Snapshot layout:
+#   header   magic, version, section count, sha256 of the source files
+#   index    per section: name length, name (utf-8), payload offset, payload length
+#   payload  one JSON document per section
+_HEADER = struct.Struct("<8sHI32s")
+_NAME_LENGTH = struct.Struct("<H")
+_ENTRY = struct.Struct("<QI")
+
+
+class SnapshotError(ValueError):
+    """Raised when a template pack or snapshot can't be read."""
+
+
+# =============================================================================
+# BUILDING
+# =============================================================================
+
+def family_path(data_dir: str, family: str) -> str:
+    """Path of a family's JSON file inside a template pack."""
+    return os.path.join(data_dir, f"{family.lower()}.json")
+
+
+def read_pack(data_dir: str) -> Dict[str, Any]:
+    """Load every family JSON file present in data_dir."""
+    pack = {}
+    for family, kind in FAMILIES.items():
+        path = family_path(data_dir, family)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, kind):
+            raise SnapshotError(f"{path}: expected a JSON {'object' if kind is dict else 'array'}")
+        pack[family] = data
+    return pack
+
+
+def source_digest(data_dir: str) -> bytes:
+    """sha256 of the pack's family files, used to spot stale snapshots."""
+    digest = hashlib.sha256()
+    for family in FAMILIES:
+        path = family_path(data_dir, family)
+        if os.path.exists(path):
+            digest.update(family.encode("utf-8") + b"\x00")
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.digest()
+
+
+def _sections(pack: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    for family, data in pack.items():
+        if isinstance(data, dict):
+            # The family section lists the keys, in order
+            yield family, list(data)
+            for key, value in data.items():
+                yield f"{family}/{key}", value
+        else:
+            yield family, data
+
+
+def build_snapshot(data_dir: str, output: Optional[str] = None, source: ModuleType = config) -> str:
+    """Validate a template pack and compile it into a snapshot file.
+
+    Placeholders are checked here, so a broken pack fails the build rather
+    than a command; families missing from the pack are taken from source.
+    The file is written atomically. Returns its path.
+    """
+    output = output or os.path.join(data_dir, SNAPSHOT_NAME)
+    pack = read_pack(data_dir)
+
+    families = {family.lower(): pack.get(family, getattr(source, family)) for family in FAMILIES}
+    compile_all(
+        families["raid_templates"],
+        families["thread_templates"],
+        families["cult_templates"],
+        families["viral_templates"],
+        families["announcement_templates"],
+    )
+
+    entries = [
+        (name.encode("utf-8"), json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        for name, value in _sections(pack)
+    ]
+    offset = _HEADER.size + sum(_NAME_LENGTH.size + len(name) + _ENTRY.size for name, _ in entries)
+
+    # A temp file of our own: cluster workers may rebuild the same pack at once
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(output)), prefix=f"{os.path.basename(output)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(entries), source_digest(data_dir)))
+            for name, payload in entries:
+                f.write(_NAME_LENGTH.pack(len(name)) + name + _ENTRY.pack(offset, len(payload)))
+                offset += len(payload)
+            for _, payload in entries:
+                f.write(payload)
+        os.replace(tmp_path, output)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return output
+
+
+def dump_builtin(data_dir: str) -> None:
+    """Write config.py's template families as a template pack."""
+    os.makedirs(data_dir, exist_ok=True)
+    for family in FAMILIES:
+        with open(family_path(data_dir, family), "w", encoding="utf-8") as f:
+            json.dump(getattr(config, family), f, ensure_ascii=False, indent=2)
+
+# =============================================================================
+# READING
+# =============================================================================
+
+class TemplateSnapshot:
+    """A memory-mapped snapshot whose sections are parsed on first use."""
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count, digest = _HEADER.unpack_from(self._mm, 0)
+        except (OSError, ValueError, struct.error) as e:
+            raise SnapshotError(f"{path}: can't read snapshot ({e})") from e
+
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{path}: not a template snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"{path}: snapshot version {version}, expected {SNAPSHOT_VERSION}")
+
+        self.version = version
+        self.digest = digest
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._sections: Dict[str, Any] = {}
+
+        pos = _HEADER.size
+        for _ in range(count):
+            (name_length,) = _NAME_LENGTH.unpack_from(self._mm, pos)
+            pos += _NAME_LENGTH.size
+            name = self._mm[pos:pos + name_length].decode("utf-8")
+            pos += name_length
+            self._index[name] = _ENTRY.unpack_from(self._mm, pos)
+            pos += _ENTRY.size
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    @property
+    def loaded(self) -> int:
+        """Number of sections parsed so far."""
+        return len(self._sections)
+
+    def section(self, name: str) -> Any:
+        """Parse (once) and return one section."""
+        try:
+            return self._sections[name]
+        except KeyError:
+            pass
+        offset, length = self._index[name]
+        value = self._sections[name] = json.loads(self._mm[offset:offset + length])
+        return value
+
+    def family(self, family: str) -> Union["LazyFamily", List[str]]:
+        """A family as a lazy mapping (dict families) or a list."""
+        if FAMILIES[family] is dict:
+            return LazyFamily(self, family)
+        return self.section(family)
+
+    def close(self) -> None:
+        """Unmap the snapshot."""
+        self._sections.clear()
+        self._mm.close()
+
+
+class LazyFamily(Mapping):
+    """Read-only dict view of a snapshot family; values parse on first access."""
+
+    def __init__(self, snapshot: TemplateSnapshot, family: str):
+        self._snapshot = snapshot
+        self._family = family
+        self._keys: List[str] = snapshot.section(family)
+
+    def __getitem__(self, key: str) -> Any:
+        name = f"{self._family}/{key}"
+        if name not in self._snapshot:
+            raise KeyError(key)
+        return self._snapshot.section(name)
+
+    def __contains__(self, key: object) -> bool:
+        return f"{self._family}/{key}" in self._snapshot
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def copy(self) -> Dict[str, Any]:
+        """Parse every entry into a plain dict."""
+        return dict(self)
+
+
+@dataclass(frozen=True)
+class TemplateFamilies:
+    """Every template family, from config.py or a template pack."""
+    raid_templates: Mapping[str, Dict]
+    thread_templates: Mapping[str, List[str]]
+    cult_templates: List[str]
+    viral_templates: List[str]
+    announcement_templates: Mapping[str, str]
+    fud_responses: Mapping[str, List[str]]
+    reply_templates: Mapping[str, str]
+    digest: str  # Identifies the content, for cache keys
+
+    @cached_property
+    def compiled(self) -> CompiledTemplates:
+        """Render plans, compiled per entry on first use."""
+        return compile_all(
+            self.raid_templates,
+            self.thread_templates,
+            self.cult_templates,
+            self.viral_templates,
+            self.announcement_templates,
+            lazy=True,
+        )
+
+    def compile_now(self) -> CompiledTemplates:
+        """Compile every entry up front, raising TemplateError on a bad one.
+
+        The result is what compiled returns from then on.
+        """
+        compiled = compile_all(
+            self.raid_templates,
+            self.thread_templates,
+            self.cult_templates,
+            self.viral_templates,
+            self.announcement_templates,
+        )
+        # Fill the cached_property slot; the dataclass is frozen
+        self.__dict__["compiled"] = compiled
+        return compiled
+
+
+def builtin_families(source: ModuleType = config) -> TemplateFamilies:
+    """The template families defined in config.py (or a fresh copy of it)."""
+    values = {family.lower(): getattr(source, family) for family in FAMILIES}
+    return TemplateFamilies(**values, digest=fingerprint(*values.values()))
+
+
+def _snapshot_digest(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            magic, version, _, digest = _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        return None
+    return digest
+
+
+def load_families(
+    data_dir: str = TEMPLATE_DIR,
+    snapshot_path: str = TEMPLATE_SNAPSHOT,
+    source: ModuleType = config
+) -> TemplateFamilies:
+    """Template families for this process.
+
+    With neither a data directory nor a snapshot, the config.py templates
+    are used. With a data directory the snapshot is rebuilt first if it is
+    missing, from another version, or older than the pack. Families the
+    pack doesn't define come from source.
+    """
+    if not data_dir and not snapshot_path:
+        return builtin_families(source)
+
+    snapshot_path = snapshot_path or os.path.join(data_dir, SNAPSHOT_NAME)
+    if data_dir and _snapshot_digest(snapshot_path) != source_digest(data_dir):
+        build_snapshot(data_dir, snapshot_path, source)
+
+    snapshot = TemplateSnapshot(snapshot_path)
+    values = {
+        family.lower(): snapshot.family(family) if family in snapshot else getattr(source, family)
+        for family in FAMILIES
+    }
+    fallbacks = [getattr(source, family) for family in FAMILIES if family not in snapshot]
+    return TemplateFamilies(**values, digest=fingerprint(snapshot.digest, *fallbacks))
+
+
+# Loaded once at import; a broken pack stops the bot at startup.
+TEMPLATE_FAMILIES = load_families()
+if not TEMPLATE_DIR and not TEMPLATE_SNAPSHOT:
+    # Packs are checked when their snapshot is built; config.py's templates
+    # are checked here, and these plans are the ones every generator renders
+    TEMPLATE_FAMILIES.compile_now()
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or bootstrap template packs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Compile a template pack into a snapshot")
+    build.add_argument("data_dir")
+    build.add_argument("--output", help=f"Snapshot path (default: <data_dir>/{SNAPSHOT_NAME})")
+
+    dump = commands.add_parser("dump", help="Write the config.py templates as a template pack")
+    dump.add_argument("data_dir")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        path = build_snapshot(args.data_dir, args.output)
+        print(f"Wrote {path} ({os.path.getsize(path)} bytes)")
+    else:
+        dump_builtin(args.data_dir)
+        print(f"Wrote {len(FAMILIES)} template families to {args.data_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+ASDF X Post Generator - Template Engine
+=======================================
+Compiles the template strings from config.py into render plans once,
+so generation doesn't re-parse ``str.format`` syntax on every post.
+"""
+
+import string
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Mapping, Optional, Tuple
+
+from config import (
+    ANNOUNCEMENT_TEMPLATES,
+    CULT_TEMPLATES,
+    RAID_TEMPLATES,
+    THREAD_TEMPLATES,
+    VIRAL_TEMPLATES,
+)
+
+# =============================================================================
+# ALLOWED PLACEHOLDERS
+# =============================================================================
+
+HASHTAG_FIELDS = frozenset({"hashtags"})
+
+RAID_FIELDS = {
+    "imagine": frozenset({"competitor", "competitor_price", "price", "url", "hashtags"}),
+    "what_do_you_think": frozenset({"problem", "product_name", "solution", "url", "hashtags"}),
+    "fuck_x": frozenset({"target", "complaint", "product_name", "value_prop", "url", "hashtags"}),
+    "comparison": frozenset({"competitor", "competitor_price", "product_lower", "price", "url", "hashtags"}),
+    "provocation": frozenset({"competitor", "action", "product_lower", "price", "url", "hashtags"}),
+}
+
+ANNOUNCEMENT_FIELDS = {
+    "product_launch": frozenset({
+        "product_name", "description", "feature_1", "feature_2",
+        "feature_3", "feature_4", "url", "hashtags"
+    }),
+    "update": frozenset({
+        "product_name", "update_1", "update_2", "update_3", "update_4", "url", "hashtags"
+    }),
+    "milestone": frozenset({
+        "week_num", "holdex_stat", "ignition_stat", "forecast_stat", "burn_stat", "hashtags"
+    }),
+}
+
+# =============================================================================
+# COMPILATION
+# =============================================================================
+
+class TemplateError(ValueError):
+    """Raised when a template contains a placeholder we can't render."""
+
+
+@dataclass(frozen=True)
+class TemplatePlan:
+    """A template compiled down to a %-style pattern and its field order."""
+    name: str
+    source: str
+    pattern: str
+    fields: Tuple[str, ...]
+    getter: Optional[Callable[[Mapping[str, object]], Tuple[object, ...]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    @property
+    def field_names(self) -> FrozenSet[str]:
+        """Distinct placeholder names used by the template."""
+        return frozenset(self.fields)
+
+
+def _tuple_getter(fields: Tuple[str, ...]) -> Callable[[Mapping[str, object]], Tuple[object, ...]]:
+    """Build a getter that always returns a tuple, even for one field."""
+    if len(fields) == 1:
+        key = fields[0]
+        return lambda values: (values[key],)
+    return itemgetter(*fields)
+
+
+def compile_template(source: str, name: str = "<template>", allowed: Optional[FrozenSet[str]] = None) -> TemplatePlan:
+    """Compile a ``str.format`` template into a render plan.
+
+    Only plain named placeholders are supported. Positional fields, attribute
+    or index access, conversions and format specs are rejected, as are names
+    outside ``allowed`` when it is given.
+    """
+    pieces: List[str] = []
+    fields: List[str] = []
+
+    try:
+        parsed = list(string.Formatter().parse(source))
+    except ValueError as e:
+        raise TemplateError(f"{name}: {e}") from e
+
+    for literal, field_name, format_spec, conversion in parsed:
+        pieces.append(literal.replace("%", "%%"))
+        if field_name is None:
+            continue
+        if not field_name.isidentifier():
+            raise TemplateError(f"{name}: unsupported placeholder {{{field_name}}}")
+        if format_spec or conversion:
+            raise TemplateError(f"{name}: format specs are not supported in {{{field_name}}}")
+        if allowed is not None and field_name not in allowed:
+            raise TemplateError(f"{name}: unknown placeholder {{{field_name}}}")
+        pieces.append("%s")
+        fields.append(field_name)
+
+    field_tuple = tuple(fields)
+    return TemplatePlan(
+        name=name,
+        source=source,
+        pattern="".join(pieces),
+        fields=field_tuple,
+        getter=_tuple_getter(field_tuple) if field_tuple else None
+    )
+
+
+def render(plan: TemplatePlan, **fields) -> str:
+    """Render a compiled plan with the given field values."""
+    if plan.getter is None:
+        return plan.pattern % ()
+    try:
+        return plan.pattern % plan.getter(fields)
+    except KeyError as e:
+        raise KeyError(f"{plan.name}: missing field {e.args[0]!r}") from None
+
+# =============================================================================
+# COMPILED TEMPLATE FAMILIES
+# =============================================================================
+
+class LazyPlans(Mapping):
+    """Read-only mapping that compiles each entry on first access."""
+
+    def __init__(self, source: Mapping[str, Any], compile_entry: Callable[[str, Any], Any]):
+        self._source = source
+        self._compile_entry = compile_entry
+        self._plans: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self._compile_entry(key, self._source[key])
+        return plan
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._source
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._source)
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+
+@dataclass(frozen=True)
+class CompiledTemplates:
+    """Render plans for every formatted template family."""
+    raid: Mapping[str, TemplatePlan]
+    thread: Mapping[str, Tuple[TemplatePlan, ...]]
+    cult: Tuple[TemplatePlan, ...]
+    viral: Tuple[TemplatePlan, ...]
+    announcement: Mapping[str, TemplatePlan]
+
+
+def _compile_raid(key: str, data: Dict) -> TemplatePlan:
+    return compile_template(data["template"], f"RAID_TEMPLATES[{key!r}]", RAID_FIELDS.get(key))
+
+def _compile_thread(key: str, tweets: List[str]) -> Tuple[TemplatePlan, ...]:
+    return tuple(
+        compile_template(tweet, f"THREAD_TEMPLATES[{key!r}][{i}]", HASHTAG_FIELDS)
+        for i, tweet in enumerate(tweets)
+    )
+
+def _compile_announcement(key: str, template: str) -> TemplatePlan:
+    return compile_template(template, f"ANNOUNCEMENT_TEMPLATES[{key!r}]", ANNOUNCEMENT_FIELDS.get(key))
+
+def _compile_mapping(source: Mapping[str, Any], compile_entry: Callable[[str, Any], Any], lazy: bool) -> Mapping[str, Any]:
+    if lazy:
+        return LazyPlans(source, compile_entry)
+    return {key: compile_entry(key, value) for key, value in source.items()}
+
+
+def compile_all(
+    raid_templates: Mapping[str, Dict] = RAID_TEMPLATES,
+    thread_templates: Mapping[str, List[str]] = THREAD_TEMPLATES,
+    cult_templates: List[str] = CULT_TEMPLATES,
+    viral_templates: List[str] = VIRAL_TEMPLATES,
+    announcement_templates: Mapping[str, str] = ANNOUNCEMENT_TEMPLATES,
+    lazy: bool = False,
+) -> CompiledTemplates:
+    """Compile every template family, failing fast on bad placeholders.
+
+    With lazy=True the keyed families (raid, thread, announcement) compile
+    each entry on first use instead, for large template packs that have
+    already been validated.
+    """
+    return CompiledTemplates(
+        raid=_compile_mapping(raid_templates, _compile_raid, lazy),
+        thread=_compile_mapping(thread_templates, _compile_thread, lazy),
+        cult=tuple(
+            compile_template(t, f"CULT_TEMPLATES[{i}]", HASHTAG_FIELDS)
+            for i, t in enumerate(cult_templates)
+        ),
+        viral=tuple(
+            compile_template(t, f"VIRAL_TEMPLATES[{i}]", HASHTAG_FIELDS)
+            for i, t in enumerate(viral_templates)
+        ),
+        announcement=_compile_mapping(announcement_templates, _compile_announcement, lazy),
+    )
@@ -0,0 +1,52 @@
+"""Tests for the benchmark suite's baseline handling."""
+
+import json
+
+from benchmarks.suite import compare, load_baseline, save_baseline, synthetic_families
+
+
+class TestCompare:
+    """Tests for regression detection."""
+
+    def test_flags_cases_past_threshold(self):
+        """A case slower than baseline * (1 + threshold) is a regression."""
+        regressions = compare({"a": 1.3, "b": 1.2}, {"a": 1.0, "b": 1.0}, threshold=0.25)
+        assert regressions == [("a", 1.0, 1.3)]
+
+    def test_faster_cases_pass(self):
+        """Speedups are never regressions."""
+        assert compare({"a": 0.5}, {"a": 1.0}) == []
+
+    def test_new_cases_are_ignored(self):
+        """Cases missing from the baseline can't regress."""
+        assert compare({"new": 5.0}, {}) == []
+
+
+class TestBaseline:
+    """Tests for reading and writing baselines."""
+
+    def test_round_trip(self, tmp_path):
+        """Saved results load back by case name."""
+        path = str(tmp_path / "baseline.json")
+        save_baseline({"b": 2.0, "a": 1.0}, path)
+
+        assert load_baseline(path) == {"a": 1.0, "b": 2.0}
+        with open(path) as f:
+            assert "python" in json.load(f)
+
+    def test_missing_file_is_empty(self, tmp_path):
+        """No baseline yet means nothing to compare against."""
+        assert load_baseline(str(tmp_path / "missing.json")) == {}
+
+
+class TestSyntheticFamilies:
+    """Tests for the large synthetic template pack."""
+
+    def test_families_are_padded(self):
+        """List families and raid styles grow to the requested size."""
+        families = synthetic_families(50)
+
+        assert len(families.raid_templates) == 50
+        assert len(families.cult_templates) == 50
+        assert all(len(responses) == 50 for responses in families.fud_responses.values())
+        assert families.digest != synthetic_families(60).digest
@@ -0,0 +1,249 @@
+"""Tests for the Discord bot helpers."""
+
+import asyncio
+import sqlite3
+import zipfile
+
+import discord
+import pytest
+
+import bot
+from benchmarks.fake_discord import FakeChannel as FakeTextChannel
+from benchmarks.fake_discord import FakeDiscord, FakeInteraction
+from bot import (
+    archive_weeks,
+    create_embed,
+    generator,
+    pack_embeds,
+    pack_messages,
+    send_packed,
+    send_post,
+    split_message,
+    spool_sections,
+    stream_chunks,
+)
+from config import PostType
+from generator import TrackedPost
+from outbound import OutboundQueue
+from post_history import PostHistory
+
+
+@pytest.fixture(autouse=True)
+def fast_outbound(monkeypatch):
+    """Swap in an outbound queue that doesn't pace test sends."""
+    monkeypatch.setattr(bot, "outbound", OutboundQueue(rate=1000, burst=1000))
+
+
+class FakeChannel:
+    """Collects messages instead of sending them to Discord."""
+
+    def __init__(self, channel_id=1):
+        self.id = channel_id
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append(content if content is not None else kwargs)
+
+
+class TestSplitMessage:
+    """Test cases for split_message."""
+
+    def test_short_message_unchanged(self):
+        """Test content under the limit comes back as one chunk."""
+        assert split_message("hello\nworld", 100) == ["hello\nworld"]
+
+    def test_splits_on_lines(self):
+        """Test chunks break between lines and keep every line."""
+        content = "\n".join(f"line {i}" for i in range(500))
+        chunks = split_message(content, 200)
+        assert all(len(c) <= 200 for c in chunks)
+        assert "\n".join(chunks) == content
+
+    def test_oversized_line_is_split(self):
+        """Test a single line longer than the limit is cut up."""
+        content = "word " * 1000
+        chunks = split_message(content, 300)
+        assert len(chunks) > 1
+        assert all(len(c) <= 300 for c in chunks)
+        assert "".join(content.split()) == "".join("".join(chunks).split())
+
+    def test_code_fences_stay_balanced(self):
+        """Test a fenced block split across chunks is closed and reopened."""
+        content = "intro\n```py\n" + "\n".join(f"x = {i}" for i in range(200)) + "\n```\noutro"
+        chunks = split_message(content, 150)
+        assert all(len(c) <= 150 for c in chunks)
+        for chunk in chunks:
+            fences = [line for line in chunk.split("\n") if line.startswith("```")]
+            assert len(fences) % 2 == 0
+        assert chunks[1].startswith("```py\n")
+        assert chunks[-1].endswith("outro")
+
+
+class TestStreamChunks:
+    """Test cases for stream_chunks."""
+
+    def test_chunks_rebuild_export(self):
+        """Test the streamed chunks contain the whole export in order."""
+        channel = FakeChannel()
+        sent = asyncio.run(stream_chunks(channel, generator.iter_weekly_export(1)))
+        assert sent == len(channel.messages)
+        assert all(len(m) <= 2000 for m in channel.messages)
+        body = "\n".join(m[len("```\n"):-len("\n```")] for m in channel.messages)
+        assert body == generator.export_weekly_posts(1)
+
+    def test_first_chunk_sent_before_generation_ends(self):
+        """Test the first message goes out while sections are still pending."""
+        channel = FakeChannel()
+        seen_at_send = []
+
+        def sections():
+            for i in range(20):
+                seen_at_send.append(len(channel.messages))
+                yield "x" * 500 + str(i)
+
+        asyncio.run(stream_chunks(channel, sections()))
+        assert seen_at_send[-1] > 0
+
+
+class TestSpoolSections:
+    """Test cases for spool_sections."""
+
+    def test_spooled_file_matches_export(self):
+        """Test the spooled file holds the joined export."""
+        fp = spool_sections(generator.iter_fud_export())
+        assert fp.read().decode("utf-8") == generator.export_fud_responses()
+
+    def test_archive_has_one_file_per_week(self):
+        """Test the range archive holds each week's export."""
+        exports = generator.export_range(2, 4, seed=1)
+        with zipfile.ZipFile(archive_weeks(exports)) as archive:
+            assert archive.namelist() == ["week2_posts.txt", "week3_posts.txt", "week4_posts.txt"]
+            assert archive.read("week3_posts.txt").decode("utf-8") == exports[3]
+
+
+class TestPacking:
+    """Test cases for message and embed packing."""
+
+    def test_pack_preserves_order_and_limit(self):
+        """Test packed messages keep item order and stay under the limit."""
+        items = [f"item {i} " + "x" * 300 for i in range(20)]
+        messages = pack_messages(items, max_length=2000)
+        assert all(len(m) <= 2000 for m in messages)
+        assert "\n".join(messages) == "\n".join(items)
+
+    def test_pack_is_minimal(self):
+        """Test items that fit together share a message."""
+        assert pack_messages(["a" * 900, "b" * 900, "c" * 900], max_length=2000) == [
+            "a" * 900 + "\n" + "b" * 900,
+            "c" * 900,
+        ]
+
+    def test_pack_embeds_caps_at_ten(self):
+        """Test no message carries more than 10 embeds."""
+        embeds = [discord.Embed(title=str(i), description="x") for i in range(25)]
+        groups = pack_embeds(embeds)
+        assert [len(g) for g in groups] == [10, 10, 5]
+
+    def test_pack_embeds_caps_total_size(self):
+        """Test embed groups stay under 6000 characters."""
+        embeds = [discord.Embed(title=str(i), description="x" * 2500) for i in range(5)]
+        groups = pack_embeds(embeds)
+        assert all(sum(len(e) for e in g) <= 6000 for g in groups)
+        assert len(groups) == 3
+
+    def test_send_packed_thread(self):
+        """Test a whole thread goes out in fewer messages than tweets."""
+        tweets = generator.generate_thread("holdex")
+        channel = FakeChannel()
+        blocks = [(f"Tweet {i}/{len(tweets)}", t) for i, t in enumerate(tweets, 1)]
+        sent = asyncio.run(send_packed(channel, blocks))
+        assert sent == len(channel.messages) < len(tweets)
+        assert all(len(m) <= 2000 for m in channel.messages)
+
+
+class TestSendPost:
+    """Test cases for single-response posts."""
+
+    def setup_method(self):
+        self.api = FakeDiscord(latency=0)
+        self.interaction = FakeInteraction(self.api, None, FakeTextChannel(self.api, 1))
+        self.embed = create_embed("🔥 RAID POST", "Style: **Imagine**")
+
+    def test_embed_and_post_in_one_response(self):
+        """Test the embed and the copyable post go out in one API call."""
+        asyncio.run(send_post(self.interaction, self.embed, "gm"))
+
+        (message,) = self.interaction.messages
+        assert message.route == "callback"
+        assert message.content == "**📋 Copy this:**\n\n```\ngm\n```"
+        assert message.embeds == [self.embed]
+        assert self.api.count() == 1
+
+    def test_long_post_falls_back_to_followups(self):
+        """Test a post over the message limit follows the embed in chunks."""
+        post = "\n".join(f"line {i} " + "x" * 80 for i in range(40))
+        asyncio.run(send_post(self.interaction, self.embed, post))
+
+        first, *rest = self.interaction.messages
+        assert first.content is None and first.embeds == [self.embed]
+        assert rest and all(m.route == "webhook" and len(m.content) <= 2000 for m in rest)
+
+
+
+class TestPostHistory:
+    """Test cases for the channel history helpers."""
+
+    @pytest.fixture(autouse=True)
+    def history(self, monkeypatch, tmp_path):
+        history = PostHistory(str(tmp_path / "history.db"), batch_size=1)
+        monkeypatch.setattr(bot, "history", history)
+        yield history
+        history.close()
+
+    def setup_method(self):
+        self.api = FakeDiscord(latency=0)
+        self.interaction = FakeInteraction(self.api, None, FakeTextChannel(self.api, 1), guild_id=5)
+
+    def test_remember_then_recent(self, history):
+        """Test a remembered post is in the channel's window and written once the batch is full."""
+        post = TrackedPost("gm", "cult:3")
+        asyncio.run(bot.remember_post(self.interaction, PostType.CULT, post))
+
+        recent = asyncio.run(bot.recent_templates(self.interaction, PostType.CULT))
+        assert "cult:3" in recent
+        assert history.pending == 0 and history.written == 1
+
+    def test_cold_history_defers_warm_answers_once(self, history):
+        """Test a command defers before a cold history load and answers in one response once warm."""
+        command = bot.bot.tree.get_command("cult")
+        cold = FakeInteraction(self.api, command, FakeTextChannel(self.api, 2), guild_id=5)
+        asyncio.run(cold.run(command.callback))
+        assert cold.response.type is discord.InteractionResponseType.deferred_channel_message
+        assert [m.route for m in cold.messages] == ["webhook"]
+
+        warm = FakeInteraction(self.api, command, FakeTextChannel(self.api, 2), guild_id=5)
+        asyncio.run(warm.run(command.callback))
+        assert warm.response.type is discord.InteractionResponseType.channel_message
+        assert [m.route for m in warm.messages] == ["callback"]
+
+    def test_failed_flush_is_logged(self, history, monkeypatch, capsys):
+        """Test a failed write doesn't fail the command and keeps the row buffered."""
+        def locked():
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(history, "flush", locked)
+        asyncio.run(bot.remember_post(self.interaction, PostType.CULT, TrackedPost("gm", "cult:3")))
+        assert history.pending == 1
+        assert "database is locked" in capsys.readouterr().out
+        monkeypatch.undo()
+
+
+class TestShardMetrics:
+    """Test cases for the per-shard collector."""
+
+    def test_unconnected_bot_reports_shard_down(self):
+        """Test a bot that hasn't connected shows shard 0 down with no latency."""
+        families = {family.name: family for family in bot.shard_metrics()}
+        assert families["bot_shard_up"].samples == [({"shard": "0"}, 0)]
+        assert families["bot_shard_latency_seconds"].samples == []
+        assert families["bot_shard_guilds"].samples == [({"shard": "0"}, 0)]
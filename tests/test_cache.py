@@ -0,0 +1,67 @@
+"""Tests for the caching helpers."""
+
+import time
+
+from cache import LRUCache, TTLCache, fingerprint
+
+
+class TestLRUCache:
+    """Test cases for LRUCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted first."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_get_or_create_builds_once(self):
+        """Test the factory only runs on a miss."""
+        cache = LRUCache(4)
+        calls = []
+        for _ in range(3):
+            cache.get_or_create("k", lambda: calls.append(1) or "value")
+        assert len(calls) == 1
+        assert cache.hits == 2
+
+    def test_zero_size_disables(self):
+        """Test a zero-size cache stores nothing."""
+        cache = LRUCache(0)
+        cache.put("a", 1)
+        assert len(cache) == 0
+
+
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    def test_entries_expire(self):
+        """Test an entry is dropped once its ttl has passed."""
+        cache = TTLCache(4, ttl=0.05)
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        time.sleep(0.06)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        """Test invalidate drops one entry only."""
+        cache = TTLCache(4, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+
+class TestFingerprint:
+    """Test cases for fingerprint."""
+
+    def test_stable_and_content_sensitive(self):
+        """Test equal content hashes equal and edits change the hash."""
+        stats = {"burns": "ongoing"}
+        assert fingerprint(stats) == fingerprint(dict(stats))
+        assert fingerprint(stats) != fingerprint({"burns": "paused"})
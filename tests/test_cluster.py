@@ -0,0 +1,63 @@
+"""Tests for the cluster launcher and shared store."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from cluster import shard_ranges, worker_env
+from cluster_store import ClusterStore
+
+
+def claim_in_process(path, owner):
+    """Claim today's reminder from a separate process."""
+    store = ClusterStore(path, owner=owner)
+    try:
+        return store.claim("daily_post_reminder", "2026-01-01")
+    finally:
+        store.close()
+
+
+class TestShardRanges:
+    """Test cases for shard range assignment."""
+
+    def test_ranges_cover_every_shard_once(self):
+        """Test ranges are contiguous and near-equal."""
+        assert shard_ranges(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+
+    def test_more_processes_than_shards(self):
+        """Test extra processes are dropped rather than left empty."""
+        assert shard_ranges(2, 4) == [[0], [1]]
+
+    def test_invalid_counts(self):
+        """Test zero shards or processes raise ValueError."""
+        with pytest.raises(ValueError):
+            shard_ranges(0, 2)
+
+    def test_worker_env(self):
+        """Test workers get their shard range and the shared store."""
+        env = worker_env(1, [4, 5], 8, "/tmp/cluster.db")
+        assert env["SHARDING"] == "1"
+        assert env["SHARD_IDS"] == "4,5"
+        assert env["SHARD_COUNT"] == "8"
+        assert env["CLUSTER_DB"] == "/tmp/cluster.db"
+
+
+class TestClusterStore:
+    """Test cases for job claims."""
+
+    def test_claim_once(self, tmp_path):
+        """Test a slot can only be claimed once."""
+        store = ClusterStore(str(tmp_path / "cluster.db"), owner="0")
+        assert store.claim("daily_post_reminder", "2026-01-01")
+        assert not store.claim("daily_post_reminder", "2026-01-01")
+        assert store.claim("daily_post_reminder", "2026-01-02")
+        assert store.claimed_by("daily_post_reminder", "2026-01-01") == "0"
+        store.close()
+
+    def test_claim_once_across_processes(self, tmp_path):
+        """Test concurrent processes agree on a single winner."""
+        path = str(tmp_path / "cluster.db")
+        ClusterStore(path).close()  # Create the schema up front
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(claim_in_process, [path] * 8, [str(i) for i in range(8)]))
+        assert results.count(True) == 1
@@ -0,0 +1,79 @@
+"""Tests for command tree sync skipping."""
+
+import asyncio
+
+import discord
+from discord import app_commands
+
+from command_sync import load_sync_state, sync_if_changed, tree_schema_hash
+
+
+def make_tree():
+    """Build a command tree with one command and a fake sync call."""
+    client = discord.Client(intents=discord.Intents.none())
+    tree = app_commands.CommandTree(client)
+    tree.sync_calls = 0
+
+    async def sync(*, guild=None):
+        tree.sync_calls += 1
+        return tree.get_commands(guild=guild)
+
+    tree.sync = sync
+
+    @tree.command(name="ping", description="Ping")
+    async def ping(interaction: discord.Interaction):
+        pass
+
+    return tree
+
+
+class TestCommandSync:
+    """Test cases for sync_if_changed."""
+
+    def test_unchanged_tree_skips_sync(self, tmp_path):
+        """Test a second start with the same tree doesn't sync."""
+        path = str(tmp_path / "sync.json")
+        tree = make_tree()
+        assert asyncio.run(sync_if_changed(tree, path=path, force=False)) is not None
+        assert asyncio.run(sync_if_changed(make_tree(), path=path, force=False)) is None
+        assert tree.sync_calls == 1
+
+    def test_changed_tree_syncs(self, tmp_path):
+        """Test adding a command changes the hash and syncs again."""
+        path = str(tmp_path / "sync.json")
+        asyncio.run(sync_if_changed(make_tree(), path=path, force=False))
+
+        tree = make_tree()
+
+        @tree.command(name="pong", description="Pong")
+        async def pong(interaction: discord.Interaction):
+            pass
+
+        assert asyncio.run(sync_if_changed(tree, path=path, force=False)) is not None
+        assert tree.sync_calls == 1
+
+    def test_scopes_stored_separately(self, tmp_path):
+        """Test guild and global hashes don't overwrite each other."""
+        path = str(tmp_path / "sync.json")
+        tree = make_tree()
+        asyncio.run(sync_if_changed(tree, path=path, force=False))
+        asyncio.run(sync_if_changed(tree, guild=discord.Object(id=42), path=path, force=False))
+        assert set(load_sync_state(path)) == {"None:global", "None:guild:42"}
+
+    def test_force_always_syncs(self, tmp_path):
+        """Test force syncs even when the hash matches."""
+        path = str(tmp_path / "sync.json")
+        tree = make_tree()
+        asyncio.run(sync_if_changed(tree, path=path, force=False))
+        asyncio.run(sync_if_changed(tree, path=path, force=True))
+        assert tree.sync_calls == 2
+
+    def test_hash_is_stable(self):
+        """Test the same tree hashes the same."""
+        assert tree_schema_hash(make_tree()) == tree_schema_hash(make_tree())
+
+    def test_corrupt_state_counts_as_empty(self, tmp_path):
+        """Test an unreadable state file just triggers a sync."""
+        path = tmp_path / "sync.json"
+        path.write_text("not json")
+        assert load_sync_state(str(path)) == {}
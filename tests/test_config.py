@@ -0,0 +1,56 @@
+"""Tests for config helpers."""
+
+from config import (
+    HASHTAG_POOLS,
+    HASHTAGS,
+    PRODUCTS,
+    HashtagPools,
+    PostType,
+    get_hashtags,
+    hashtag_options,
+    hashtag_pool,
+)
+
+
+class TestHashtagPools:
+    """Test cases for the precomputed hashtag pools."""
+
+    def test_pools_built_at_import(self):
+        """Test every product/topic pair has a pool."""
+        assert (None, None, 3) in HASHTAG_POOLS
+        assert ("holdex", "dexscreener", 3) in HASHTAG_POOLS
+
+    def test_pool_combinations(self):
+        """Test a pool has one entry per core order, product and topic tag."""
+        pool = hashtag_pool("holdex", "dexscreener")
+        assert len(pool) == 2 * 3 * 2
+        assert "#ASDFASDFA #ASDF #HolDEX" in pool
+
+    def test_unknown_arguments_use_plain_pool(self):
+        """Test unknown products and topics fall back to core tags."""
+        assert hashtag_pool("nope", "nope") == hashtag_pool()
+
+    def test_get_hashtags_in_pool(self):
+        """Test get_hashtags only returns pool entries."""
+        for _ in range(20):
+            tags = get_hashtags(PostType.RAID, "ignition", "launchpad")
+            assert tags in hashtag_pool("ignition", "launchpad")
+
+    def test_other_counts(self):
+        """Test counts other than the default are built on demand."""
+        tags = get_hashtags(PostType.RAID, "holdex", "dexscreener", count=1)
+        assert tags in HASHTAGS["core"]
+
+    def test_options_are_distinct(self):
+        """Test hashtag_options dedupes the pool."""
+        options = hashtag_options("holdex", "dexscreener")
+        assert len(options) == len(set(options))
+        assert set(options) == set(hashtag_pool("holdex", "dexscreener"))
+
+    def test_options_precomputed(self):
+        """Test repeated calls return the stored options instead of rebuilding them."""
+        assert hashtag_options("holdex", "dexscreener") is hashtag_options("holdex", "dexscreener")
+        assert hashtag_options(count=1) is hashtag_options(count=1)
+        pools = HashtagPools(PRODUCTS, HASHTAGS)
+        assert ("holdex", "dexscreener", 3) in pools.options
+        assert pools.hashtag_options("holdex", "dexscreener") is pools.hashtag_options("holdex", "dexscreener")
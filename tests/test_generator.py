@@ -1,6 +1,9 @@
 """Tests for the post generator module."""
 
+import pytest
+
 from generator import PostGenerator, quick_raid, quick_thread, quick_cult, quick_fud_response
+from guild_config import apply_overrides
 
 
 class TestPostGenerator:
@@ -147,3 +150,158 @@ class TestEdgeCases:
         """Test reply with invalid type defaults gracefully."""
         reply = self.generator.generate_reply("invalid_type")
         assert reply is not None  # Should default to ecosystem
+
+
+class TestWeeklyCache:
+    """Test cases for the weekly output cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.generator = PostGenerator()
+        self.generator.current_stats = dict(self.generator.current_stats)
+
+    def test_export_is_cached(self):
+        """Test repeated exports of a week reuse the cached output."""
+        first = self.generator.export_weekly_posts(3)
+        second = self.generator.export_weekly_posts(3)
+        assert first is second
+        assert self.generator.weekly_cache.hits >= 1
+
+    def test_weeks_cached_separately(self):
+        """Test each week number gets its own cache entry."""
+        assert "WEEK 1" in self.generator.export_weekly_posts(1)
+        assert "WEEK 2" in self.generator.export_weekly_posts(2)
+
+    def test_stats_change_invalidates(self):
+        """Test editing stats changes the fingerprint and the output."""
+        before = self.generator.export_weekly_posts(1)
+        self.generator.current_stats["burn_status"] = "cache test burn"
+        after = self.generator.export_weekly_posts(1)
+        assert before is not after
+        assert "cache test burn" in after
+
+    def test_cache_size_limit(self):
+        """Test the cache never grows past its size limit."""
+        generator = PostGenerator(cache_size=2)
+        for week in range(1, 6):
+            generator.export_weekly_posts(week)
+        assert len(generator.weekly_cache) <= 2
+
+
+class TestBatchGeneration:
+    """Test cases for generate_batch."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.generator = PostGenerator()
+
+    def test_raid_batch_is_distinct(self):
+        """Test a raid batch returns n distinct posts."""
+        posts = self.generator.generate_batch("raid", 20, product="holdex")
+        assert len(posts) == 20
+        assert len(set(posts)) == 20
+
+    def test_batch_capped_by_pool(self):
+        """Test a batch never repeats once the pool runs out."""
+        posts = self.generator.generate_batch("fud", 50, style="scam")
+        assert len(posts) == len(set(posts)) == 3
+
+    def test_batch_single_style(self):
+        """Test a styled raid batch only uses that style."""
+        posts = self.generator.generate_batch("raid", 4, product="holdex", style="comparison")
+        assert all("→ burned" in post for post in posts)
+
+    def test_cult_batch(self):
+        """Test cult batches are distinct."""
+        posts = self.generator.generate_batch("cult", 10)
+        assert len(posts) == len(set(posts)) == 10
+
+    def test_unknown_kind(self):
+        """Test an unknown kind raises ValueError."""
+        with pytest.raises(ValueError):
+            self.generator.generate_batch("nope", 3)
+
+
+class TestSeededGeneration:
+    """Test cases for seeded generation and variant ids."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.generator = PostGenerator()
+
+    def test_same_seed_same_post(self):
+        """Test a seed makes generation reproducible."""
+        first = self.generator.generate_raid("viral", "ignition", rng=7)
+        second = PostGenerator().generate_raid("viral", "ignition", rng=7)
+        assert first == second
+
+    def test_seeded_week_is_reproducible(self):
+        """Test seeded weekly exports match across generators."""
+        assert self.generator.export_weekly_posts(1, seed=3) == PostGenerator().export_weekly_posts(1, seed=3)
+
+    def test_regenerate_from_variant_id(self):
+        """Test a variant id rebuilds the same post."""
+        variant = self.generator.generate_variant("thread", style="burn_engine")
+        assert PostGenerator().regenerate(variant.variant_id) == variant
+        assert isinstance(variant.content, list)
+
+    def test_variant_is_memoized(self):
+        """Test regenerating a variant hits the cache."""
+        variant = self.generator.generate_variant("raid", "holdex", "comparison", variant=42)
+        self.generator.regenerate(variant.variant_id)
+        assert self.generator.variant_cache.hits == 1
+
+    def test_unknown_variant_kind(self):
+        """Test unknown kinds and malformed ids raise ValueError."""
+        with pytest.raises(ValueError):
+            self.generator.generate_variant("nope")
+        with pytest.raises(ValueError):
+            self.generator.regenerate("raid:holdex")
+
+
+class TestRangeExport:
+    """Test cases for export_range."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.generator = PostGenerator()
+
+    def test_range_is_ordered_and_seeded(self):
+        """Test each week matches a seeded single-week export."""
+        exports = self.generator.export_range(1, 3, seed=5)
+        assert list(exports) == [1, 2, 3]
+        assert exports[2] == PostGenerator().export_weekly_posts(2, "5:2")
+
+    def test_range_keeps_guild_overrides(self):
+        """Test a guild view exports its own config."""
+        view = self.generator.with_snapshot(apply_overrides(self.generator.snapshot, {
+            "current_stats": {"holders": "123456"},
+            "products": {"holdex": {"name": "GuildDEX"}},
+        }))
+        exports = view.export_range(1, 3, seed=5)
+        assert exports[2] == view.export_weekly_posts(2, "5:2")
+        assert exports != self.generator.export_range(1, 3, seed=5)
+
+    def test_invalid_range(self):
+        """Test a backwards range raises ValueError."""
+        with pytest.raises(ValueError):
+            self.generator.export_range(5, 1)
+
+
+class TestStreamingExports:
+    """Test cases for the section iterators."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.generator = PostGenerator()
+
+    def test_weekly_sections_join_to_export(self):
+        """Test weekly sections join to the weekly export."""
+        sections = list(self.generator.iter_weekly_export(2))
+        assert len(sections) > 1
+        assert "\n".join(sections) == self.generator.export_weekly_posts(2)
+
+    def test_fud_and_reply_sections_join_to_export(self):
+        """Test FUD and reply sections join to their exports."""
+        assert "\n".join(self.generator.iter_fud_export()) == self.generator.export_fud_responses()
+        assert "\n".join(self.generator.iter_reply_export()) == self.generator.export_reply_templates()
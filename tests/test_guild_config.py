@@ -0,0 +1,144 @@
+"""Tests for per-guild config overrides."""
+
+import pytest
+
+from config import DayOfWeek, PostType
+from generator import PostGenerator
+from guild_config import GuildConfigStore, apply_overrides, parse_setting
+from live_config import builtin_snapshot
+
+
+class TestParseSetting:
+    """Test cases for override validation."""
+
+    def test_channel_mention(self):
+        """Test channel mentions and ids both parse to an int."""
+        assert parse_setting("output_channel_id", "<#123>") == 123
+        assert parse_setting("output_channel_id", "456") == 456
+
+    def test_rejects_bad_values(self):
+        """Test invalid overrides raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_setting("output_channel_id", "general")
+        with pytest.raises(ValueError):
+            parse_setting("current_stats", {"burn_status": ["list"]})
+        with pytest.raises(ValueError):
+            parse_setting("products", {"new": {"name": "New"}})
+        with pytest.raises(ValueError):
+            parse_setting("weekly_schedule", {"someday": {"posts": []}})
+        with pytest.raises(ValueError):
+            parse_setting("weekly_schedule", {"monday": {"posts": [{"type": "nope", "time": "9:00"}]}})
+        with pytest.raises(ValueError):
+            parse_setting("weekly_schedule", {"monday": "cult at 9"})
+        with pytest.raises(ValueError):
+            parse_setting("weekly_schedule", {"monday": {"posts": ["cult"]}})
+        with pytest.raises(ValueError):
+            parse_setting("products", {"holdex": {"tags": "#GuildDEX"}})
+        with pytest.raises(ValueError):
+            parse_setting("unknown", {})
+
+
+class TestApplyOverrides:
+    """Test cases for layering overrides on the global snapshot."""
+
+    def setup_method(self):
+        """Set up the global snapshot."""
+        self.base = builtin_snapshot()
+
+    def test_no_overrides_is_base(self):
+        """Test a guild without overrides gets the global snapshot itself."""
+        assert apply_overrides(self.base, {}) is self.base
+
+    def test_merges_stats_and_products(self):
+        """Test stats and products merge key by key."""
+        key = next(iter(self.base.products))
+        snapshot = apply_overrides(self.base, {
+            "current_stats": {"burn_status": "custom"},
+            "products": {key: {"description": "Guild description"}},
+        })
+        assert snapshot.current_stats["burn_status"] == "custom"
+        assert snapshot.products[key].description == "Guild description"
+        assert snapshot.products[key].name == self.base.products[key].name
+        assert self.base.products[key].description != "Guild description"
+
+    def test_schedule_replaces_days(self):
+        """Test an overridden day replaces only that day."""
+        snapshot = apply_overrides(self.base, {
+            "weekly_schedule": {"monday": {"theme": "Guild", "posts": [{"type": "cult", "time": "10:00"}]}}
+        })
+        monday = snapshot.weekly_schedule[DayOfWeek.MONDAY]
+        assert monday["theme"] == "Guild"
+        assert monday["posts"][0]["type"] is PostType.CULT
+        assert snapshot.weekly_schedule[DayOfWeek.TUESDAY] == self.base.weekly_schedule[DayOfWeek.TUESDAY]
+
+    def test_hashtags_follow_guild_products(self):
+        """Test product tag overrides and new products show up in hashtags."""
+        snapshot = apply_overrides(self.base, {"products": {
+            "holdex": {"tags": ["#GuildDEX"]},
+            "guildtool": {"name": "GuildTool", "description": "A guild's own product", "url": "example.com",
+                          "tags": ["#GuildTool"]},
+        }})
+        assert all("#GuildDEX" in line for line in snapshot.hashtag_options("holdex"))
+        assert all("#GuildTool" in line for line in snapshot.hashtag_options("guildtool"))
+        assert not any("#GuildDEX" in line for line in self.base.hashtag_options("holdex"))
+
+        raid = PostGenerator(snapshot=snapshot).generate_raid("comparison", "guildtool", rng=1)
+        assert "#GuildTool" in raid
+
+
+class TestGuildConfigStore:
+    """Test cases for the SQLite store and its cache."""
+
+    def setup_method(self):
+        """Set up the global snapshot."""
+        self.base = builtin_snapshot()
+
+    def test_set_invalidates_cache(self, tmp_path):
+        """Test a write is visible at once in the writing process."""
+        store = GuildConfigStore(str(tmp_path / "guilds.db"), ttl=60)
+        assert store.overrides(1) == {}
+        store.set(1, "current_stats", {"burn_status": "custom"})
+        assert store.overrides(1) == {"current_stats": {"burn_status": "custom"}}
+        store.reset(1, "current_stats")
+        assert store.overrides(1) == {}
+        store.close()
+
+    def test_reads_are_cached_until_ttl(self, tmp_path):
+        """Test another writer's change shows up only after the ttl."""
+        path = str(tmp_path / "guilds.db")
+        reader = GuildConfigStore(path, ttl=60)
+        writer = GuildConfigStore(path, ttl=60)
+        assert reader.overrides(1) == {}
+        writer.set(1, "output_channel_id", "99")
+        assert reader.overrides(1) == {}
+        reader.cache.clear()
+        assert reader.overrides(1) == {"output_channel_id": 99}
+        assert reader.guilds_with("output_channel_id") == [(1, 99)]
+        reader.close()
+        writer.close()
+
+    def test_snapshot_memoized_and_isolated(self, tmp_path):
+        """Test merged snapshots are reused per base and don't leak across guilds."""
+        store = GuildConfigStore(str(tmp_path / "guilds.db"))
+        store.set(1, "current_stats", {"burn_status": "custom"})
+
+        snapshot = store.snapshot_for(1, self.base)
+        assert store.snapshot_for(1, self.base) is snapshot
+        assert store.snapshot_for(2, self.base) is self.base
+
+        reloaded = builtin_snapshot()
+        assert store.snapshot_for(1, reloaded) is not snapshot
+        store.close()
+
+    def test_guild_generator_shares_cache(self, tmp_path):
+        """Test guild views share the cache without sharing entries."""
+        store = GuildConfigStore(str(tmp_path / "guilds.db"))
+        store.set(1, "current_stats", {"burn_status": "custom"})
+        generator = PostGenerator(snapshot=self.base)
+        guild = generator.with_snapshot(store.snapshot_for(1, generator.snapshot))
+
+        assert guild.weekly_cache is generator.weekly_cache
+        assert guild.current_stats["burn_status"] == "custom"
+        assert generator.current_stats["burn_status"] != "custom"
+        assert guild.config_fingerprint() != generator.config_fingerprint()
+        store.close()
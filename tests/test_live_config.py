@@ -0,0 +1,89 @@
+"""Tests for config snapshots and hot reload."""
+
+import asyncio
+import os
+import shutil
+
+import pytest
+
+from config import CURRENT_STATS, PostType
+from generator import PostGenerator
+from live_config import CONFIG_PATH, ConfigReloader, builtin_snapshot
+from templates import TemplateError
+
+
+class TestConfigReloader:
+    """Test cases for ConfigReloader."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.generator = PostGenerator()
+
+    def copy_config(self, tmp_path):
+        """Copy config.py somewhere the test can edit it."""
+        path = str(tmp_path / "config.py")
+        shutil.copy(CONFIG_PATH, path)
+        return path
+
+    def edit(self, path, old, new):
+        """Replace text in a file and bump its mtime."""
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source.replace(old, new))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_fresh_copy_matches_builtin(self, tmp_path):
+        """Test a reloaded copy of config.py renders the same posts."""
+        snapshot = ConfigReloader(self.copy_config(tmp_path)).build()
+        reloaded = PostGenerator(snapshot=snapshot)
+        assert reloaded.export_weekly_posts(2, seed=1) == self.generator.export_weekly_posts(2, seed=1)
+        assert snapshot.static_fingerprint == builtin_snapshot().static_fingerprint
+
+    def test_schedule_uses_imported_enums(self, tmp_path):
+        """Test the reloaded schedule compares equal to the imported enums."""
+        snapshot = ConfigReloader(self.copy_config(tmp_path)).build()
+        post_types = {post["type"] for day in snapshot.weekly_schedule.values() for post in day["posts"]}
+        assert PostType.THREAD in post_types
+
+    def test_reload_swaps_stats(self, tmp_path):
+        """Test editing stats is picked up and invalidates cached weeks."""
+        path = self.copy_config(tmp_path)
+        reloader = ConfigReloader(path)
+        before = self.generator.export_weekly_posts(1)
+
+        self.edit(path, CURRENT_STATS["burn_status"], "reloaded burn status")
+        assert reloader.changed()
+        snapshot = asyncio.run(reloader.reload())
+        self.generator.apply_snapshot(snapshot)
+
+        assert snapshot.version == 1
+        assert not reloader.changed()
+        assert len(self.generator.weekly_cache) == 0
+        after = self.generator.export_weekly_posts(1)
+        assert after != before
+        assert "reloaded burn status" in after
+
+    def test_failed_reload_keeps_old_config(self, tmp_path):
+        """Test a broken config raises and leaves the version alone."""
+        path = self.copy_config(tmp_path)
+        reloader = ConfigReloader(path)
+        self.edit(path, "CURRENT_STATS = {", "CURRENT_STATS = {{")
+
+        with pytest.raises(SyntaxError):
+            asyncio.run(reloader.reload())
+        assert reloader.version == 0
+        assert reloader.failures == 1
+        assert not reloader.changed()
+
+    def test_broken_placeholder_fails_reload(self, tmp_path):
+        """Test a misspelled placeholder fails the reload instead of a later post."""
+        path = self.copy_config(tmp_path)
+        reloader = ConfigReloader(path)
+        self.edit(path, "{competitor_price}", "{competitor_pricee}")
+
+        with pytest.raises(TemplateError, match="competitor_pricee"):
+            asyncio.run(reloader.reload())
+        assert reloader.version == 0
+        assert reloader.failures == 1
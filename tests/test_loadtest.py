@@ -0,0 +1,162 @@
+"""Tests for the fake Discord stand-in, the load test harness and replay."""
+
+import asyncio
+
+import discord
+import pytest
+
+import bot
+from benchmarks.fake_discord import CHANNEL_BURST, FakeChannel, FakeDiscord, FakeInteraction
+from benchmarks.loadtest import invoke, parse_mix, percentile, random_options, resolve_commands, run_load
+from benchmarks.replay import compare_table, load_session, replay
+from outbound import OutboundQueue
+from recorder import InteractionRecorder
+
+
+@pytest.fixture(autouse=True)
+def fast_outbound(monkeypatch):
+    """Swap in an outbound queue that doesn't pace test sends."""
+    monkeypatch.setattr(bot, "outbound", OutboundQueue(rate=1000, burst=1000))
+
+
+class TestFakeDiscord:
+    """Tests for the simulated API."""
+
+    def test_channel_limit_returns_429(self):
+        """Sends past the per-channel burst are rate limited."""
+        api = FakeDiscord(latency=0)
+
+        async def burst():
+            for _ in range(CHANNEL_BURST):
+                await api.request("channel", 1)
+            with pytest.raises(discord.HTTPException) as error:
+                await api.request("channel", 1)
+            return error.value
+
+        error = asyncio.run(burst())
+        assert error.status == 429
+        assert float(error.response.headers["Retry-After"]) > 0
+        assert api.count("channel", 429) == 1
+
+    def test_retries_wait_out_random_429s(self):
+        """Rate-limited requests are retried after Retry-After."""
+        api = FakeDiscord(latency=0, rate_limit=0.2, retry_after=0.001, seed=3)
+
+        async def send_many():
+            for _ in range(20):
+                await api.request_with_retries("webhook")
+
+        asyncio.run(send_many())
+        assert api.count("webhook", 200) == 20
+        assert api.count("webhook", 429) > 0
+
+    def test_interaction_answers_once(self):
+        """A second response raises like discord.py does."""
+        api = FakeDiscord(latency=0)
+        interaction = FakeInteraction(api, None, FakeChannel(api, 1))
+
+        async def answer_twice():
+            await interaction.response.send_message("one")
+            await interaction.response.send_message("two")
+
+        with pytest.raises(discord.InteractionResponded):
+            asyncio.run(answer_twice())
+        assert [m.content for m in interaction.messages] == ["one"]
+
+
+class TestHarness:
+    """Tests for running commands under load."""
+
+    def test_parse_mix(self):
+        """Weights default to 1 and bad mixes are rejected."""
+        assert parse_mix("raid=6, week") == {"raid": 6, "week": 1}
+        with pytest.raises(ValueError):
+            parse_mix("raid=0")
+
+    def test_percentile(self):
+        """Nearest-rank percentiles."""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) is None
+
+    def test_random_options_use_choices(self):
+        """Only options with choices are filled, from their choice values."""
+        import random
+
+        command = resolve_commands(["raid"])["raid"]
+        options = random_options(command, random.Random(1))
+        assert set(options) == {"product", "style"}
+        assert options["product"] in {"holdex", "ignition", "asdforecast"}
+
+    def test_raid_answers_in_one_response(self):
+        """A raid answers with its embed and the post in a single response."""
+        api = FakeDiscord(latency=0)
+        channel = FakeChannel(api, 1)
+        command = resolve_commands(["raid"])["raid"]
+
+        result = asyncio.run(invoke(api, command, channel, 5, {"product": "holdex", "style": "imagine"}))
+
+        assert result.error is None
+        assert result.messages == 1
+        assert result.first_response is not None
+        assert api.count() == 1
+        assert channel.messages == []
+
+    def test_run_load_counts_every_invocation(self):
+        """Every invocation is reported with its messages."""
+        report = asyncio.run(run_load(
+            {"raid": 3, "cult": 1, "fud": 1}, 40, FakeDiscord(latency=0, seed=1), channels=40, seed=1
+        ))
+
+        assert len(report.invocations) == 40
+        assert all(r.error is None for r in report.invocations)
+        assert report.requests[("callback", 200)] == 40
+        assert "all" in report.format()
+
+
+class TestReplay:
+    """Tests for replaying recorded sessions."""
+
+    def write_session(self, path):
+        recorder = InteractionRecorder(str(path))
+        recorder.record("cult", {}, 1, 11, 1000.2, 0.05, "ok")
+        recorder.record("raid", {"product": "ignition", "style": "viral"}, 1, 10, 1000.0, 0.08, "ok")
+        recorder.record("reload", {}, 1, 10, 1000.1, 0.2, "ok")
+        recorder.record("gone", {}, 1, 12, 1000.3, 0.01, "ok")
+        recorder.close()
+
+    def test_load_session_sorts_and_filters(self, tmp_path):
+        """Records come back by arrival, within the range, minus skipped commands."""
+        path = tmp_path / "interactions.log"
+        self.write_session(path)
+
+        records = load_session(str(path), skip=["reload"])
+        assert [r.command for r in records] == ["raid", "cult", "gone"]
+        assert [r.command for r in load_session(str(path), since=1000.05, until=1000.25)] == ["reload", "cult"]
+
+    def test_replay_runs_recorded_commands(self, tmp_path):
+        """Recorded commands run with their options; unknown ones are errors."""
+        path = tmp_path / "interactions.log"
+        self.write_session(path)
+        records = load_session(str(path), skip=["reload"])
+
+        report = asyncio.run(replay(records, FakeDiscord(latency=0), speed=0))
+
+        by_command = report.by_command()
+        assert by_command["raid"][0].error is None
+        assert by_command["raid"][0].messages == 1
+        assert by_command["cult"][0].error is None
+        assert "Unknown command" in by_command["gone"][0].error
+        assert "recorded p50" in compare_table(records, report)
+
+    def test_replay_keeps_inter_arrival_times(self, tmp_path):
+        """At speed 1 the last command starts its recorded offset after the first."""
+        path = tmp_path / "interactions.log"
+        self.write_session(path)
+        records = load_session(str(path), skip=["reload", "gone"])
+
+        report = asyncio.run(replay(records, FakeDiscord(latency=0), speed=2))
+
+        starts = sorted(r.started for r in report.invocations)
+        assert starts[-1] - starts[0] >= 0.1 - 0.01  # 0.2s recorded, at 2x
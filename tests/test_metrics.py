@@ -0,0 +1,138 @@
+"""Tests for the metrics registry and command timing."""
+
+import asyncio
+import socket
+from types import SimpleNamespace
+
+import aiohttp
+
+from metrics import (
+    COMMAND_LATENCY,
+    Histogram,
+    MetricFamily,
+    Registry,
+    instrument_trace,
+    message_route,
+    start_command,
+    start_metrics_server,
+    timed,
+)
+
+
+def fake_request(method, path, status=200):
+    """Trace params for one Discord request."""
+    return SimpleNamespace(
+        method=method,
+        url=SimpleNamespace(path=path),
+        response=SimpleNamespace(status=status)
+    )
+
+
+class TestRegistry:
+    """Test cases for metric rendering."""
+
+    def setup_method(self):
+        """Set up an empty registry."""
+        self.registry = Registry()
+
+    def test_counter_and_collector(self):
+        """Test counters and collector families render with labels."""
+        counter = self.registry.counter("sends_total", "Sends", ("route",))
+        counter.inc("channel")
+        counter.inc("channel", amount=2)
+        self.registry.register_collector(
+            lambda: [MetricFamily("queue_depth", "gauge", "Depth", [({"lane": 'a"b'}, 3)])]
+        )
+        text = self.registry.render()
+        assert "# TYPE sends_total counter" in text
+        assert 'sends_total{route="channel"} 3' in text
+        assert 'queue_depth{lane="a\\"b"} 3' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts include every smaller bucket and +Inf holds all."""
+        histogram = self.registry.histogram("latency_seconds", "Latency", ("phase",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, "defer")
+        text = self.registry.render()
+        assert 'latency_seconds_bucket{phase="defer",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{phase="defer",le="1"} 2' in text
+        assert 'latency_seconds_bucket{phase="defer",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{phase="defer"} 3' in text
+
+
+class TestTimed:
+    """Test cases for the timing decorator."""
+
+    def test_functions_and_generators(self):
+        """Test plain calls and full iterations are observed once each."""
+        histogram = Histogram("method_seconds", "Method time", ("method",))
+
+        @timed(histogram)
+        def render():
+            return "post"
+
+        @timed(histogram)
+        def sections():
+            yield "a"
+            yield "b"
+
+        assert render() == "post"
+        assert list(sections()) == ["a", "b"]
+        assert histogram.count("render") == 1
+        assert histogram.count("sections") == 1
+
+
+class TestCommandTiming:
+    """Test cases for command latency phases."""
+
+    def test_routes(self):
+        """Test Discord requests are classified by endpoint."""
+        assert message_route("POST", "/api/v10/interactions/1/tok/callback") == "callback"
+        assert message_route("POST", "/api/v10/webhooks/2/tok") == "webhook"
+        assert message_route("PATCH", "/api/v10/webhooks/2/tok/messages/@original") == "webhook"
+        assert message_route("POST", "/api/v10/channels/3/messages") == "channel"
+        assert message_route("GET", "/api/v10/channels/3/messages") is None
+
+    def test_deferred_command_phases(self):
+        """Test a deferred command records defer, first response and last chunk."""
+        trace = instrument_trace(aiohttp.TraceConfig())
+        on_request_end = trace.on_request_end[0]
+
+        async def command():
+            timer = start_command("week_test")
+            await on_request_end(None, None, fake_request("POST", "/interactions/1/tok/callback"))
+            await on_request_end(None, None, fake_request("POST", "/webhooks/2/tok"))
+            await on_request_end(None, None, fake_request("POST", "/channels/3/messages", status=429))
+            await on_request_end(None, None, fake_request("POST", "/channels/3/messages"))
+            return timer
+
+        timer = asyncio.run(command())
+        assert timer.callback_at <= timer.first_message < timer.last_message
+        timer.finish("ok", deferred=True)
+        for phase in ("defer", "first_response", "last_chunk"):
+            assert COMMAND_LATENCY.count("week_test", phase) == 1
+
+
+class TestEndpoint:
+    """Test cases for the HTTP endpoint."""
+
+    def test_serves_metrics(self):
+        """Test GET /metrics returns the exposition text."""
+        registry = Registry()
+        registry.counter("probe_total", "Probe").inc()
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        async def scrape():
+            runner = await start_metrics_server(port, "127.0.0.1", registry)
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                        return response.headers["Content-Type"], await response.text()
+            finally:
+                await runner.cleanup()
+
+        content_type, text = asyncio.run(scrape())
+        assert content_type.startswith("text/plain")
+        assert "probe_total 1" in text
@@ -0,0 +1,116 @@
+"""Tests for MinHash near-duplicate detection."""
+
+import random
+
+from generator import NEAR_DUP_ATTEMPTS, PostGenerator
+from near_duplicates import MinHasher, MinHashIndex, lsh_bands, shingles, similarity
+from post_history import PostHistory
+
+
+class TestMinHash:
+    """Test cases for shingling and signatures."""
+
+    def setup_method(self):
+        """Set up a hasher."""
+        self.hasher = MinHasher()
+
+    def test_hashtags_ignored(self):
+        """Test the hashtag line doesn't change the shingles."""
+        assert shingles("burn it all down\n\n#ASDF #DexScreener") == shingles("burn it all down\n\n#HolDEX")
+
+    def test_similarity_estimates(self):
+        """Test identical text scores 1 and unrelated text scores low."""
+        a = self.hasher.signature("the fees go to the burn not to the team wallet ever")
+        b = self.hasher.signature("imagine a world where every trade burns supply forever and ever")
+        assert similarity(a, a) == 1.0
+        assert similarity(a, b) < 0.3
+
+    def test_bands_sit_below_threshold(self):
+        """Test the LSH cut-off is the highest one not above the threshold."""
+        bands, rows = lsh_bands(64, 0.8)
+        assert bands * rows == 64
+        assert (1 / bands) ** (1 / rows) <= 0.8
+
+
+class TestMinHashIndex:
+    """Test cases for the LSH index."""
+
+    def setup_method(self):
+        """Set up a generator and an index."""
+        self.generator = PostGenerator()
+        self.index = MinHashIndex(threshold=0.8)
+
+    def test_hashtag_variants_are_near_duplicates(self):
+        """Test one raid template with different hashtags is caught."""
+        posts = {self.generator.generate_raid("comparison", "holdex", rng=seed) for seed in range(20)}
+        first, *rest = posts
+        self.index.add(first)
+        assert rest and all(self.index.is_near_duplicate(post) for post in rest)
+        assert not self.index.is_near_duplicate(self.generator.generate_raid("imagine", "holdex", rng=0))
+
+    def test_evicts_oldest(self):
+        """Test the index stays within max_items and forgets evicted posts."""
+        index = MinHashIndex(max_items=2)
+        for text in ("one two three four", "five six seven eight", "nine ten eleven twelve"):
+            index.add(text, key=text)
+        assert len(index) == 2
+        assert "one two three four" not in index
+        assert not index.is_near_duplicate("one two three four")
+
+    def test_batch_skips_near_duplicates(self):
+        """Test a deduped batch has at most one post per raid template."""
+        posts = self.generator.generate_batch("raid", 20, product="holdex", style="comparison",
+                                              rng=1, near_duplicates=self.index)
+        assert len(posts) == 1
+        assert len(self.index) == 1
+
+    def test_fud_batch_indexes_only_returned_posts(self):
+        """Test a FUD batch smaller than its pool doesn't index posts it didn't return."""
+        posts = self.generator.generate_batch("fud", 1, style="scam", rng=1, near_duplicates=self.index)
+        assert len(posts) == 1
+        assert len(self.index) == len(posts)
+
+    def test_tracked_rejects_near_duplicates(self):
+        """Test generate_tracked moves to another template when the first is too similar."""
+        rng = random.Random(3)
+        first = self.generator.generate_tracked("cult", rng=rng)
+        self.index.add(first.content)
+        for seed in range(10):
+            post = self.generator.generate_tracked("cult", rng=seed, avoid={}, near_duplicates=self.index)
+            assert not self.index.is_near_duplicate(post.content)
+
+    def test_tracked_stops_when_no_template_left(self):
+        """Test generate_tracked doesn't retry templates it already rejected."""
+        checks = []
+
+        class EverythingSimilar(MinHashIndex):
+            def is_near_duplicate(self, text):
+                checks.append(text)
+                return True
+
+        index = EverythingSimilar()
+        self.generator.generate_tracked("raid", style="comparison", rng=1, near_duplicates=index)
+        assert checks == []
+
+        responses = self.generator.families.fud_responses["scam"]
+        self.generator.generate_tracked("fud", style="scam", rng=1, near_duplicates=index)
+        assert len(checks) == min(len(responses), NEAR_DUP_ATTEMPTS)
+
+
+class TestHistoryIndex:
+    """Test cases for the per-guild history index."""
+
+    def test_loaded_from_history(self, tmp_path):
+        """Test past posts are indexed after a restart."""
+        path = str(tmp_path / "history.db")
+        history = PostHistory(path)
+        history.record(1, 10, "cult", "cult:0", "we burn every fee because the chart is a lie #ASDF")
+        history.close()
+
+        reopened = PostHistory(path)
+        index = reopened.similar(1)
+        assert index.is_near_duplicate("we burn every fee because the chart is a lie #ASDFASDFA")
+        assert not reopened.similar(2).is_near_duplicate("we burn every fee because the chart is a lie")
+        reopened.record(1, 10, "cult", "cult:1", "a completely different post about builders shipping")
+        assert index.is_near_duplicate("a completely different post about builders shipping")
+        reopened.close()
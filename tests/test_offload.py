@@ -0,0 +1,95 @@
+"""Tests for running blocking work off the event loop."""
+
+import asyncio
+import threading
+import time
+
+from offload import Offloader
+
+
+class TestOffloader:
+    """Tests for the bounded worker pool."""
+
+    def setup_method(self):
+        self.offloader = Offloader(workers=2)
+
+    def teardown_method(self):
+        self.offloader.shutdown()
+
+    def test_run_uses_worker_thread(self):
+        """Jobs run off the event loop's thread and return their result."""
+        async def main():
+            return await self.offloader.run(lambda x: (x * 2, threading.get_ident()), 21)
+
+        value, thread_id = asyncio.run(main())
+        assert value == 42
+        assert thread_id != threading.get_ident()
+        assert self.offloader.stats()["jobs"] == 1
+
+    def test_concurrency_is_bounded(self):
+        """No more than `workers` jobs run at once; the rest queue."""
+        running = []
+        peak = []
+        depths = []
+
+        def work():
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.02)
+            running.pop()
+
+        async def main():
+            tasks = [asyncio.create_task(self.offloader.run(work)) for _ in range(6)]
+            await asyncio.sleep(0.005)
+            depths.append(self.offloader.depth)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        assert max(peak) <= 2
+        assert depths[0] > 0
+        stats = self.offloader.stats()
+        assert stats["jobs"] == 6 and stats["depth"] == 0 and stats["running"] == 0
+        assert stats["max_wait"] > 0
+
+    def test_iterate_streams_items_in_order(self):
+        """Items come back in order, each produced on a worker thread."""
+        threads = set()
+
+        def items():
+            for i in range(5):
+                threads.add(threading.get_ident())
+                yield i
+
+        async def main():
+            return [item async for item in self.offloader.iterate(items())]
+
+        assert asyncio.run(main()) == [0, 1, 2, 3, 4]
+        assert threading.get_ident() not in threads
+
+    def test_errors_propagate(self):
+        """An exception in a job is raised to the caller and frees its slot."""
+        def fail():
+            raise ValueError("boom")
+
+        async def main():
+            try:
+                await self.offloader.run(fail)
+            except ValueError as e:
+                return str(e)
+
+        assert asyncio.run(main()) == "boom"
+        assert self.offloader.running == 0
+
+    def test_works_across_event_loops(self):
+        """The same offloader can be used from successive event loops."""
+        for _ in range(2):
+            assert asyncio.run(self.offloader.run(sum, [1, 2])) == 3
+
+    def test_inline_without_workers(self):
+        """With no workers, jobs run directly on the calling thread."""
+        offloader = Offloader(workers=0)
+
+        async def main():
+            return await offloader.run(threading.get_ident)
+
+        assert asyncio.run(main()) == threading.get_ident()
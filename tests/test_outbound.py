@@ -0,0 +1,88 @@
+"""Tests for the outbound message queue."""
+
+import asyncio
+
+import discord
+
+from outbound import OutboundQueue, TokenBucket
+
+
+class FakeResponse:
+    """Minimal aiohttp response stand-in for HTTPException."""
+
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.reason = "Too Many Requests"
+        self.headers = headers or {}
+
+
+class FakeChannel:
+    """Records sends, optionally failing with 429s first."""
+
+    def __init__(self, channel_id=1, fail_times=0):
+        self.id = channel_id
+        self.messages = []
+        self.fail_times = fail_times
+
+    async def send(self, content=None, **kwargs):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise discord.HTTPException(FakeResponse(429, {"Retry-After": "0.01"}), "rate limited")
+        await asyncio.sleep(0)
+        self.messages.append(content)
+        return content
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_wait(self):
+        """Test the bucket allows a burst then asks to wait."""
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() > 0
+
+    def test_penalize_halves_rate(self):
+        """Test a 429 halves the rate and blocks the bucket."""
+        bucket = TokenBucket(rate=1.0, capacity=5)
+        bucket.penalize(2.0)
+        assert bucket.rate == 0.5
+        assert bucket.reserve() > 1.0
+
+    def test_headers_exhausted_blocks(self):
+        """Test remaining=0 blocks until the reset."""
+        bucket = TokenBucket(rate=1.0, capacity=5)
+        bucket.update(limit=5, remaining=0, reset_after=3.0)
+        assert bucket.reserve() > 2.0
+
+
+class TestOutboundQueue:
+    """Test cases for OutboundQueue."""
+
+    def test_sessions_stay_contiguous(self):
+        """Test concurrent sessions on one channel don't interleave."""
+        queue = OutboundQueue(rate=1000, burst=100)
+        channel = FakeChannel()
+
+        async def batch(tag):
+            async with queue.session(channel) as send:
+                for i in range(3):
+                    await send(f"{tag}{i}")
+
+        async def main():
+            await asyncio.gather(batch("a"), batch("b"))
+
+        asyncio.run(main())
+        assert channel.messages == ["a0", "a1", "a2", "b0", "b1", "b2"]
+        assert queue.stats()["sessions"] == 2
+
+    def test_retries_after_429(self):
+        """Test a 429 is retried and counted."""
+        queue = OutboundQueue(rate=1000, burst=100)
+        channel = FakeChannel(fail_times=1)
+        asyncio.run(queue.send(channel, "hello"))
+        stats = queue.stats()
+        assert channel.messages == ["hello"]
+        assert stats["rate_limited"] == 1
+        assert stats["sent"] == 1
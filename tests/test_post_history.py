@@ -0,0 +1,118 @@
+"""Tests for post history and repeat avoidance."""
+
+import random
+
+from generator import PostGenerator, choose_fresh
+from post_history import PostHistory, RecentWindow
+
+
+class TestRecentWindow:
+    """Test cases for the per-channel recent window."""
+
+    def test_keeps_last_uses(self):
+        """Test only the last `size` uses stay in the window."""
+        window = RecentWindow(2, ["a", "b", "c"])
+        assert "a" not in window
+        assert "b" in window and "c" in window
+        assert window["c"] > window["b"]
+
+    def test_repeat_refreshes_recency(self):
+        """Test a reused template stays in the window until its last use expires."""
+        window = RecentWindow(2, ["a", "b", "a", "c"])
+        assert set(window) == {"a", "c"}
+
+
+class TestChooseFresh:
+    """Test cases for repeat-avoiding template picks."""
+
+    def test_matches_choice_without_history(self):
+        """Test picks are unchanged when nothing is avoided."""
+        options = ["x", "y", "z"]
+        for seed in range(10):
+            assert choose_fresh(random.Random(seed), options, "t")[1] == random.Random(seed).choice(options)
+
+    def test_skips_recent(self):
+        """Test recent templates are skipped while a fresh one exists."""
+        avoid = {"t:0": 1, "t:1": 2}
+        for seed in range(20):
+            assert choose_fresh(random.Random(seed), ["x", "y", "z"], "t", avoid) == ("t:2", "z")
+
+    def test_least_recent_when_all_used(self):
+        """Test the oldest template is reused when every one is recent."""
+        avoid = {"t:0": 3, "t:1": 1, "t:2": 2}
+        assert choose_fresh(random.Random(0), ["x", "y", "z"], "t", avoid) == ("t:1", "y")
+
+
+class TestPostHistory:
+    """Test cases for the SQLite history store."""
+
+    def setup_method(self):
+        """Set up a generator."""
+        self.generator = PostGenerator()
+
+    def test_no_consecutive_repeats(self, tmp_path):
+        """Test a channel never gets the same cult template twice within the window."""
+        history = PostHistory(str(tmp_path / "history.db"), window=3)
+        rng = random.Random(1)
+        used = []
+        for _ in range(30):
+            post = self.generator.generate_tracked("cult", rng=rng, avoid=history.recent(1, 10, "cult"))
+            history.record(1, 10, "cult", post.template_id, post.content)
+            used.append(post.template_id)
+        for i in range(3, len(used)):
+            assert used[i] not in used[i - 3:i]
+        history.close()
+
+    def test_windows_are_per_channel(self, tmp_path):
+        """Test one channel's history doesn't affect another's."""
+        history = PostHistory(str(tmp_path / "history.db"))
+        history.record(1, 10, "cult", "cult:0", "post")
+        assert "cult:0" in history.recent(1, 10, "cult")
+        assert "cult:0" not in history.recent(1, 11, "cult")
+        assert "cult:0" not in history.recent(1, 10, "fud_response")
+        history.close()
+
+    def test_batched_writes_survive_restart(self, tmp_path):
+        """Test rows are buffered until a flush and reloaded by a new process."""
+        path = str(tmp_path / "history.db")
+        history = PostHistory(path, batch_size=2)
+        assert not history.record(1, 10, "fud_response", "fud:scam:0", "a")
+        assert history.template_uses("fud:scam:0") == 0
+        assert history.record(1, 10, "fud_response", "fud:scam:1", "b")
+        assert history.flush() == 2
+        assert history.template_uses("fud:scam:0") == 1
+        history.record(1, 10, "fud_response", "fud:scam:2", "c")
+        history.close()
+
+        reopened = PostHistory(path, window=2)
+        assert list(reopened.recent(1, 10, "fud_response")) == ["fud:scam:1", "fud:scam:2"]
+        reopened.close()
+
+    def test_evicted_window_includes_buffered_rows(self, tmp_path):
+        """Test a window reloaded before a flush still sees buffered rows."""
+        history = PostHistory(str(tmp_path / "history.db"))
+        history.record(1, 10, "cult", "cult:4", "post")
+        history.windows.clear()
+        assert "cult:4" in history.recent(1, 10, "cult")
+        history.close()
+
+    def test_record_leaves_cold_scopes_to_loaders(self, tmp_path):
+        """Test record() only updates windows already in memory and never reads SQLite."""
+        history = PostHistory(str(tmp_path / "history.db"))
+        history.record(1, 10, "cult", "cult:1", "post")
+        assert history.cached_recent(1, 10, "cult") is None
+        assert history.cached_similar(1) is None
+
+        window = history.recent(1, 10, "cult")
+        history.record(1, 10, "cult", "cult:2", "another post")
+        assert history.cached_recent(1, 10, "cult") is window
+        assert {"cult:1", "cult:2"} <= set(window)
+        history.close()
+
+    def test_load_sees_rows_being_flushed(self, tmp_path):
+        """Test rows taken by an uncommitted flush still reach a cold load."""
+        history = PostHistory(str(tmp_path / "history.db"))
+        history.record(1, 10, "cult", "cult:5", "post")
+        history._flushing, history._pending = history._pending, []
+        assert "cult:5" in history.recent(1, 10, "cult")
+        history.close()
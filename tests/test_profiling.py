@@ -0,0 +1,91 @@
+"""Tests for sampled profiling."""
+
+import asyncio
+import os
+
+import pytest
+
+from profiling import Profiler
+
+
+def busy(n=2000):
+    """Some work worth profiling."""
+    return sum(i * i for i in range(n))
+
+
+class Renderer:
+    """Stand-in for PostGenerator."""
+
+    def render(self):
+        return busy()
+
+    def sections(self):
+        yield busy()
+        yield busy()
+
+    def _private(self):
+        return busy()
+
+
+class TestProfiler:
+    """Test cases for Profiler."""
+
+    def test_off_by_default(self, tmp_path):
+        """Test nothing is captured at rate 0."""
+        profiler = Profiler(rate=0, directory=str(tmp_path))
+        assert profiler.wrap("busy", busy)() == busy()
+        assert not profiler.captures
+
+    def test_sync_and_nested(self, tmp_path):
+        """Test a sampled call writes one pstats file and nested calls are skipped."""
+        profiler = Profiler(rate=1, directory=str(tmp_path))
+        inner = profiler.wrap("inner", busy)
+        outer = profiler.wrap("outer", lambda: inner() + inner())
+        outer()
+        assert [c.name for c in profiler.captures] == ["outer"]
+        assert os.path.exists(profiler.captures[0].path)
+        inner()
+        assert [c.name for c in profiler.captures] == ["outer", "inner"]
+
+    def test_async_and_generator(self, tmp_path):
+        """Test coroutines and generators are profiled across their whole run."""
+        profiler = Profiler(rate=1, directory=str(tmp_path))
+
+        async def command():
+            await asyncio.sleep(0)
+            return busy()
+
+        assert asyncio.run(profiler.wrap("cmd.test", command)()) == busy()
+        assert list(profiler.wrap("sections", Renderer.sections)(Renderer())) == [busy(), busy()]
+        assert [c.name for c in profiler.captures] == ["cmd.test", "sections"]
+
+    def test_instrument_class_and_top(self, tmp_path):
+        """Test public methods are wrapped and top lists the slowest functions."""
+        class Local(Renderer):
+            def render(self):
+                return busy()
+
+        profiler = Profiler(rate=1, directory=str(tmp_path))
+        assert profiler.instrument_class(Local) == ["render"]
+        Local().render()
+        lines = profiler.top(5, name="Local.render")
+        assert 0 < len(lines) <= 5
+        assert any("busy" in line for line in lines)
+        assert profiler.top(5, name="missing") == []
+
+    def test_keeps_latest(self, tmp_path):
+        """Test old profiles are deleted past the keep limit."""
+        profiler = Profiler(rate=1, directory=str(tmp_path), keep=2)
+        wrapped = profiler.wrap("busy", busy)
+        for _ in range(3):
+            wrapped()
+        assert len(profiler.captures) == 2
+        assert len(os.listdir(tmp_path)) == 2
+
+    def test_set_rate_validates(self):
+        """Test rates outside 0-1 are rejected."""
+        profiler = Profiler(rate=0)
+        with pytest.raises(ValueError):
+            profiler.set_rate(2)
+        profiler.set_rate(0.5)
+        assert profiler.enabled
@@ -0,0 +1,99 @@
+"""Tests for the interaction recorder."""
+
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from recorder import InteractionRecorder, interaction_options, open_recorder, read_recording
+
+
+class TestInteractionOptions:
+    """Tests for reading options from raw interaction payloads."""
+
+    def test_top_level_options(self):
+        """Option values are keyed by name."""
+        data = {"name": "raid", "options": [
+            {"name": "product", "type": 3, "value": "ignition"},
+            {"name": "style", "type": 3, "value": "viral"},
+        ]}
+        assert interaction_options(data) == {"product": "ignition", "style": "viral"}
+
+    def test_subcommand_options_are_flattened(self):
+        """Options nested under a subcommand come back flat."""
+        data = {"options": [{"name": "show", "type": 1, "options": [{"name": "week", "type": 4, "value": 3}]}]}
+        assert interaction_options(data) == {"week": 3}
+
+    def test_no_options(self):
+        """Commands without options record an empty dict."""
+        assert interaction_options({"name": "cult"}) == {}
+        assert interaction_options(None) == {}
+
+
+class TestRecorder:
+    """Tests for writing and reading recordings."""
+
+    def test_round_trip(self, tmp_path):
+        """Recorded commands read back in file order."""
+        path = str(tmp_path / "interactions.log")
+        recorder = InteractionRecorder(path)
+        recorder.record("raid", {"style": "viral"}, 1, 2, 1000.5, 0.0842, "ok")
+        recorder.record("week", {}, None, 3, 1001.0, 1.5, "error")
+        recorder.close()
+
+        records = list(read_recording(path))
+        assert [r.command for r in records] == ["raid", "week"]
+        assert records[0].options == {"style": "viral"}
+        assert records[0].duration_ms == 84.2
+        assert records[1].guild_id is None
+        assert records[1].status == "error"
+
+    def test_lines_are_compact(self, tmp_path):
+        """One JSON object per line without padding."""
+        path = str(tmp_path / "interactions.log")
+        recorder = InteractionRecorder(path)
+        recorder.record("cult", {}, 1, 2, 1000.0, 0.01, "ok")
+        recorder.close()
+
+        with open(path) as f:
+            line = f.read()
+        assert line.endswith("}\n") and ", " not in line and ": " not in line
+
+    def test_appends_across_opens(self, tmp_path):
+        """Reopening the file keeps earlier records."""
+        path = str(tmp_path / "interactions.log")
+        for at in (1.0, 2.0):
+            recorder = InteractionRecorder(path)
+            recorder.record("cult", {}, 1, 2, at, 0.01, "ok")
+            recorder.close()
+        assert [r.at for r in read_recording(path)] == [1.0, 2.0]
+
+    def test_skips_truncated_lines(self, tmp_path):
+        """A line cut short by a crash is ignored."""
+        path = tmp_path / "interactions.log"
+        path.write_text('{"t":1,"cmd":"raid","opts":{}}\n{"t":2,"cmd":"ra', encoding="utf-8")
+        assert [r.command for r in read_recording(str(path))] == ["raid"]
+
+    def test_record_interaction(self, tmp_path):
+        """An interaction is recorded with its creation time and options."""
+        path = str(tmp_path / "interactions.log")
+        recorder = InteractionRecorder(path)
+        created = datetime(2026, 10, 12, 8, 0, tzinfo=timezone.utc)
+        interaction = SimpleNamespace(
+            command=SimpleNamespace(qualified_name="fud"),
+            data={"options": [{"name": "fud_type", "type": 3, "value": "scam"}]},
+            guild_id=10,
+            channel_id=20,
+            created_at=created,
+        )
+        recorder.record_interaction(interaction, "ok", time.monotonic())
+        recorder.close()
+
+        (record,) = read_recording(path)
+        assert record.command == "fud"
+        assert record.options == {"fud_type": "scam"}
+        assert (record.guild_id, record.channel_id) == (10, 20)
+        assert record.at == created.timestamp()
+
+    def test_disabled_without_path(self):
+        """No RECORD_FILE means no recorder."""
+        assert open_recorder("") is None
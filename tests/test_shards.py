@@ -0,0 +1,47 @@
+"""Tests for shard helpers."""
+
+from types import SimpleNamespace
+
+import discord
+
+from shards import owns_guild, shard_for_guild, shard_stats, summarize_shards
+
+
+class TestShards:
+    """Test cases for shard routing and stats."""
+
+    def test_shard_for_guild(self):
+        """Test guilds route by (id >> 22) % shard_count."""
+        guild_id = (7 << 22) | 12345
+        assert shard_for_guild(guild_id, 4) == 3
+        assert shard_for_guild(guild_id, 1) == 0
+
+    def test_owns_guild_sharded(self):
+        """Test ownership follows the process's shard ids."""
+        client = SimpleNamespace(shard_count=4, shard_ids=[2, 3], shard_id=None)
+        assert owns_guild(client, 3 << 22)
+        assert not owns_guild(client, 1 << 22)
+
+    def test_unsharded_owns_everything(self):
+        """Test a plain bot handles every guild."""
+        client = SimpleNamespace(shard_count=None, shard_id=None)
+        assert owns_guild(client, 1 << 22)
+
+    def test_unsharded_stats(self):
+        """Test a plain client reports as a single shard 0."""
+        client = discord.Client(intents=discord.Intents.none())
+        shards = shard_stats(client)
+        assert [shard["id"] for shard in shards] == [0]
+        assert shards[0]["latency"] is None
+        assert shards[0]["guilds"] == 0
+
+    def test_summary_skips_unknown_latency(self):
+        """Test shards without a heartbeat don't skew the averages."""
+        summary = summarize_shards([
+            {"id": 0, "latency": 0.05, "closed": False},
+            {"id": 1, "latency": None, "closed": True},
+            {"id": 2, "latency": 0.15, "closed": False},
+        ])
+        assert summary["connected"] == 2
+        assert abs(summary["avg_latency"] - 0.1) < 1e-9
+        assert summary["max_latency"] == 0.15
@@ -0,0 +1,93 @@
+"""Tests for the external template store."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import FUD_RESPONSES, RAID_TEMPLATES, REPLY_TEMPLATES
+from generator import PostGenerator
+from template_store import (
+    SnapshotError,
+    TemplateSnapshot,
+    build_snapshot,
+    dump_builtin,
+    family_path,
+    load_families,
+)
+from templates import TemplateError
+
+
+class TestTemplateStore:
+    """Test cases for template packs and snapshots."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.generator = PostGenerator()
+
+    def test_pack_round_trip(self, tmp_path):
+        """Test a dumped pack loads back to the config.py templates."""
+        dump_builtin(str(tmp_path))
+        families = load_families(str(tmp_path))
+        assert dict(families.fud_responses) == FUD_RESPONSES
+        assert dict(families.reply_templates) == REPLY_TEMPLATES
+        assert families.raid_templates["comparison"] == RAID_TEMPLATES["comparison"]
+
+    def test_sections_parse_lazily(self, tmp_path):
+        """Test only the touched sections are parsed."""
+        dump_builtin(str(tmp_path))
+        snapshot = TemplateSnapshot(build_snapshot(str(tmp_path)))
+        fud = snapshot.family("FUD_RESPONSES")
+        assert snapshot.loaded == 1
+        assert fud["scam"] == FUD_RESPONSES["scam"]
+        assert snapshot.loaded == 2
+        snapshot.close()
+
+    def test_concurrent_builds_dont_share_a_temp_file(self, tmp_path):
+        """Test workers rebuilding the same pack at once each write their own temp file."""
+        dump_builtin(str(tmp_path))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            paths = list(pool.map(lambda _: build_snapshot(str(tmp_path)), range(8)))
+
+        snapshot = TemplateSnapshot(paths[0])
+        assert dict(snapshot.family("FUD_RESPONSES")) == FUD_RESPONSES
+        snapshot.close()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_missing_families_fall_back(self, tmp_path):
+        """Test families without a JSON file use config.py."""
+        path = family_path(str(tmp_path), "REPLY_TEMPLATES")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"ecosystem": "custom reply"}, f)
+        families = load_families(str(tmp_path))
+        assert families.reply_templates["ecosystem"] == "custom reply"
+        assert families.fud_responses is FUD_RESPONSES
+
+    def test_stale_snapshot_is_rebuilt(self, tmp_path):
+        """Test editing the pack rebuilds the snapshot on load."""
+        path = family_path(str(tmp_path), "REPLY_TEMPLATES")
+        for text in ("first", "second"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"ecosystem": text}, f)
+            assert load_families(str(tmp_path)).reply_templates["ecosystem"] == text
+
+    def test_generator_uses_pack(self, tmp_path):
+        """Test a generator built on a pack renders like the built-ins."""
+        dump_builtin(str(tmp_path))
+        packed = PostGenerator(families=load_families(str(tmp_path)))
+        assert packed.generate_raid("fuck_x", "ignition", rng=4) == self.generator.generate_raid("fuck_x", "ignition", rng=4)
+        assert packed.export_fud_responses() == self.generator.export_fud_responses()
+
+    def test_bad_placeholder_fails_build(self, tmp_path):
+        """Test a broken template fails the snapshot build."""
+        with open(family_path(str(tmp_path), "CULT_TEMPLATES"), "w", encoding="utf-8") as f:
+            json.dump(["{hashtag}"], f)
+        with pytest.raises(TemplateError):
+            build_snapshot(str(tmp_path))
+
+    def test_rejects_non_snapshot(self, tmp_path):
+        """Test a file without the snapshot header is rejected."""
+        path = tmp_path / "bogus.snapshot"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(SnapshotError):
+            TemplateSnapshot(str(path))
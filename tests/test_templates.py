@@ -0,0 +1,72 @@
+"""Tests for the template engine."""
+
+import pytest
+
+from config import RAID_TEMPLATES
+from generator import PostGenerator
+from template_store import TEMPLATE_FAMILIES
+from templates import TemplateError, compile_template, render
+
+
+class TestCompileTemplate:
+    """Test cases for template compilation."""
+
+    def test_render_matches_str_format(self):
+        """Test compiled output matches str.format."""
+        source = RAID_TEMPLATES["comparison"]["template"]
+        fields = {
+            "competitor": "DexScreener",
+            "competitor_price": "$300",
+            "product_lower": "holdex",
+            "price": "$20",
+            "url": "alonisthe.dev/holdex",
+            "hashtags": "#ASDF",
+        }
+        plan = compile_template(source)
+        assert render(plan, **fields) == source.format(**fields)
+
+    def test_percent_and_escaped_braces(self):
+        """Test literal % and {{ }} survive compilation."""
+        plan = compile_template("7%+ burned {{not a field}} {hashtags}")
+        assert render(plan, hashtags="#x") == "7%+ burned {not a field} #x"
+
+    def test_no_fields(self):
+        """Test templates without placeholders render as-is."""
+        plan = compile_template("100% open source")
+        assert plan.fields == ()
+        assert render(plan) == "100% open source"
+
+    def test_rejects_positional_field(self):
+        """Test positional placeholders are rejected."""
+        with pytest.raises(TemplateError):
+            compile_template("hello {0}")
+
+    def test_rejects_attribute_access(self):
+        """Test attribute/index placeholders are rejected."""
+        with pytest.raises(TemplateError):
+            compile_template("hello {product.name}")
+
+    def test_rejects_unknown_field(self):
+        """Test placeholders outside the allowed set are rejected."""
+        with pytest.raises(TemplateError):
+            compile_template("{hashtag}", allowed=frozenset({"hashtags"}))
+
+    def test_missing_field_raises(self):
+        """Test rendering without a required field raises KeyError."""
+        plan = compile_template("{hashtags}")
+        with pytest.raises(KeyError):
+            render(plan)
+
+
+class TestCompiledTemplates:
+    """Test cases for the startup-compiled config.py families."""
+
+    def test_all_families_compiled(self):
+        """Test every config family has compiled plans, shared by generators."""
+        compiled = TEMPLATE_FAMILIES.compiled
+        assert set(compiled.raid) == set(RAID_TEMPLATES)
+        assert compiled.thread
+        assert compiled.cult
+        assert compiled.viral
+        assert "milestone" in compiled.announcement
+        assert PostGenerator().templates is compiled